@@ -0,0 +1,62 @@
+# Benchmark of the cost of GDAL environments around rasterio.open()
+
+import timeit
+
+import rasterio
+from rasterio.env import Env
+
+n = 10000
+
+# Outermost environment
+s = """
+with Env():
+    pass
+"""
+
+t = timeit.timeit(s, setup='from rasterio.env import Env', number=n)
+print("Outermost Env enter/exit:")
+print("%f usec\n" % (1000000*t/n))
+
+# Nested environment
+s = """
+with Env():
+    pass
+"""
+
+with Env():
+    t = timeit.timeit(s, setup='from rasterio.env import Env', number=n)
+print("Nested Env enter/exit:")
+print("%f usec\n" % (1000000*t/n))
+
+n = 1000
+
+# Opening within a new default environment, as rasterio.open() did
+# for each call made without an environment
+s_new_env = """
+with Env.from_defaults(session=DummySession()):
+    with rasterio.open('tests/data/RGB.byte.tif') as src:
+        pass
+"""
+
+t = timeit.timeit(
+    s_new_env, number=n,
+    setup='import rasterio; from rasterio.env import Env; '
+          'from rasterio.session import DummySession')
+print("rasterio.open() in a new default Env:")
+print("%f usec\n" % (1000000*t/n))
+
+# Opening without an environment: a cached default one is entered
+s = """
+with rasterio.open('tests/data/RGB.byte.tif') as src:
+    pass
+"""
+
+t = timeit.timeit(s, setup='import rasterio', number=n)
+print("rasterio.open() without Env:")
+print("%f usec\n" % (1000000*t/n))
+
+# Opening within an environment: it is reused by each call
+with Env():
+    t = timeit.timeit(s, setup='import rasterio', number=n)
+print("rasterio.open() within Env:")
+print("%f usec\n" % (1000000*t/n))
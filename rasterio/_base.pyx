@@ -683,6 +683,40 @@ cdef class DatasetBase(object):
         else:
             return int(value)
 
+    def block_offset(self, bidx, i, j):
+        """Returns the offset in bytes of a particular block in its file
+
+        Only useful for TIFF formatted datasets. An offset of 0 means
+        that the block is absent from a sparse file.
+
+        Parameters
+        ----------
+        bidx: int
+            Band index, starting with 1.
+        i: int
+            Row index of the block, starting with 0.
+        j: int
+            Column index of the block, starting with 0.
+
+        Returns
+        -------
+        int
+        """
+        cdef GDALMajorObjectH obj = NULL
+        cdef char *value = NULL
+        cdef const char *key_c = NULL
+
+        obj = self.band(bidx)
+
+        key_b = 'BLOCK_OFFSET_{0}_{1}'.format(j, i).encode('utf-8')
+        key_c = key_b
+        value = GDALGetMetadataItem(obj, key_c, 'TIFF')
+        if value == NULL:
+            raise RasterBlockError(
+                "Block i={0}, j={1} offset can't be determined".format(i, j))
+        else:
+            return int(value)
+
     def block_windows(self, bidx=0):
         """Iterator over a band's blocks and their windows
 
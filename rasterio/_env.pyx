@@ -264,6 +264,13 @@ class PROJDataFinder(object):
         return datadir if os.path.exists(datadir) else None
 
 
+# Drivers are registered and data directories are searched once per
+# process, not each time an environment starts.
+_registration_lock = threading.Lock()
+_have_registered_drivers = False
+_gdal_data_path = None
+
+
 cdef class GDALEnv(ConfigEnv):
     """Configuration and driver management"""
 
@@ -272,28 +279,22 @@ cdef class GDALEnv(ConfigEnv):
         self._have_registered_drivers = False
 
     def start(self):
+        global _have_registered_drivers, _gdal_data_path
+
         CPLPushErrorHandler(<CPLErrorHandler>logging_error_handler)
 
         # The outer if statement prevents each thread from acquiring a
         # lock when the environment starts, and the inner avoids a
         # potential race condition.
-        if not self._have_registered_drivers:
-            with threading.Lock():
-                if not self._have_registered_drivers:
+        if not _have_registered_drivers:
+            with _registration_lock:
+                if not _have_registered_drivers:
 
                     GDALAllRegister()
                     OGRRegisterAll()
 
-                    if 'GDAL_DATA' in os.environ:
-                        self.update_config_options(GDAL_DATA=os.environ['GDAL_DATA'])
-                        log.debug("GDAL_DATA found in environment: %r.", os.environ['GDAL_DATA'])
-
-                    else:
-                        path = GDALDataFinder().search()
-
-                        if path:
-                            self.update_config_options(GDAL_DATA=path)
-                            log.debug("GDAL_DATA not found in environment, set to %r.", path)
+                    if 'GDAL_DATA' not in os.environ:
+                        _gdal_data_path = GDALDataFinder().search()
 
                     if 'PROJ_LIB' not in os.environ:
 
@@ -311,7 +312,21 @@ cdef class GDALEnv(ConfigEnv):
                     # will acquire a threadlock every time a new environment
                     # is started rather than just whenever the first thread
                     # actually makes it this far.
-                    self._have_registered_drivers = True
+                    _have_registered_drivers = True
+
+        # GDAL_DATA is a config option and is cleared with the other
+        # options of an environment, so each environment sets it.
+        if not self._have_registered_drivers:
+
+            if 'GDAL_DATA' in os.environ:
+                self.update_config_options(GDAL_DATA=os.environ['GDAL_DATA'])
+                log.debug("GDAL_DATA found in environment: %r.", os.environ['GDAL_DATA'])
+
+            elif _gdal_data_path:
+                self.update_config_options(GDAL_DATA=_gdal_data_path)
+                log.debug("GDAL_DATA not found in environment, set to %r.", _gdal_data_path)
+
+            self._have_registered_drivers = True
 
         log.debug("Started GDALEnv %r.", self)
 
@@ -25,6 +25,7 @@ cdef class OGRGeomBuilder:
 
     cdef OGRGeometryH _createOgrGeometry(self, int geom_type) except NULL
     cdef _addPointToGeometry(self, OGRGeometryH geom, object coordinate)
+    cdef _addPointsToGeometry(self, OGRGeometryH geom, object coordinates)
     cdef OGRGeometryH _buildPoint(self, object coordinates) except NULL
     cdef OGRGeometryH _buildLineString(self, object coordinates) except NULL
     cdef OGRGeometryH _buildLinearRing(self, object coordinates) except NULL
@@ -34,6 +35,7 @@ cdef class OGRGeomBuilder:
     cdef OGRGeometryH _buildMultiPolygon(self, object coordinates) except NULL
     cdef OGRGeometryH _buildGeomCollection(self, object coordinates) except NULL
     cdef OGRGeometryH build(self, object geom) except NULL
+    cdef OGRGeometryH build_wkb(self, object wkb) except NULL
 
 
 cdef class ShapeIterator:
@@ -2,6 +2,7 @@
 
 include "gdal.pxi"
 
+from itertools import islice
 import logging
 
 import numpy as np
@@ -249,14 +250,17 @@ def _sieve(image, size, out, mask, connectivity):
         mask_mem_ds.close()
 
 
-def _rasterize(shapes, image, transform, all_touched, merge_alg):
+def _rasterize(shapes, image, transform, all_touched, merge_alg,
+               batch_size=10000):
     """
     Burns input geometries into `image`.
 
     Parameters
     ----------
     shapes : iterable of (geometry, value) pairs
-        `geometry` is a GeoJSON-like object.
+        `geometry` is a GeoJSON-like object or a WKB string (bytes).
+        Coordinates of GeoJSON-like lines and rings may be Numpy arrays
+        of shape (N, 2) or (N, 3).
     image : numpy ndarray
         Array in which to store results.
     transform : Affine transformation object, optional
@@ -273,14 +277,29 @@ def _rasterize(shapes, image, transform, all_touched, merge_alg):
             MergeAlg.replace (default): the new value will overwrite the
                 existing value.
             MergeAlg.add: the new value will be added to the existing raster.
+    batch_size : int, optional
+        Number of shapes taken from `shapes` and burned into `image` at
+        a time. Shapes are consumed lazily, so only one batch of OGR
+        geometries exists at once. If a batch fails, the batches before
+        it have already been burned into `image`.
+
+    Returns
+    -------
+    int
+        The number of geometries burned, not counting the invalid
+        geometries that are skipped.
     """
     cdef int retval
     cdef size_t i
     cdef size_t num_geoms = 0
+    cdef size_t capacity = batch_size
+    cdef size_t total = 0
+    cdef size_t consumed = 0
     cdef OGRGeometryH *geoms = NULL
     cdef char **options = NULL
     cdef double *pixel_values = NULL
     cdef InMemoryRaster mem = None
+    cdef GDALDatasetH hds = NULL
 
     try:
         if all_touched:
@@ -288,33 +307,61 @@ def _rasterize(shapes, image, transform, all_touched, merge_alg):
         merge_algorithm = merge_alg.value.encode('utf-8')
         options = CSLSetNameValue(options, "MERGE_ALG", merge_algorithm)
 
-        # GDAL needs an array of geometries.
-        # For now, we'll build a Python list on the way to building that
-        # C array. TODO: make this more efficient.
-        all_shapes = list(shapes)
-        num_geoms = len(all_shapes)
-
-        geoms = <OGRGeometryH *>CPLMalloc(
-            num_geoms * sizeof(OGRGeometryH))
-        pixel_values = <double *>CPLMalloc(num_geoms * sizeof(double))
-
-        for i, (geometry, value) in enumerate(all_shapes):
-            try:
-                geoms[i] = OGRGeomBuilder().build(geometry)
-                pixel_values[i] = <double>value
-            except:
-                log.error("Geometry %r at index %d with value %d skipped",
-                    geometry, i, value)
+        # GDAL needs an array of geometries. Rather than building one
+        # for all shapes, we build and burn one batch at a time.
+        geoms = <OGRGeometryH *>CPLMalloc(capacity * sizeof(OGRGeometryH))
+        pixel_values = <double *>CPLMalloc(capacity * sizeof(double))
+        shapes = iter(shapes)
 
         with InMemoryRaster(image=image, transform=transform) as mem:
-            exc_wrap_int(
-                GDALRasterizeGeometries(
-                    mem.handle(), 1, mem.band_ids, num_geoms, geoms, NULL,
-                    NULL, pixel_values, options, NULL, NULL))
+            while True:
+                batch = list(islice(shapes, batch_size))
+                if not batch:
+                    break
+
+                for index, (geometry, value) in enumerate(batch):
+                    try:
+                        parts = _ogr_geometries(geometry)
+                    except:
+                        log.error("Geometry %r at index %d with value %d skipped",
+                            geometry, consumed + index, value)
+                        continue
+
+                    # Parts of geometry collections may outnumber the
+                    # batch.
+                    if num_geoms + len(parts) > capacity:
+                        capacity = 2 * (num_geoms + len(parts))
+                        geoms = <OGRGeometryH *>CPLRealloc(
+                            geoms, capacity * sizeof(OGRGeometryH))
+                        pixel_values = <double *>CPLRealloc(
+                            pixel_values, capacity * sizeof(double))
+
+                    for part in parts:
+                        geoms[num_geoms] = <OGRGeometryH><size_t>part
+                        pixel_values[num_geoms] = <double>value
+                        num_geoms += 1
+                    total += 1
+
+                if num_geoms > 0:
+                    # The GIL is released so that blocks can be burned
+                    # by concurrent threads.
+                    hds = mem.handle()
+                    with nogil:
+                        retval = GDALRasterizeGeometries(
+                            hds, 1, mem.band_ids, num_geoms, geoms, NULL,
+                            NULL, pixel_values, options, NULL, NULL)
+                    exc_wrap_int(retval)
+
+                for i in range(num_geoms):
+                    _deleteOgrGeom(geoms[i])
+                consumed += len(batch)
+                num_geoms = 0
 
             # Read in-memory data back into image
             image = mem.read()
 
+        return total
+
     finally:
         for i in range(num_geoms):
             _deleteOgrGeom(geoms[i])
@@ -324,6 +371,50 @@ def _rasterize(shapes, image, transform, all_touched, merge_alg):
             CSLDestroy(options)
 
 
+cdef list _ogr_geometries(object geometry):
+    """OGR geometries, as addresses, for a GeoJSON-like or WKB geometry
+
+    The parts of a WKB geometry collection are returned separately, as
+    rasterize() does for GeoJSON-like collections.
+    """
+    cdef OGRGeometryH geom = NULL
+    cdef OGRGeometryH part = NULL
+    cdef int j
+
+    if isinstance(geometry, (bytes, bytearray)):
+        geom = OGRGeomBuilder().build_wkb(geometry)
+        if (OGR_G_GetGeometryType(geom) & (~0x80000000)) % 1000 == 7:
+            parts = []
+            try:
+                for j in range(OGR_G_GetGeometryCount(geom)):
+                    part = OGR_G_Clone(OGR_G_GetGeometryRef(geom, j))
+                    parts.append(<size_t>part)
+            except:
+                for address in parts:
+                    _deleteOgrGeom(<OGRGeometryH><size_t>address)
+                raise
+            finally:
+                _deleteOgrGeom(geom)
+            return parts
+
+    else:
+        geom = OGRGeomBuilder().build(geometry)
+
+    return [<size_t>geom]
+
+
+def _wkb_bounds(wkb):
+    """Bounding box (left, bottom, right, top) of a WKB geometry."""
+    cdef OGRGeometryH geom = OGRGeomBuilder().build_wkb(wkb)
+    cdef OGREnvelope envelope
+
+    try:
+        OGR_G_GetEnvelope(geom, &envelope)
+        return envelope.MinX, envelope.MinY, envelope.MaxX, envelope.MaxY
+    finally:
+        _deleteOgrGeom(geom)
+
+
 def _explode(coords):
     """Explode a GeoJSON geometry's coordinates object and yield
     coordinate tuples. As long as the input is conforming, the type of
@@ -508,6 +599,27 @@ cdef class OGRGeomBuilder:
             x, y, z = coordinate[:3]
             OGR_G_AddPoint(geom, x, y, z)
 
+    cdef _addPointsToGeometry(self, OGRGeometryH geom, object coordinates):
+        # Points of (N, 2) or (N, 3) arrays are set without a round trip
+        # through Python objects for each point.
+        cdef const double[:, :] points
+        cdef int i
+
+        if isinstance(coordinates, np.ndarray) and coordinates.ndim == 2 \
+                and coordinates.shape[1] in (2, 3):
+            points = np.asarray(coordinates, dtype='float64')
+            OGR_G_SetPointCount(geom, points.shape[0])
+            if points.shape[1] == 2:
+                for i in range(points.shape[0]):
+                    OGR_G_SetPoint_2D(geom, i, points[i, 0], points[i, 1])
+            else:
+                for i in range(points.shape[0]):
+                    OGR_G_SetPoint(
+                        geom, i, points[i, 0], points[i, 1], points[i, 2])
+        else:
+            for coordinate in coordinates:
+                self._addPointToGeometry(geom, coordinate)
+
     cdef OGRGeometryH _buildPoint(self, object coordinates) except NULL:
         cdef OGRGeometryH geom = self._createOgrGeometry(
             GEOJSON2OGR_GEOMETRY_TYPES['Point'])
@@ -517,15 +629,13 @@ cdef class OGRGeomBuilder:
     cdef OGRGeometryH _buildLineString(self, object coordinates) except NULL:
         cdef OGRGeometryH geom = self._createOgrGeometry(
             GEOJSON2OGR_GEOMETRY_TYPES['LineString'])
-        for coordinate in coordinates:
-            self._addPointToGeometry(geom, coordinate)
+        self._addPointsToGeometry(geom, coordinates)
         return geom
 
     cdef OGRGeometryH _buildLinearRing(self, object coordinates) except NULL:
         cdef OGRGeometryH geom = self._createOgrGeometry(
             GEOJSON2OGR_GEOMETRY_TYPES['LinearRing'])
-        for coordinate in coordinates:
-            self._addPointToGeometry(geom, coordinate)
+        self._addPointsToGeometry(geom, coordinates)
         OGR_G_CloseRings(geom)
         return geom
 
@@ -589,7 +699,7 @@ cdef class OGRGeomBuilder:
 
         if typename in valid_types:
             coordinates = geometry.get('coordinates')
-            if not (coordinates and len(coordinates) > 0):
+            if coordinates is None or len(coordinates) == 0:
                 raise ValueError("Input is not a valid geometry object")
 
             if typename == 'Point':
@@ -617,6 +727,17 @@ cdef class OGRGeomBuilder:
         else:
             raise ValueError("Unsupported geometry type %s" % typename)
 
+    cdef OGRGeometryH build_wkb(self, object wkb) except NULL:
+        """Builds an OGR geometry from a WKB string."""
+        cdef OGRGeometryH geom = NULL
+        cdef bytes data = bytes(wkb)
+        cdef unsigned char *buf = data
+
+        if OGR_G_CreateFromWkb(buf, NULL, &geom, len(data)) != 0 or geom == NULL:
+            _deleteOgrGeom(geom)
+            raise ValueError("Input is not a valid WKB geometry")
+        return geom
+
 
 # Feature extension classes and functions follow.
 
@@ -5,8 +5,25 @@ from rasterio._base cimport DatasetBase
 include "gdal.pxi"
 
 
+cdef struct _CancellationState:
+    int cancelled
+    double complete
+
+
+cdef class CancellationToken:
+    cdef _CancellationState state
+
+
+cdef class _ProgressHook:
+    cdef void *func
+    cdef void *data
+    cdef readonly object callback
+    cdef readonly CancellationToken token
+    cdef object exc
+
+
 cdef class DatasetReaderBase(DatasetBase):
-    pass
+    cdef object _block_cache
 
 
 cdef class DatasetWriterBase(DatasetReaderBase):
@@ -17,7 +34,8 @@ cdef class DatasetWriterBase(DatasetReaderBase):
 
 
 cdef class BufferedDatasetWriterBase(DatasetWriterBase):
-    pass
+    cdef readonly object _buffer_path
+    cdef readonly object _progress
 
 
 cdef class WarpedVRTReaderBase(DatasetReaderBase):
@@ -6,9 +6,14 @@ from __future__ import absolute_import
 include "directives.pxi"
 include "gdal.pxi"
 
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import math
+import os
 import sys
+import tempfile
+import threading
 import uuid
 import warnings
 
@@ -18,21 +23,27 @@ from rasterio._base import tastes_like_gdal, gdal_version
 from rasterio._err import (
     GDALError, CPLE_OpenFailedError, CPLE_IllegalArgError, CPLE_BaseError)
 from rasterio.crs import CRS
-from rasterio.compat import text_type, string_types
+from rasterio.compat import queue, text_type, string_types
 from rasterio import dtypes
-from rasterio.enums import ColorInterp, MaskFlags, Resampling
+from rasterio.enums import ColorInterp, Interleaving, MaskFlags, Resampling
 from rasterio.errors import (
     CRSError, DriverRegistrationError, RasterioIOError,
     NotGeoreferencedWarning, NodataShadowWarning, WindowError,
-    UnsupportedOperation, OverviewCreationError
+    UnsupportedOperation, OverviewCreationError, BandOverviewError,
+    MemoryMapError, RasterBlockError, OperationCancelledError
 )
 from rasterio.sample import sample_gen
+from rasterio.stats import (
+    _Moments, _cached_statistics, _chunk_windows, _histogram)
 from rasterio.transform import Affine
 from rasterio.path import parse_path, vsi_path, UnparsedPath
 from rasterio.vrt import _boundless_vrt_doc
-from rasterio.windows import Window, intersection
+from rasterio.windows import Window, intersection, _block_indexes, _block_runs
 
+from cpython.buffer cimport (
+    PyBUF_FORMAT, PyBUF_ND, PyBUF_STRIDES, PyBUF_WRITABLE)
 from libc.stdio cimport FILE
+from libc.string cimport memcpy
 cimport numpy as np
 
 from rasterio._base cimport (
@@ -45,6 +56,57 @@ from rasterio._shim cimport (
 log = logging.getLogger(__name__)
 
 
+def _io_dtype(dt):
+    """Get the native numpy dtype of arrays that GDAL can convert to
+
+    Raises
+    ------
+    ValueError
+        If GDAL has no such data type.
+    """
+    dt = np.dtype(dt)
+    if dt.name not in dtypes.dtype_rev:
+        raise ValueError(
+            "data type '{}' is not supported for I/O".format(dt.name))
+    return dt.newbyteorder('=')
+
+
+def _check_layout(layout):
+    if layout not in ('band', 'pixel'):
+        raise ValueError("layout must be 'band' or 'pixel'")
+
+
+def _new_array(shape, dtype, layout='band', zeros=True):
+    """Allocate an array of (bands, rows, columns) shape
+
+    If `layout` is 'pixel', the array is a view of a C-contiguous
+    array of (rows, columns, bands) shape, which GDAL fills in one
+    RasterIO call as it does a band-interleaved array.
+    """
+    alloc = np.zeros if zeros else np.empty
+    if layout == 'pixel':
+        return alloc(shape[1:] + shape[:1], dtype=dtype).transpose(2, 0, 1)
+    return alloc(shape, dtype=dtype)
+
+
+# Counts of arrays copied by write() before I/O, by reason. For
+# debugging the memory use of writes.
+_write_copies = Counter()
+
+
+def _gdal_strides(arr):
+    """True if GDAL can navigate an array's layout as is
+
+    GDAL takes positive pixel, line, and band spacings in bytes, as
+    64-bit GSpacing values, and treats a spacing of 0 as the default.
+    Spacings of axes of length 1 are not used.
+    """
+    itemsize = arr.dtype.itemsize
+    return arr.flags.aligned and all(
+        0 < stride < 2**63 and stride % itemsize == 0
+        for length, stride in zip(arr.shape, arr.strides) if length > 1)
+
+
 def _delete_dataset_if_exists(path):
 
     """Delete a dataset if it already exists.  This operates at a lower
@@ -83,6 +145,32 @@ def _delete_dataset_if_exists(path):
             GDALClose(h_dataset)
 
 
+# GDALBuildOverviews() takes a string algo name, not a Resampling enum
+# member (like warping) and accepts only a subset of the warp
+# algorithms. 'NONE' is omitted below (what does that even mean?) and
+# so is 'AVERAGE_MAGPHASE' (no corresponding member in the warp enum).
+overview_resampling_map = {
+    0: 'NEAREST',
+    1: 'BILINEAR',
+    2: 'CUBIC',
+    3: 'CUBICSPLINE',
+    4: 'LANCZOS',
+    5: 'AVERAGE',
+    6: 'MODE',
+    7: 'GAUSS'}
+
+
+def _overview_resampling_alg(resampling):
+    """Return the GDALBuildOverviews() name of a Resampling member"""
+    try:
+        return overview_resampling_map[Resampling(resampling.value)]
+    except (AttributeError, KeyError, ValueError):
+        raise ValueError(
+            "resampling must be one of: {0}".format(", ".join(
+                ['Resampling.{0}'.format(Resampling(k).name) for k in
+                 overview_resampling_map.keys()])))
+
+
 cdef bint in_dtype_range(value, dtype):
     """Returns True if value is in the range of dtype, else False."""
     infos = {
@@ -135,9 +223,30 @@ cdef int io_auto(data, GDALRasterBandH band, bint write, int resampling=0) excep
 
 cdef class DatasetReaderBase(DatasetBase):
 
+    property block_cache:
+        """A BlockCache or SharedBlockCache serving reads, or None
+
+        See rasterio.blockcache. Reads of windows aligned to the blocks
+        of the dataset's bands, without resampling or conversion of
+        data types, are served from the cache's blocks.
+
+        Blocks are shared by all datasets opened from the same path
+        with the cache attached, but they are only invalidated by
+        writes of a dataset with the cache attached. After the file is
+        written through another dataset object, one opened in 'r+' mode
+        without the cache for example, call the cache's `invalidate()`
+        method or cached blocks will be stale.
+        """
+        def __get__(self):
+            return self._block_cache
+
+        def __set__(self, cache):
+            self._block_cache = cache
+
     def read(self, indexes=None, out=None, window=None, masked=False,
             out_shape=None, boundless=False, resampling=Resampling.nearest,
-            fill_value=None):
+            fill_value=None, overview_level=None, out_dtype=None,
+            progress=None, layout='band'):
         """Read a dataset's raw pixels as an N-d array
 
         This data is read from the dataset's band cache, which means
@@ -198,6 +307,43 @@ cdef class DatasetReaderBase(DatasetBase):
         fill_value : scalar
             Fill value applied in the `boundless=True` case only.
 
+        overview_level : int or 'auto', optional
+            Read pixels directly from the overview at this level (0 is
+            the first, finest, overview) instead of leaving the choice
+            of overview to GDAL. The `window` is always expressed in
+            full resolution pixels. If neither `out` nor `out_shape`
+            are given, the natural shape of the window at the
+            overview's resolution is used. The value 'auto' selects the
+            level returned by `best_overview_level()` for the shape of
+            `out` or `out_shape` and the `window`; call that method
+            with the same arguments to learn which level serves the
+            read, None meaning the full resolution band. The level is
+            also logged at the debug level. Cannot be combined with
+            boundless reads.
+
+        out_dtype : str or numpy dtype, optional
+            The data type of the output array, by default that of the
+            dataset's bands or of `out`. Pixels are converted by GDAL
+            while they are copied, without an intermediate array.
+            Values converted to integers are rounded and clipped to
+            the range of the output type.
+
+        progress : callable or CancellationToken, optional
+            A function called by GDAL with the completed fraction of
+            the read, which cancels the read by raising an exception,
+            or a CancellationToken. Progress of the read of pixels is
+            reported, not that of masks.
+
+        layout : str, optional
+            'band' (the default) for arrays of (bands, rows, columns)
+            shape or 'pixel' for arrays of (rows, columns, bands)
+            shape, the layout of images in image processing and
+            machine learning code. A new pixel layout array is
+            C-contiguous and filled by GDAL in a single request, like
+            a band layout array, without a reshaped copy. `out` and
+            `out_shape` have the same layout as the result. Reads of a
+            single band index return 2D arrays in either layout.
+
         Returns
         -------
         Numpy ndarray or a view on a Numpy ndarray
@@ -212,6 +358,15 @@ cdef class DatasetReaderBase(DatasetBase):
         if self.mode == "w":
             raise UnsupportedOperation("not readable")
 
+        # Pixel layout arrays are read through views of (bands, rows,
+        # columns) shape.
+        _check_layout(layout)
+        if layout == 'pixel':
+            if out is not None and out.ndim == 3:
+                out = np.transpose(out, [2, 0, 1])
+            if out_shape is not None and len(out_shape) == 3:
+                out_shape = tuple(out_shape[2:]) + tuple(out_shape[:2])
+
         return2d = False
         if indexes is None:
             indexes = self.indexes
@@ -225,6 +380,17 @@ cdef class DatasetReaderBase(DatasetBase):
         if not indexes:
             raise ValueError("No indexes to read")
 
+        if out is not None:
+            if out_dtype is not None and np.dtype(out_dtype) != out.dtype:
+                raise ValueError(
+                    "the array's dtype '%s' does not match out_dtype '%s'" %
+                    (out.dtype, out_dtype))
+            out_dtype = _io_dtype(out.dtype)
+            if out.dtype != out_dtype:
+                raise ValueError("'out' must have native byte order")
+        elif out_dtype is not None:
+            out_dtype = _io_dtype(out_dtype)
+
         check_dtypes = set()
         nodatavals = []
         # Check each index before processing 3D array
@@ -240,12 +406,15 @@ cdef class DatasetReaderBase(DatasetBase):
 
             log.debug("Output nodata value read from file: %r", ndv)
 
+            # Nodata values are clipped to the range of the output.
+            ndv_dtype = np.dtype(dtype if out_dtype is None else out_dtype)
+
             if ndv is not None:
-                if np.dtype(dtype).kind in ('i', 'u'):
-                    info = np.iinfo(dtype)
+                if ndv_dtype.kind in ('i', 'u'):
+                    info = np.iinfo(ndv_dtype)
                     dt_min, dt_max = info.min, info.max
-                elif np.dtype(dtype).kind in ('f', 'c'):
-                    info = np.finfo(dtype)
+                elif ndv_dtype.kind in ('f', 'c'):
+                    info = np.finfo(ndv_dtype)
                     dt_min, dt_max = info.min, info.max
                 else:
                     dt_min, dt_max = False, True
@@ -258,14 +427,22 @@ cdef class DatasetReaderBase(DatasetBase):
 
         log.debug("Output nodata values: %r", nodatavals)
 
-        # Mixed dtype reads are not supported at this time.
+        # Bands of mixed dtypes are read together only if converted
+        # to a single dtype. See read_bands() for other cases.
         if len(check_dtypes) > 1:
-            raise ValueError("more than one 'dtype' found")
+            if out_dtype is None:
+                raise ValueError(
+                    "more than one 'dtype' found. Use out_dtype or "
+                    "read_bands() to read bands of mixed dtypes.")
+            dtype = out_dtype
         elif len(check_dtypes) == 0:
             dtype = self.dtypes[0]
         else:
             dtype = check_dtypes.pop()
 
+        if out_dtype is None:
+            out_dtype = np.dtype(dtype)
+
         # Get the natural shape of the read window, boundless or not.
         # The window can have float values. In this case, we round up
         # when computing the shape.
@@ -289,15 +466,42 @@ cdef class DatasetReaderBase(DatasetBase):
         else:
             win_shape += self.shape
 
+        # Resolve the overview level, if any, before the output array
+        # is allocated because an explicit level changes the natural
+        # shape of the read window.
+        if overview_level is not None:
+            if boundless and window:
+                raise ValueError(
+                    "overview_level cannot be combined with boundless reads")
+
+            if overview_level == 'auto':
+                if out is not None:
+                    target_shape = out.shape[-2:]
+                elif out_shape is not None:
+                    target_shape = out_shape[-2:]
+                else:
+                    target_shape = win_shape[1:]
+                overview_level = self.best_overview_level(
+                    target_shape, window=window, bidx=indexes[0])
+
+            else:
+                overview_level = int(overview_level)
+                for bidx in indexes:
+                    ovr_height, ovr_width = self._overview_shape(
+                        bidx, overview_level)
+                if out is None and out_shape is None:
+                    win_height, win_width = win_shape[1:]
+                    win_shape = (len(indexes),) + (
+                        max(1, int(round(win_height * ovr_height / self.height))),
+                        max(1, int(round(win_width * ovr_width / self.width))))
+
+            log.debug("Overview level serving read: %r", overview_level)
+
         if out is not None and out_shape is not None:
             raise ValueError("out and out_shape are exclusive")
 
         # `out` takes precedence over `out_shape`.
         elif out is not None:
-            if out.dtype != dtype:
-                raise ValueError(
-                    "the array's dtype '%s' does not match "
-                    "the file's dtype '%s'" % (out.dtype, dtype))
             if out.shape[0] != win_shape[0]:
                 raise ValueError(
                     "'out' shape %s does not match window shape %s" %
@@ -314,10 +518,8 @@ cdef class DatasetReaderBase(DatasetBase):
             # TODO: profile and see if we should avoid this in the
             # bounded case.
 
-            if boundless:
-                out = np.zeros(out_shape, dtype=dtype)
-            else:
-                out = np.empty(out_shape, dtype=dtype)
+            out = _new_array(
+                out_shape, out_dtype, layout=layout, zeros=boundless)
 
         # Masking
         # -------
@@ -341,17 +543,23 @@ cdef class DatasetReaderBase(DatasetBase):
             log.debug("Jump straight to _read()")
             log.debug("Window: %r", window)
 
-            out = self._read(indexes, out, window, dtype,
-                             resampling=resampling)
+            if (self._block_cache is None or overview_level is not None or
+                    progress is not None or
+                    not self._read_cached_blocks(indexes, out, window)):
+                out = self._read(indexes, out, window, out_dtype,
+                                 resampling=resampling,
+                                 overview_level=overview_level,
+                                 progress=progress)
 
             if masked or fill_value is not None:
                 if all_valid:
                     mask = np.ma.nomask
                 else:
-                    mask = np.zeros(out.shape, 'uint8')
+                    mask = _new_array(out.shape, 'uint8', layout=layout)
                     mask = ~self._read(
                         indexes, mask, window, 'uint8', masks=True,
-                        resampling=resampling).astype('bool')
+                        resampling=resampling,
+                        overview_level=overview_level).astype('bool')
 
                 kwds = {'mask': mask}
                 # Set a fill value only if the read bands share a
@@ -391,7 +599,7 @@ cdef class DatasetReaderBase(DatasetBase):
 
                 out = vrt._read(
                     indexes, out, Window(0, 0, window.width, window.height),
-                    None, resampling=resampling)
+                    None, resampling=resampling, progress=progress)
 
                 if masked:
 
@@ -407,13 +615,13 @@ cdef class DatasetReaderBase(DatasetBase):
                             masked=True)
 
                         with DatasetReaderBase(UnparsedPath(mask_vrt_doc), **vrt_kwds) as mask_vrt:
-                            mask = np.zeros(out.shape, 'uint8')
+                            mask = _new_array(out.shape, 'uint8', layout=layout)
                             mask = ~mask_vrt._read(
                                 indexes, mask, Window(0, 0, window.width, window.height), None).astype('bool')
 
 
                     else:
-                        mask = np.zeros(out.shape, 'uint8')
+                        mask = _new_array(out.shape, 'uint8', layout=layout)
                         mask = ~vrt._read(
                             indexes, mask, Window(0, 0, window.width, window.height), None, masks=True).astype('bool')
 
@@ -432,9 +640,97 @@ cdef class DatasetReaderBase(DatasetBase):
 
         if return2d:
             out.shape = out.shape[1:]
+        elif layout == 'pixel':
+            out = np.transpose(out, [1, 2, 0])
 
         return out
 
+    def read_bands(self, indexes=None, window=None, masked=False,
+                   out_shape=None, boundless=False,
+                   resampling=Resampling.nearest, fill_value=None,
+                   overview_level=None, names=None):
+        """Read bands of mixed data types in a single call
+
+        Bands are grouped by data type and each group is read with a
+        single call to read(), which makes one RasterIO request for
+        all of its bands, instead of one per band.
+
+        Parameters
+        ----------
+        indexes : list of ints, optional
+            The bands to read. Default is all bands.
+        names : list of str, optional
+            If given, a structured array is returned with a field of
+            each of these names for the bands in `indexes`, in order.
+        window, masked, boundless, resampling, fill_value : optional
+            As for read().
+        out_shape : tuple, optional
+            The (rows, cols) of each band's array.
+        overview_level : int or 'auto', optional
+            As for read().
+
+        Returns
+        -------
+        list or Numpy structured array
+            A list of 2D arrays in the order of `indexes`, each a view
+            on the array read for its group, or a 2D structured array
+            if `names` is given. Masked arrays if `masked` is True.
+
+        Raises
+        ------
+        ValueError
+            If the number of names differs from the number of bands.
+        """
+        if indexes is None:
+            indexes = self.indexes
+        elif isinstance(indexes, int):
+            indexes = [indexes]
+        indexes = list(indexes)
+
+        if names is not None and len(names) != len(indexes):
+            raise ValueError(
+                "{} names were given for {} bands".format(
+                    len(names), len(indexes)))
+
+        if out_shape is not None:
+            out_shape = (1,) + tuple(out_shape[-2:])
+
+        groups = {}
+        for bidx in indexes:
+            if bidx not in self.indexes:
+                raise IndexError("band index {} out of range".format(bidx))
+            groups.setdefault(self.dtypes[bidx - 1], []).append(bidx)
+
+        bands = {}
+        for group in groups.values():
+            group_shape = None
+            if out_shape is not None:
+                group_shape = (len(group),) + out_shape[1:]
+            data = self.read(
+                group, window=window, masked=masked, out_shape=group_shape,
+                boundless=boundless, resampling=resampling,
+                fill_value=fill_value, overview_level=overview_level)
+            for bidx, arr in zip(group, data):
+                bands[bidx] = arr
+
+        arrays = [bands[bidx] for bidx in indexes]
+        if names is None:
+            return arrays
+
+        out = np.empty(
+            arrays[0].shape,
+            dtype=[(name, arr.dtype) for name, arr in zip(names, arrays)])
+        for name, arr in zip(names, arrays):
+            out[name] = arr
+
+        if masked:
+            mask = np.empty(
+                out.shape, dtype=[(name, 'bool') for name in names])
+            for name, arr in zip(names, arrays):
+                mask[name] = np.ma.getmaskarray(arr)
+            out = np.ma.array(out, mask=mask)
+
+        return out
 
     def read_masks(self, indexes=None, out=None, out_shape=None, window=None,
                    boundless=False, resampling=Resampling.nearest):
@@ -622,7 +918,8 @@ cdef class DatasetReaderBase(DatasetBase):
 
 
     def _read(self, indexes, out, window, dtype, masks=False,
-              resampling=Resampling.nearest):
+              resampling=Resampling.nearest, overview_level=None,
+              progress=None):
         """Read raster bands as a multidimensional array
 
         If `indexes` is a list, the result is a 3D array, but
@@ -633,6 +930,12 @@ cdef class DatasetReaderBase(DatasetBase):
 
         See `read_band` for usage of the optional `window` argument.
 
+        If `overview_level` is not None, pixels are read from the
+        band overviews at that level. The window is scaled from full
+        resolution to overview pixels.
+
+        `progress` is as for read().
+
         The return type will be either a regular NumPy array, or a masked
         NumPy array depending on the `masked` argument. The return type is
         forced if either `True` or `False`, but will be chosen if `None`.
@@ -642,8 +945,11 @@ cdef class DatasetReaderBase(DatasetBase):
         """
         cdef int aix, bidx, indexes_count
         cdef double height, width, xoff, yoff
+        cdef double xscale, yscale
         cdef int retval = 0
         cdef GDALDatasetH dataset = NULL
+        cdef GDALRasterBandH band = NULL
+        cdef _ProgressHook hook = _ProgressHook(progress)
 
         if out is None:
             raise ValueError("An output array is required.")
@@ -687,16 +993,183 @@ cdef class DatasetReaderBase(DatasetBase):
                         if MaskFlags.nodata in flags:
                             warnings.warn(NodataShadowWarning())
 
-                io_multi_mask(self._hds, 0, xoff, yoff, width, height, out, indexes_arr, resampling=resampling)
+            if overview_level is not None:
+                # Overview bands don't belong to a dataset, so we do
+                # band by band I/O with the window scaled to the
+                # overview's pixels. A per-dataset mask is read once.
+                shared_mask = None
+                for i, bidx in enumerate(indexes):
+                    ovr_height, ovr_width = self._overview_shape(
+                        bidx, overview_level)
+                    xscale = <double>ovr_width / self.width
+                    yscale = <double>ovr_height / self.height
+                    band = GDALGetOverview(self.band(bidx), overview_level)
+                    if masks:
+                        if GDALGetMaskFlags(band) & GMF_PER_DATASET:
+                            if shared_mask is not None:
+                                out[i] = out[shared_mask]
+                                continue
+                            shared_mask = i
+                        band = GDALGetMaskBand(band)
+                        if band == NULL:
+                            raise ValueError("Null mask band")
+                    io_band(band, 0, xoff * xscale, yoff * yscale,
+                            max(1.0, width * xscale), max(1.0, height * yscale),
+                            out[i], resampling=resampling,
+                            progress_func=hook.func, progress_data=hook.data)
+
+            elif masks:
+                io_multi_mask(self._hds, 0, xoff, yoff, width, height, out, indexes_arr, resampling=resampling,
+                              progress_func=hook.func, progress_data=hook.data)
 
             else:
-                io_multi_band(self._hds, 0, xoff, yoff, width, height, out, indexes_arr, resampling=resampling)
+                io_multi_band(self._hds, 0, xoff, yoff, width, height, out, indexes_arr, resampling=resampling,
+                              progress_func=hook.func, progress_data=hook.data)
 
         except CPLE_BaseError as cplerr:
+            hook.check()
             raise RasterioIOError("Read or write failed. {}".format(cplerr))
 
+        hook.check()
         return out
 
+    def _read_cached_blocks(self, indexes, out, window):
+        """Read a block aligned window through the block cache
+
+        Blocks missing from the cache are read and stored.
+
+        Returns
+        -------
+        bool
+            False if the read can't be served by the cache: the window
+            isn't aligned to blocks, `out` has another shape, or the
+            bands differ in block shape or data type from `out`.
+        """
+        cache = self._block_cache
+
+        if window is None:
+            window = Window(0, 0, self.width, self.height)
+        (row_start, row_stop), (col_start, col_stop) = window.toranges()
+        if not all(float(x).is_integer() for x in (
+                row_start, row_stop, col_start, col_stop)):
+            return False
+        row_start, row_stop = int(row_start), int(row_stop)
+        col_start, col_stop = int(col_start), int(col_stop)
+        if out.shape[1:] != (row_stop - row_start, col_stop - col_start):
+            return False
+        if row_stop <= row_start or col_stop <= col_start:
+            return False
+
+        block_shape = self.block_shapes[indexes[0] - 1]
+        for bidx in indexes:
+            if (self.block_shapes[bidx - 1] != block_shape or
+                    np.dtype(self.dtypes[bidx - 1]) != out.dtype):
+                return False
+        block_height, block_width = block_shape
+        if (row_start % block_height or col_start % block_width or
+                (row_stop % block_height and row_stop != self.height) or
+                (col_stop % block_width and col_stop != self.width)):
+            return False
+
+        rows, cols = _block_indexes(window, block_shape)
+        for i in rows:
+            for j in cols:
+                block = Window(
+                    j * block_width, i * block_height,
+                    min(block_width, self.width - j * block_width),
+                    min(block_height, self.height - i * block_height))
+                dst = out[
+                    :, block.row_off - row_start:
+                    block.row_off - row_start + block.height,
+                    block.col_off - col_start:
+                    block.col_off - col_start + block.width]
+                missing = []
+                for k, bidx in enumerate(indexes):
+                    arr = cache.get(self, bidx, i, j)
+                    if arr is None:
+                        missing.append(k)
+                    else:
+                        dst[k] = arr
+                if missing:
+                    data = self._read(
+                        [indexes[k] for k in missing],
+                        np.empty((len(missing), block.height, block.width),
+                                 dtype=out.dtype),
+                        block, None)
+                    for k, arr in zip(missing, data):
+                        dst[k] = arr
+                        # A view would keep all of data alive.
+                        cache.put(self, indexes[k], i, j, arr.copy())
+        return True
+
+    def _overview_shape(self, bidx, level):
+        """Return the (height, width) of a band's overview
+
+        Raises
+        ------
+        BandOverviewError
+            If the band has no overview at the given level.
+        """
+        cdef GDALRasterBandH ovrband = NULL
+
+        if level < 0:
+            raise BandOverviewError(
+                "Failed to retrieve overview {}".format(level))
+        ovrband = GDALGetOverview(self.band(bidx), level)
+        if ovrband == NULL:
+            raise BandOverviewError(
+                "Failed to retrieve overview {}".format(level))
+        return (GDALGetRasterBandYSize(ovrband),
+                GDALGetRasterBandXSize(ovrband))
+
+    def best_overview_level(self, out_shape, window=None, bidx=1):
+        """Find the overview level best suited to a decimated read
+
+        The best level is that of the smallest overview which still
+        has at least as many pixels as `out_shape` over the extent of
+        `window`. This is the level that will serve a read with
+        `overview_level='auto'`.
+
+        Parameters
+        ----------
+        out_shape : tuple
+            The shape of the output array. Only the last two items,
+            (rows, columns), are considered.
+        window : Window or tuple, optional
+            The window to be read. Defaults to the entire dataset.
+        bidx : int, optional
+            The index of the band whose overviews are considered.
+
+        Returns
+        -------
+        int or None
+            An overview level or None if the read is best served by
+            the full resolution band.
+        """
+        cdef GDALRasterBandH band = NULL
+
+        out_height, out_width = out_shape[-2:]
+
+        if window:
+            if isinstance(window, tuple):
+                window = Window.from_slices(
+                    *window, height=self.height, width=self.width)
+            win_height, win_width = window.height, window.width
+        else:
+            win_height, win_width = self.height, self.width
+
+        band = self.band(bidx)
+        best = None
+
+        for level in range(GDALGetOverviewCount(band)):
+            ovr_height, ovr_width = self._overview_shape(bidx, level)
+            if (win_width * ovr_width / self.width >= out_width and
+                    win_height * ovr_height / self.height >= out_height):
+                if best is None or ovr_width < best_width:
+                    best, best_width = level, ovr_width
+
+        return best
+
     def dataset_mask(self, out=None, out_shape=None, window=None,
                      boundless=False, resampling=Resampling.nearest):
         """Calculate the dataset's 2D mask. Derived from the individual band masks
@@ -773,36 +1246,928 @@ cdef class DatasetReaderBase(DatasetBase):
         # generator implemented in sample.py.
         return sample_gen(self, xy, indexes)
 
+    def _handle_driver(self):
+        """The name of the driver of the dataset's GDAL handle
+
+        This differs from `driver` for buffered writers.
+        """
+        return get_driver_name(GDALGetDatasetDriver(self._hds))
+
+    def _reopenable(self):
+        """True if the dataset has a file from which it can be reopened"""
+        return (bool(GDALGetDescription(self._hds)) and
+                self._handle_driver() != 'MEM')
+
+    def _check_reopenable(self, num_threads):
+        """Raise ValueError if threads can't have their own handles"""
+        if num_threads > 1 and not self._reopenable():
+            raise ValueError(
+                "num_threads greater than 1 requires a dataset that can "
+                "be reopened from a file, not a {} dataset or "
+                "WarpedVRT".format(self.driver))
+
+    def _open_reader(self):
+        """Open another, read-only, handle on this dataset
+
+        GDAL dataset handles can't be shared between threads, so
+        threads that read a dataset in the background use their own.
+        The dataset is reopened by file name with its driver and, if
+        it was opened in 'r' or 'r+' mode, with its opening options.
+        Anything written by this handle is flushed first.
+
+        Returns
+        -------
+        DatasetReaderBase or None
+            None if the dataset has no file from which it can be
+            reopened, as for MEM datasets and WarpedVRTs.
+        """
+        if not self._reopenable():
+            return None
+
+        GDALFlushCache(self._hds)
+        name = GDALGetDescription(self._hds)
+        driver = self._handle_driver()
+
+        # A buffered writer's options are not those of its buffer.
+        if self.mode == 'r':
+            options = self.options
+        elif self.mode == 'r+' and driver == self.driver:
+            options = self._options
+        else:
+            options = None
+        return DatasetReaderBase(
+            UnparsedPath(name), driver=driver, sharing=False,
+            **(options or {}))
+
+    def _map_windows(self, func, windows, num_threads=1):
+        """Generate the results of func(reader, window) for windows
+
+        Results are in the order of `windows`. They are computed in this
+        thread with this dataset as the reader or in a pool of threads
+        that share handles opened by `_open_reader()`, one per thread.
+
+        Raises
+        ------
+        ValueError
+            If num_threads is greater than 1 and the dataset can't be
+            reopened.
+        """
+        if num_threads <= 1:
+            for window in windows:
+                yield func(self, window)
+            return
+
+        self._check_reopenable(num_threads)
+        readers = []
+        try:
+            for _ in range(num_threads):
+                readers.append(self._open_reader())
+
+            idle = queue.Queue()
+            for reader in readers:
+                idle.put(reader)
+
+            def worker(window):
+                reader = idle.get()
+                try:
+                    return func(reader, window)
+                finally:
+                    idle.put(reader)
+
+            with ThreadPoolExecutor(max_workers=num_threads) as pool:
+                for result in pool.map(worker, windows):
+                    yield result
+        finally:
+            for reader in readers:
+                reader.close()
+
+    def _advise_read(self, window, indexes):
+        """Tell GDAL that a window of bands will be read soon
+
+        Drivers that support it, such as GTiff on /vsicurl/, may then
+        fetch the window's blocks in fewer requests. Windows beyond the
+        dataset's extent are cropped. This is only a hint and failures
+        are ignored.
+        """
+        cdef int *bandmap = NULL
+        cdef int count = len(indexes)
+        cdef int xoff, yoff, xsize, ysize
+
+        if isinstance(window, tuple):
+            window = Window.from_slices(
+                *window, height=self.height, width=self.width,
+                boundless=True)
+        window = window.crop(self.height, self.width)
+        window = window.round_offsets().round_lengths('ceil')
+        xoff, yoff = <int>window.col_off, <int>window.row_off
+        xsize, ysize = <int>window.width, <int>window.height
+        if xsize <= 0 or ysize <= 0 or count == 0:
+            return
+
+        bandmap = <int *>CPLMalloc(count * sizeof(int))
+        try:
+            for i, bidx in enumerate(indexes):
+                bandmap[i] = <int>bidx
+            with nogil:
+                GDALDatasetAdviseRead(
+                    self._hds, xoff, yoff, xsize, ysize, xsize, ysize,
+                    GDT_Unknown, count, bandmap, NULL)
+        finally:
+            CPLFree(bandmap)
+
+    def iter_windows(self, windows=None, indexes=None, prefetch=2,
+                     advise=True, **kwargs):
+        """Read windows ahead of their use in a background thread
+
+        While the caller processes one window's array, a thread with
+        its own dataset handle reads the next ones, so that I/O, such
+        as that of /vsicurl/ datasets or network filesystems, overlaps
+        with computation. The thread starts at the first iteration and
+        is stopped when the iterator is exhausted or closed. Datasets
+        that can't be reopened, such as MEM datasets and WarpedVRTs,
+        are read in the calling thread without prefetching.
+
+        Parameters
+        ----------
+        windows : iterable of Window or tuple, optional
+            The windows to read. By default, the windows of the blocks
+            of the first band read, as from `block_windows()`.
+        indexes : list of ints or a single int, optional
+            The bands to read, as for `read()`.
+        prefetch : int, optional
+            The number of arrays that may be read ahead of the caller.
+        advise : bool, optional
+            If True (the default), GDAL is told by AdviseRead() of the
+            next `prefetch` windows before each window is read, which
+            lets some drivers fetch their blocks ahead and in fewer
+            requests.
+        kwargs : optional
+            Other arguments of `read()`, except `out`.
+
+        Yields
+        ------
+        tuple
+            A window and its array.
+
+        Raises
+        ------
+        ValueError
+            If prefetch is less than 1 or `out` is given.
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        if 'out' in kwargs:
+            raise ValueError("out can't be shared by prefetched arrays")
+
+        if indexes is None:
+            band_indexes = list(self.indexes)
+        elif isinstance(indexes, int):
+            band_indexes = [indexes]
+        else:
+            band_indexes = list(indexes)
+
+        if windows is None:
+            windows = (
+                window for _, window in self.block_windows(band_indexes[0]))
+
+        reader = self._open_reader()
+        if reader is None:
+            # Without another handle, windows are read in this thread.
+            for window in windows:
+                yield window, self.read(indexes, window=window, **kwargs)
+            return
+
+        results = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            """Wait for room in the queue unless the iterator is closed"""
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        ahead = deque()
+        windows = iter(windows)
+
+        def look_ahead():
+            """Take up to prefetch windows ahead, advising GDAL of each"""
+            while len(ahead) < prefetch:
+                try:
+                    window = next(windows)
+                except StopIteration:
+                    return
+                if advise:
+                    reader._advise_read(window, band_indexes)
+                ahead.append(window)
+
+        def worker():
+            try:
+                look_ahead()
+                while ahead:
+                    window = ahead.popleft()
+                    look_ahead()
+                    data = reader.read(indexes, window=window, **kwargs)
+                    if not put((window, data, None)):
+                        return
+                put(None)
+            except Exception as exc:
+                put((None, None, exc))
+            finally:
+                reader.close()
+
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+        try:
+            while True:
+                item = results.get()
+                if item is None:
+                    return
+                window, data, exc = item
+                if exc is not None:
+                    raise exc
+                yield window, data
+        finally:
+            stop.set()
+            thread.join()
+
+    def read_windows(self, windows, indexes=None, masked=False,
+                     out_dtype=None, stack=False, num_threads=1):
+        """Read many windows, reading each block they need once
+
+        The blocks that the windows intersect are found and adjacent
+        blocks of a row are coalesced into runs. Each run is read by
+        one request and the windows' arrays are sliced from the runs,
+        so blocks shared by overlapping or nearby windows, such as
+        chips around many points, are read once instead of once per
+        window. This suits many small windows: the runs of a read
+        are in memory at once.
+
+        Parameters
+        ----------
+        windows : iterable of Window or tuple
+            The windows to read. They are cropped to the dataset's
+            extent and rounded to whole pixels.
+        indexes : list of ints or a single int, optional
+            If `indexes` is a list, the arrays of windows are 3D, but
+            are 2D if it is a band index number.
+        masked : bool, optional
+            If True, masked arrays are returned.
+        out_dtype : str or numpy dtype, optional
+            The data type of the arrays, as for `read()`.
+        stack : bool, optional
+            If True, the arrays are stacked in one array with an extra
+            first axis. The windows must have the same shape.
+        num_threads : int, optional
+            The number of threads reading runs. Each has its own
+            dataset handle.
+
+        Returns
+        -------
+        list of Numpy ndarrays or a Numpy ndarray
+            The arrays of the windows, in their order.
+
+        Raises
+        ------
+        ValueError
+            If windows of different shapes are stacked, bands of
+            mixed data types are read without `out_dtype`, or
+            num_threads is less than 1.
+        """
+        if num_threads < 1:
+            raise ValueError("num_threads must be at least 1")
+
+        return2d = isinstance(indexes, int)
+        if indexes is None:
+            indexes = list(self.indexes)
+        elif return2d:
+            indexes = [indexes]
+        else:
+            indexes = list(indexes)
+        if not indexes:
+            raise ValueError("No indexes to read")
+        for bidx in indexes:
+            if bidx not in self.indexes:
+                raise IndexError("band index {} out of range".format(bidx))
+
+        if out_dtype is None:
+            band_dtypes = set(self.dtypes[bidx - 1] for bidx in indexes)
+            if len(band_dtypes) > 1:
+                raise ValueError(
+                    "more than one 'dtype' found. Use out_dtype to read "
+                    "bands of mixed dtypes.")
+            out_dtype = band_dtypes.pop()
+        out_dtype = _io_dtype(out_dtype)
+
+        wins = []
+        for window in windows:
+            if isinstance(window, tuple):
+                window = Window.from_slices(
+                    *window, height=self.height, width=self.width)
+            window = window.crop(self.height, self.width)
+            wins.append(window.round_offsets().round_lengths())
+
+        shapes = [
+            (len(indexes), int(window.height), int(window.width))
+            for window in wins]
+        if stack:
+            if len(set(shapes)) > 1:
+                raise ValueError("windows of different shapes can't be stacked")
+            out = np.empty(
+                (len(wins),) + (shapes[0] if shapes else (len(indexes), 0, 0)),
+                dtype=out_dtype)
+            datas = list(out)
+        else:
+            datas = [np.empty(shape, dtype=out_dtype) for shape in shapes]
+        if masked:
+            if stack:
+                out_mask = np.zeros(out.shape, dtype='bool')
+                masks = list(out_mask)
+            else:
+                masks = [np.zeros(shape, dtype='bool') for shape in shapes]
+
+        block_shape = self.block_shapes[indexes[0] - 1]
+        block_height = block_shape[0]
+        runs = _block_runs(wins, block_shape, self.height, self.width)
+        run_of_block = {}
+        for k, run in enumerate(runs):
+            rows, cols = _block_indexes(run, block_shape)
+            for j in cols:
+                run_of_block[(rows[0], j)] = k
+
+        def read_run(reader, run):
+            return reader.read(
+                indexes, window=run, masked=masked, out_dtype=out_dtype)
+
+        arrays = list(self._map_windows(read_run, runs, num_threads))
+
+        for k, window in enumerate(wins):
+            (row_start, row_stop), (col_start, col_stop) = window.toranges()
+            rows, cols = _block_indexes(window, block_shape)
+            for n in sorted(set(run_of_block[(i, j)] for i in rows for j in cols)):
+                (run_row, _), (run_col, run_col_stop) = runs[n].toranges()
+                top = max(row_start, run_row)
+                bottom = min(row_stop, run_row + block_height)
+                left = max(col_start, run_col)
+                right = min(col_stop, run_col_stop)
+                src_slices = (
+                    slice(None), slice(top - run_row, bottom - run_row),
+                    slice(left - run_col, right - run_col))
+                dst_slices = (
+                    slice(None), slice(top - row_start, bottom - row_start),
+                    slice(left - col_start, right - col_start))
+                datas[k][dst_slices] = np.ma.getdata(arrays[n])[src_slices]
+                if masked:
+                    masks[k][dst_slices] = np.ma.getmaskarray(
+                        arrays[n])[src_slices]
+
+        if stack:
+            if masked:
+                out = np.ma.array(out, mask=out_mask)
+            return out[:, 0] if return2d else out
+
+        if masked:
+            datas = [np.ma.array(data, mask=mask)
+                     for data, mask in zip(datas, masks)]
+        return [data[0] for data in datas] if return2d else datas
+
+    def _stats_window(self, bidx, window):
+        """Check a band index and return a whole pixel window"""
+        if bidx not in self.indexes:
+            raise IndexError("band index {} out of range".format(bidx))
+        full = Window(0, 0, self.width, self.height)
+        if window is None:
+            return full
+        if isinstance(window, tuple):
+            window = Window.from_slices(
+                *window, height=self.height, width=self.width)
+        window = window.round_offsets().round_lengths()
+        return intersection([window, full])
+
+    def _stats_chunks(self, bidx, window, level=None):
+        """Chunks of a band's window and the shapes of their arrays
+
+        Without an overview level, chunks are those of _chunk_windows()
+        and are read in their natural shape. With one, chunks are
+        aligned to the overview's blocks and given in full resolution
+        pixels that cover whole overview pixels, so that they neither
+        overlap nor leave gaps at the overview's resolution.
+        """
+        cdef int xsize, ysize
+
+        if level is None:
+            return ((chunk, None) for chunk in _chunk_windows(
+                window, self.block_shapes[bidx - 1]))
+
+        ovr_height, ovr_width = self._overview_shape(bidx, level)
+        yscale = float(self.height) / ovr_height
+        xscale = float(self.width) / ovr_width
+        GDALGetBlockSize(
+            GDALGetOverview(self.band(bidx), level), &xsize, &ysize)
+
+        (row_start, row_stop), (col_start, col_stop) = window.toranges()
+        row_start = int(math.floor(row_start / yscale))
+        row_stop = max(row_start + 1, min(ovr_height, int(math.ceil(row_stop / yscale))))
+        col_start = int(math.floor(col_start / xscale))
+        col_stop = max(col_start + 1, min(ovr_width, int(math.ceil(col_stop / xscale))))
+        ovr_window = Window(
+            col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+        return [
+            (Window(chunk.col_off * xscale, chunk.row_off * yscale,
+                    chunk.width * xscale, chunk.height * yscale),
+             (int(chunk.height), int(chunk.width)))
+            for chunk in _chunk_windows(ovr_window, (ysize, xsize))]
+
+    def statistics(self, bidx, approx=False, window=None, num_threads=1):
+        """Compute the statistics of a band's valid pixels
+
+        The band is read one chunk of blocks at a time and the partial
+        results of chunks are merged, so it never needs to fit in
+        memory. Pixels that are masked, by nodata values or a mask
+        band, and NaN values are excluded.
+
+        Parameters
+        ----------
+        bidx : int
+            The index of the band.
+        approx : bool, optional
+            If True, statistics may be read from the band's metadata,
+            where GDAL caches them, or computed from an overview of
+            about 1024 x 1024 pixels. Otherwise every pixel is read.
+        window : Window or tuple, optional
+            A window of the band. Cached statistics are used only for
+            the entire band.
+        num_threads : int, optional
+            The number of threads reading chunks. Each has its own
+            dataset handle.
+
+        Returns
+        -------
+        Statistics
+            A named tuple of min, max, mean, std, and count.
+
+        Raises
+        ------
+        IndexError
+            If there is no such band.
+        ValueError
+            If num_threads is less than 1.
+        """
+        if num_threads < 1:
+            raise ValueError("num_threads must be at least 1")
+
+        window_arg = window
+        window = self._stats_window(bidx, window)
+
+        level = None
+        if approx:
+            if window_arg is None:
+                cached = _cached_statistics(self.tags(bidx))
+                if cached is not None:
+                    return cached
+            level = self.best_overview_level(
+                (1024, 1024), window=window, bidx=bidx)
+
+        def reduce(reader, chunk):
+            chunk_window, chunk_shape = chunk
+            return _Moments.from_array(reader.read(
+                bidx, window=chunk_window, masked=True, out_shape=chunk_shape,
+                overview_level=level))
+
+        moments = _Moments()
+        chunks = self._stats_chunks(bidx, window, level)
+        for partial in self._map_windows(reduce, chunks, num_threads):
+            moments.update(partial)
+        return moments.statistics()
+
+    def histogram(self, bidx, bins=256, range=None, approx=False,
+                  window=None, num_threads=1):
+        """Compute the histogram of a band's valid pixels
+
+        Like statistics(), the band is read one chunk of blocks at a
+        time and pixels that are masked or NaN are excluded. Counts of
+        chunks are summed.
+
+        Parameters
+        ----------
+        bidx : int
+            The index of the band.
+        bins : int, optional
+            The number of equal width bins.
+        range : (float, float), optional
+            The lower and upper edges of the bins. By default, the
+            minimum and maximum of the band's valid pixels, which takes
+            an extra pass over the band unless `approx` is True and
+            statistics are cached.
+        approx : bool, optional
+            If True, the histogram is computed from an overview of
+            about 1024 x 1024 pixels, if there is one.
+        window : Window or tuple, optional
+            A window of the band.
+        num_threads : int, optional
+            The number of threads reading chunks.
+
+        Returns
+        -------
+        tuple
+            An array of counts and an array of `bins` + 1 bin edges,
+            as returned by numpy.histogram().
+        """
+        if num_threads < 1:
+            raise ValueError("num_threads must be at least 1")
+
+        window_arg = window
+        window = self._stats_window(bidx, window)
+
+        if range is None:
+            stats = self.statistics(
+                bidx, approx=approx, window=window_arg,
+                num_threads=num_threads)
+            if stats.min is None:
+                range = (0, 1)
+            else:
+                range = (stats.min, stats.max)
+
+        edges = np.histogram([], bins=bins, range=range)[1]
+
+        level = None
+        if approx:
+            level = self.best_overview_level(
+                (1024, 1024), window=window, bidx=bidx)
+
+        def reduce(reader, chunk):
+            chunk_window, chunk_shape = chunk
+            return _histogram(reader.read(
+                bidx, window=chunk_window, masked=True, out_shape=chunk_shape,
+                overview_level=level), bins, range)
+
+        counts = np.zeros(bins, dtype='int64')
+        chunks = self._stats_chunks(bidx, window, level)
+        for partial in self._map_windows(reduce, chunks, num_threads):
+            counts += partial
+        return counts, edges
+
+    def _mmap_layout(self):
+        """Check that the dataset's pixels can be memory-mapped
+
+        Returns
+        -------
+        dtype : numpy.dtype
+            The data type of the pixels, in the file's byte order.
+        samples : int
+            The number of samples per pixel in each block.
+
+        Raises
+        ------
+        MemoryMapError
+        """
+        if self.driver != 'GTiff':
+            raise MemoryMapError(
+                "Only GeoTIFF datasets can be memory-mapped, not {}".format(
+                    self.driver))
+        if not os.path.isfile(self.name):
+            raise MemoryMapError(
+                "Only datasets in local files can be memory-mapped: "
+                "{}".format(self.name))
+        if self.compression is not None:
+            raise MemoryMapError(
+                "Compressed datasets can't be memory-mapped: {}".format(
+                    self.compression.value))
+        if len(set(self.dtypes)) != 1 or self.dtypes[0] == 'complex_int16':
+            raise MemoryMapError(
+                "Data types can't be memory-mapped: {}".format(self.dtypes))
+        if any(self.tags(bidx, ns='IMAGE_STRUCTURE').get('NBITS')
+               for bidx in self.indexes):
+            raise MemoryMapError(
+                "Datasets with less than a byte per sample can't be "
+                "memory-mapped")
+
+        with open(self.name, 'rb') as f:
+            byteorder = {b'II': '<', b'MM': '>'}.get(f.read(2))
+        if byteorder is None:
+            raise MemoryMapError("Not a TIFF file: {}".format(self.name))
+
+        dtype = np.dtype(self.dtypes[0]).newbyteorder(byteorder)
+
+        if self.count > 1 and self.interleaving == Interleaving.pixel:
+            samples = self.count
+        else:
+            samples = 1
+
+        return dtype, samples
+
+    def _mmap_block_offset(self, bidx, i, j, samples):
+        """Offset of the block holding a band's pixels, in bytes"""
+        try:
+            offset = self.block_offset(1 if samples > 1 else bidx, i, j)
+        except RasterBlockError as err:
+            raise MemoryMapError(str(err))
+        if offset == 0:
+            raise MemoryMapError(
+                "Block i={0}, j={1} is absent from the file".format(i, j))
+        return offset
+
+    def as_mmap(self, indexes=None, window=None):
+        """Return a read-only view of the dataset's pixels in its file
+
+        The pixels are not read or copied: the view is backed by a
+        memory map of the dataset's file and the operating system pages
+        data in as it is accessed. This is only possible for local,
+        uncompressed, stripped GeoTIFFs whose strips are contiguous, which
+        is how GDAL writes them. For tiled GeoTIFFs, see block_mmap().
+
+        Parameters
+        ----------
+        indexes : list of ints or a single int, optional
+            If `indexes` is a list, the result is a 3D array, but is
+            a 2D array if it is a band index number. The bands of a list
+            must be evenly spaced in the file, like 1, 2, 3 or 3, 2, 1.
+        window : Window or tuple, optional
+            A window of the dataset. Defaults to the entire dataset.
+            The window must lie within the dataset.
+
+        Returns
+        -------
+        numpy.ndarray
+            A read-only array in the byte order of the file. Its bands
+            are interleaved, and thus its strides discontiguous, if the
+            dataset is pixel interleaved.
+
+        Raises
+        ------
+        MemoryMapError
+            If the dataset's layout doesn't allow it to be mapped.
+        """
+        dtype, samples = self._mmap_layout()
+
+        rows_per_strip, block_width = self.block_shapes[0]
+        if block_width != self.width:
+            raise MemoryMapError(
+                "Tiled datasets can't be mapped as a single array. "
+                "Use block_mmap() to map their blocks.")
+
+        if indexes is None:
+            bands = list(self.indexes)
+        elif isinstance(indexes, int):
+            bands = [indexes]
+        else:
+            bands = list(indexes)
+
+        if not bands:
+            raise ValueError("At least one band index is required")
+        for bidx in bands:
+            if bidx not in self.indexes:
+                raise IndexError("band index {} out of range".format(bidx))
+
+        row_stride = self.width * samples * dtype.itemsize
+        strips = int(math.ceil(self.height / float(rows_per_strip)))
+        strip_bytes = rows_per_strip * row_stride
+
+        # The bands of a pixel interleaved dataset share strips.
+        planes = [1] if samples > 1 else sorted(set(bands))
+        band_offsets = {}
+        for plane in planes:
+            start = self._mmap_block_offset(plane, 0, 0, samples)
+            for i in range(1, strips):
+                if self._mmap_block_offset(
+                        plane, i, 0, samples) != start + i * strip_bytes:
+                    raise MemoryMapError(
+                        "The strips of band {} are not contiguous".format(
+                            plane))
+            band_offsets[plane] = start
+
+        if samples > 1:
+            band_offsets = dict(
+                (bidx, band_offsets[1] + (bidx - 1) * dtype.itemsize)
+                for bidx in set(bands))
+
+        offsets = [band_offsets[bidx] for bidx in bands]
+        steps = set(b - a for a, b in zip(offsets[:-1], offsets[1:]))
+        if len(steps) > 1:
+            raise MemoryMapError(
+                "Bands {} are not evenly spaced in the file".format(bands))
+        band_stride = steps.pop() if steps else 0
+
+        if window is None:
+            row_off, col_off, height, width = 0, 0, self.height, self.width
+        else:
+            if isinstance(window, tuple):
+                window = Window.from_slices(
+                    *window, height=self.height, width=self.width)
+            row_off, col_off = int(window.row_off), int(window.col_off)
+            height, width = int(window.height), int(window.width)
+            if (row_off < 0 or col_off < 0 or height < 0 or width < 0 or
+                    row_off + height > self.height or
+                    col_off + width > self.width):
+                raise WindowError(
+                    "Window must lie within the dataset to be mapped")
+
+        col_stride = samples * dtype.itemsize
+        offsets = [o + row_off * row_stride + col_off * col_stride
+                   for o in offsets]
+        arr = _mmap_view(
+            self.name, dtype, offsets[0],
+            (len(bands), height, width),
+            (band_stride, row_stride, col_stride))
+
+        if isinstance(indexes, int):
+            return arr[0]
+        return arr
+
+    def block_mmap(self, bidx, i, j):
+        """Return a read-only view of a block's pixels in its file
+
+        The pixels are not read or copied: the view is backed by a
+        memory map of the dataset's file. This is possible for blocks
+        of local, uncompressed GeoTIFFs, tiled or stripped.
+
+        Parameters
+        ----------
+        bidx: int
+            Band index, starting with 1.
+        i: int
+            Row index of the block, starting with 0.
+        j: int
+            Column index of the block, starting with 0.
+
+        Returns
+        -------
+        numpy.ndarray
+            A read-only 2D array in the byte order of the file with the
+            shape of block_window(bidx, i, j).
+
+        Raises
+        ------
+        MemoryMapError
+            If the dataset's layout doesn't allow it to be mapped.
+        """
+        dtype, samples = self._mmap_layout()
+        if bidx not in self.indexes:
+            raise IndexError("band index {} out of range".format(bidx))
+
+        block_width = self.block_shapes[bidx - 1][1]
+        window = self.block_window(bidx, i, j)
+        if window.height <= 0 or window.width <= 0:
+            raise RasterBlockError(
+                "Block i={0}, j={1} is out of range".format(i, j))
+
+        offset = self._mmap_block_offset(bidx, i, j, samples)
+        if samples > 1:
+            offset += (bidx - 1) * dtype.itemsize
+
+        col_stride = samples * dtype.itemsize
+        return _mmap_view(
+            self.name, dtype, offset,
+            (int(window.height), int(window.width)),
+            (block_width * col_stride, col_stride))
+
+
+def _mmap_view(path, dtype, offset, shape, strides):
+    """Map a read-only array from a file
+
+    Parameters
+    ----------
+    path : str
+        Path of a local file.
+    dtype : numpy.dtype
+        Data type of the array's items.
+    offset : int
+        Offset in bytes of the array's first item in the file.
+    shape, strides : tuple
+        Shape of the array and its strides in bytes.
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    if 0 in shape:
+        arr = np.empty(shape, dtype=dtype)
+        arr.flags.writeable = False
+        return arr
+
+    lo = offset + sum(min(0, (n - 1) * s) for n, s in zip(shape, strides))
+    hi = offset + sum(max(0, (n - 1) * s) for n, s in zip(shape, strides))
+    hi += dtype.itemsize
+
+    try:
+        mm = np.memmap(path, dtype='uint8', mode='r', offset=lo,
+                       shape=(hi - lo,))
+    except (EnvironmentError, ValueError) as err:
+        raise MemoryMapError("Failed to map {}: {}".format(path, err))
+
+    return np.ndarray(shape, dtype=dtype, buffer=mm, offset=offset - lo,
+                      strides=strides)
+
+
+cdef class _MemoryFileBuffer(object):
+    """Exports the bytes behind an in-memory file as a Python buffer.
+
+    The exported memory is either owned by this object, when it has
+    been seized from the /vsimem filesystem, or borrowed from a Python
+    object that supports the buffer protocol. In both cases it remains
+    valid for as long as any view exported from this object is alive,
+    even after the in-memory file is unlinked.
+    """
+
+    cdef unsigned char *data
+    cdef Py_ssize_t size
+    cdef bint owned
+    cdef bint readonly
+    cdef int exports
+    cdef object source
+    cdef Py_ssize_t shape[1]
+    cdef Py_ssize_t strides[1]
+
+    def __getbuffer__(self, Py_buffer *view, int flags):
+        if self.readonly and (flags & PyBUF_WRITABLE) == PyBUF_WRITABLE:
+            raise BufferError("Object is not writable.")
+
+        self.shape[0] = self.size
+        self.strides[0] = 1
+
+        view.buf = <void *>self.data
+        view.obj = self
+        view.len = self.size
+        view.readonly = self.readonly
+        view.itemsize = 1
+        view.format = NULL
+        if (flags & PyBUF_FORMAT) == PyBUF_FORMAT:
+            view.format = 'B'
+        view.ndim = 1
+        view.shape = NULL
+        if (flags & PyBUF_ND) == PyBUF_ND:
+            view.shape = self.shape
+        view.strides = NULL
+        if (flags & PyBUF_STRIDES) == PyBUF_STRIDES:
+            view.strides = self.strides
+        view.suboffsets = NULL
+        view.internal = NULL
+        self.exports += 1
+
+    def __releasebuffer__(self, Py_buffer *view):
+        self.exports -= 1
+
+    def __dealloc__(self):
+        if self.owned and self.data != NULL:
+            CPLFree(self.data)
+        self.data = NULL
+
 
 cdef class MemoryFileBase(object):
     """Base for a BytesIO-like class backed by an in-memory file."""
 
-    def __init__(self, file_or_bytes=None, filename=None, ext=''):
+    # A handle kept open across calls to write().
+    cdef VSILFILE *_vsi_handle
+
+    def __init__(self, file_or_bytes=None, filename=None, ext='',
+                 capacity=None):
         """A file in an in-memory filesystem.
 
         Parameters
         ----------
-        file_or_bytes : file or bytes
-            A file opened in binary mode or bytes
+        file_or_bytes : file or bytes-like object
+            A file opened in binary mode or an object supporting the
+            buffer protocol, such as bytes, bytearray, or mmap. Buffers
+            are adopted by the in-memory file without being copied.
         filename : str
             A filename for the in-memory file under /vsimem
         ext : str
             A file extension for the in-memory file under /vsimem. Ignored if
             filename was provided.
+        capacity : int, optional
+            The number of bytes to allocate for the file when it is
+            first written, saving reallocations as it grows. Ignored if
+            file_or_bytes was provided.
         """
         cdef VSILFILE *vsi_handle = NULL
+        cdef _MemoryFileBuffer buff = None
+        cdef np.ndarray initial_bytes = None
 
-        if file_or_bytes:
-            if hasattr(file_or_bytes, 'read'):
-                initial_bytes = file_or_bytes.read()
-            elif isinstance(file_or_bytes, bytes):
-                initial_bytes = file_or_bytes
-            else:
+        if file_or_bytes is not None:
+            if isinstance(file_or_bytes, text_type):
                 raise TypeError(
                     "Constructor argument must be a file opened in binary "
                     "mode or bytes.")
-        else:
-            initial_bytes = b''
+            try:
+                initial_bytes = np.frombuffer(file_or_bytes, dtype='uint8')
+            except (TypeError, ValueError):
+                if not hasattr(file_or_bytes, 'read'):
+                    raise TypeError(
+                        "Constructor argument must be a file opened in "
+                        "binary mode or a contiguous bytes-like object.")
+                data = file_or_bytes.read()
+                if not isinstance(data, bytes):
+                    raise TypeError(
+                        "Constructor argument must be a file opened in "
+                        "binary mode or bytes.")
+                if data:
+                    initial_bytes = np.frombuffer(data, dtype='uint8')
 
         if filename:
             # GDAL's SRTMHGT driver requires the filename to be "correct" (match
@@ -812,17 +2177,31 @@ cdef class MemoryFileBase(object):
             # GDAL 2.1 requires a .zip extension for zipped files.
             self.name = '/vsimem/{0}.{1}'.format(uuid.uuid4(), ext.lstrip('.'))
 
+        if capacity is not None and capacity < 0:
+            raise ValueError("capacity must be a non-negative integer")
+
         self._path = self.name.encode('utf-8')
         self._pos = 0
+        self._buffer = None
+        self._capacity = capacity
+        self._vsi_handle = NULL
         self.closed = False
 
-        self._initial_bytes = initial_bytes
-        cdef unsigned char *buffer = self._initial_bytes
+        if initial_bytes is not None and initial_bytes.size > 0:
 
-        if self._initial_bytes:
+            # The caller's memory is registered with the /vsimem
+            # filesystem as is. GDAL does not take ownership of it and
+            # a reference to its Python object is kept for as long as
+            # this in-memory file needs it.
+            buff = _MemoryFileBuffer()
+            buff.data = <unsigned char *>np.PyArray_DATA(initial_bytes)
+            buff.size = initial_bytes.size
+            buff.owned = False
+            buff.readonly = not initial_bytes.flags.writeable
+            buff.source = initial_bytes
 
             vsi_handle = VSIFileFromMemBuffer(
-                self._path, buffer, len(self._initial_bytes), 0)
+                self._path, buff.data, buff.size, 0)
 
             if vsi_handle == NULL:
                 raise IOError(
@@ -832,6 +2211,8 @@ cdef class MemoryFileBase(object):
                 raise IOError(
                     "Failed to properly close in-memory file.")
 
+            self._buffer = buff
+
     def exists(self):
         """Test if the in-memory file exists.
 
@@ -859,52 +2240,86 @@ cdef class MemoryFileBase(object):
         -------
         int
         """
-        return self.getbuffer().size
+        cdef vsi_l_offset buffer_len = 0
+
+        if VSIGetMemFileBuffer(self._path, &buffer_len, 0) == NULL:
+            return 0
+        return buffer_len
+
+    def __dealloc__(self):
+        if self._vsi_handle != NULL:
+            VSIFCloseL(self._vsi_handle)
+        self._vsi_handle = NULL
 
     def close(self):
-        """Close MemoryFile and release allocated memory."""
+        """Close MemoryFile and release allocated memory.
+
+        Memory exported by `getbuffer()` is released when the last
+        view of it is released.
+        """
+        self._close_vsi_handle()
         VSIUnlink(self._path)
         self._pos = 0
-        self._initial_bytes = None
+        self._buffer = None
         self.closed = True
 
     def read(self, size=-1):
         """Read size bytes from MemoryFile."""
-        cdef VSILFILE *fp = NULL
+        cdef unsigned char *buffer = NULL
+        cdef vsi_l_offset buffer_len = 0
+        cdef Py_ssize_t start = self._pos
+
+        buffer = VSIGetMemFileBuffer(self._path, &buffer_len, 0)
+
         # Return no bytes immediately if the position is at or past the
         # end of the file.
-        length = len(self)
-
-        if self._pos >= length:
-            self._pos = length
+        if buffer == NULL or start >= <Py_ssize_t>buffer_len:
+            self._pos = buffer_len
             return b''
 
-        if size == -1:
-            size = length - self._pos
+        if size is None or size < 0:
+            size = buffer_len - start
         else:
-            size = min(size, length - self._pos)
+            size = min(size, buffer_len - start)
+
+        cdef Py_ssize_t stop = start + size
+        cdef bytes result = <bytes>buffer[start:stop]
+        self._pos = stop
+        return result
 
-        cdef unsigned char *buffer = <unsigned char *>CPLMalloc(size)
-        cdef bytes result
+    def readinto(self, b):
+        """Read bytes from MemoryFile into a pre-allocated buffer.
 
-        fp = VSIFOpenL(self._path, 'r')
+        Parameters
+        ----------
+        b : bytes-like object
+            A writable, contiguous object supporting the buffer
+            protocol, such as a bytearray, memoryview, or ndarray.
 
-        try:
-            fp = exc_wrap_vsilfile(fp)
-            if VSIFSeekL(fp, self._pos, 0) < 0:
-                raise IOError(
-                    "Failed to seek to offset %s in %s.",
-                    self._pos, self.name)
+        Returns
+        -------
+        int
+            The number of bytes read. 0 at the end of the file.
+        """
+        cdef unsigned char *buffer = NULL
+        cdef vsi_l_offset buffer_len = 0
+        cdef Py_ssize_t start = self._pos
+        cdef Py_ssize_t count = 0
+        cdef np.ndarray dst = np.frombuffer(b, dtype='uint8')
 
-            objects_read = VSIFReadL(buffer, 1, size, fp)
-            result = <bytes>buffer[:objects_read]
+        if not dst.flags.writeable:
+            raise TypeError("readinto() argument must be a writable buffer.")
 
-        finally:
-            VSIFCloseL(fp)
-            CPLFree(buffer)
+        buffer = VSIGetMemFileBuffer(self._path, &buffer_len, 0)
 
-        self._pos += len(result)
-        return result
+        if buffer == NULL or start >= <Py_ssize_t>buffer_len:
+            self._pos = buffer_len
+            return 0
+
+        count = min(dst.size, buffer_len - start)
+        memcpy(np.PyArray_DATA(dst), buffer + start, count)
+        self._pos = start + count
+        return count
 
     def seek(self, offset, whence=0):
         """Seek to position in MemoryFile."""
@@ -926,39 +2341,169 @@ cdef class MemoryFileBase(object):
         return self._pos
 
     def write(self, data):
-        """Write data bytes to MemoryFile"""
+        """Write data bytes to MemoryFile
+
+        The in-memory file is opened at the first write and stays open
+        until the MemoryFile is closed or its buffer is exported by
+        getbuffer(), so consecutive writes only copy bytes.
+
+        Parameters
+        ----------
+        data : bytes-like object
+            Bytes, bytearray, memoryview or any other contiguous object
+            supporting the buffer protocol.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+        """
         cdef VSILFILE *fp = NULL
-        cdef const unsigned char *view = <bytes>data
-        n = len(data)
+        cdef const unsigned char *view = NULL
+        cdef np.ndarray arr = None
+        cdef size_t n = 0
+        cdef size_t result = 0
+        cdef vsi_l_offset pos = self._pos
+
+        if isinstance(data, bytes):
+            view = <bytes>data
+            n = len(data)
+        else:
+            arr = np.frombuffer(data, dtype='uint8')
+            view = <const unsigned char *>np.PyArray_DATA(arr)
+            n = arr.size
+
+        fp = self._open_vsi_handle()
+
+        if VSIFTellL(fp) != pos and VSIFSeekL(fp, pos, 0) < 0:
+            raise IOError(
+                "Failed to seek to offset %s in %s." % (self._pos, self.name))
+
+        with nogil:
+            result = VSIFWriteL(<void *>view, 1, n, fp)
+
+        self._pos += result
+        return result
+
+    cdef VSILFILE *_open_vsi_handle(self) except NULL:
+        """Return the persistent handle on the file, opening it if needed"""
+        cdef VSILFILE *fp = self._vsi_handle
+
+        if fp != NULL:
+            return fp
+
+        self._reclaim_buffer()
 
         if not self.exists():
             fp = exc_wrap_vsilfile(VSIFOpenL(self._path, 'w'))
+            if self._capacity:
+                # A vsimem file keeps its allocation when it is
+                # truncated, so growing it once and truncating it back
+                # to nothing reserves capacity for the writes to come.
+                if (VSIFTruncateL(fp, self._capacity) != 0 or
+                        VSIFTruncateL(fp, 0) != 0):
+                    VSIFCloseL(fp)
+                    raise MemoryError(
+                        "Failed to allocate %s bytes for %s." % (
+                            self._capacity, self.name))
         else:
             fp = exc_wrap_vsilfile(VSIFOpenL(self._path, 'r+'))
-            if VSIFSeekL(fp, self._pos, 0) < 0:
-                raise IOError(
-                    "Failed to seek to offset %s in %s.", self._pos, self.name)
 
-        result = VSIFWriteL(view, 1, n, fp)
-        VSIFFlushL(fp)
-        VSIFCloseL(fp)
+        self._vsi_handle = fp
+        return fp
 
-        self._pos += result
-        return result
+    def _close_vsi_handle(self):
+        """Close the persistent handle on the file, if open"""
+        if self._vsi_handle != NULL:
+            VSIFCloseL(self._vsi_handle)
+            self._vsi_handle = NULL
 
     def getbuffer(self):
-        """Return a view on bytes of the file."""
+        """Return a view on bytes of the file.
+
+        The view shares memory with the in-memory file: no bytes are
+        copied. It remains valid after the file is closed or unlinked
+        and the memory is released only when the last view is. While
+        any view is alive, writes to the file raise BufferError.
+
+        Returns
+        -------
+        memoryview
+        """
         cdef unsigned char *buffer = NULL
         cdef vsi_l_offset buffer_len = 0
-        cdef np.uint8_t [:] buff_view
+        cdef VSILFILE *vsi_handle = NULL
+        cdef _MemoryFileBuffer buff = self._buffer
+
+        if buff is None:
+            # The file's memory is about to change hands and an open
+            # handle would keep referring to the unlinked file.
+            self._close_vsi_handle()
+            buffer = VSIGetMemFileBuffer(self._path, &buffer_len, 0)
+            if buffer == NULL or buffer_len == 0:
+                return memoryview(b'')
+
+            # Seize the file's memory and register it again without
+            # ownership so that unlinking the file can't free memory
+            # that a view still refers to.
+            buffer = VSIGetMemFileBuffer(self._path, &buffer_len, 1)
+            buff = _MemoryFileBuffer()
+            buff.data = buffer
+            buff.size = buffer_len
+            buff.owned = True
+            buff.readonly = False
 
-        buffer = VSIGetMemFileBuffer(self._path, &buffer_len, 0)
+            vsi_handle = VSIFileFromMemBuffer(
+                self._path, buff.data, buff.size, 0)
+            if vsi_handle == NULL:
+                raise IOError("Failed to register in-memory file buffer.")
+            VSIFCloseL(vsi_handle)
+            self._buffer = buff
 
-        if buffer == NULL or buffer_len == 0:
-            buff_view = np.array([], dtype='uint8')
+        return memoryview(buff)
+
+    def _reclaim_buffer(self):
+        """Give the file's memory back to the /vsimem filesystem.
+
+        Memory borrowed from a caller's buffer is copied so that the
+        file can grow and so that writes never reach the caller's
+        object.
+
+        Raises
+        ------
+        BufferError
+            If views returned by getbuffer() are still alive.
+        """
+        cdef VSILFILE *vsi_handle = NULL
+        cdef unsigned char *buffer = NULL
+        cdef _MemoryFileBuffer buff = self._buffer
+
+        if buff is None:
+            return
+
+        if buff.exports > 0:
+            raise BufferError(
+                "Existing exports of data: object cannot be re-sized")
+
+        if buff.owned:
+            buffer = buff.data
         else:
-            buff_view = <np.uint8_t[:buffer_len]>buffer
-        return buff_view
+            buffer = <unsigned char *>CPLMalloc(buff.size)
+            memcpy(buffer, buff.data, buff.size)
+
+        VSIUnlink(self._path)
+        vsi_handle = VSIFileFromMemBuffer(self._path, buffer, buff.size, 1)
+        if vsi_handle == NULL:
+            if not buff.owned:
+                CPLFree(buffer)
+            raise IOError("Failed to register in-memory file buffer.")
+        VSIFCloseL(vsi_handle)
+
+        buff.owned = False
+        buff.data = NULL
+        buff.size = 0
+        buff.source = None
+        self._buffer = None
 
 
 cdef class DatasetWriterBase(DatasetReaderBase):
@@ -1295,25 +2840,46 @@ cdef class DatasetWriterBase(DatasetReaderBase):
                 raise ValueError("Invalid nodata value: %r", val)
         self._nodatavals = vals
 
-    def write(self, src, indexes=None, window=None):
+    def write(self, src, indexes=None, window=None, progress=None,
+              layout='band'):
         """Write the src array into indexed bands of the dataset.
 
         If `indexes` is a list, the src must be a 3D array of
         matching shape. If an int, the src must be a 2D array.
 
-        See `read()` for usage of the optional `window` argument.
+        A 3D array's shape is (bands, rows, columns) if `layout` is
+        'band' (the default) or (rows, columns, bands) if it is
+        'pixel', as returned by `read(layout='pixel')`. Both are
+        written without copies.
+
+        If the data type of the array differs from that of the bands,
+        pixels are converted by GDAL while they are copied. Values
+        converted to integers are rounded and clipped to the range of
+        the band's type.
+
+        See `read()` for usage of the optional `window` and `progress`
+        arguments.
         """
         cdef int height, width, xoff, yoff, indexes_count
         cdef int retval = 0
+        cdef _ProgressHook hook = _ProgressHook(progress)
 
         if self._hds == NULL:
             raise ValueError("can't write to closed raster file")
 
+        if self._block_cache is not None:
+            self._block_cache.invalidate(self)
+
+        _check_layout(layout)
+        src = np.asarray(src)
+        if layout == 'pixel' and src.ndim == 3:
+            src = np.transpose(src, [2, 0, 1])
+
         if indexes is None:
             indexes = self.indexes
         elif isinstance(indexes, int):
             indexes = [indexes]
-            src = np.array([src])
+            src = src[np.newaxis]
         if len(src.shape) != 3 or src.shape[0] != len(indexes):
             raise ValueError(
                 "Source shape {} is inconsistent with given indexes {}"
@@ -1333,13 +2899,22 @@ cdef class DatasetWriterBase(DatasetReaderBase):
         else:  # unique dtype; normal case
             dtype = check_dtypes.pop()
 
-        if src is not None and src.dtype != dtype:
-            raise ValueError(
-                "the array's dtype '%s' does not match "
-                "the file's dtype '%s'" % (src.dtype, dtype))
-
-        # Require C-continguous arrays (see #108).
-        src = np.require(src, dtype=dtype, requirements='C')
+        # The strides of views, such as the band-last arrays of
+        # reshape_as_raster() or slices of larger arrays, are passed to
+        # GDAL. Arrays are copied only if GDAL can't read them as is.
+        io_dtype = _io_dtype(src.dtype)
+        if src.dtype != io_dtype:
+            reason = 'dtype'
+        elif not _gdal_strides(src):
+            reason = 'strides'
+        else:
+            reason = None
+        if reason:
+            _write_copies[reason] += 1
+            log.debug(
+                "Copying %s array with strides %r before writing (%s)",
+                src.dtype, src.strides, reason)
+            src = np.require(src, dtype=io_dtype, requirements='C')
 
         # Prepare the IO window.
         if window:
@@ -1358,9 +2933,12 @@ cdef class DatasetWriterBase(DatasetReaderBase):
         indexes_count = <int>indexes_arr.shape[0]
 
         try:
-            io_multi_band(self._hds, 1, xoff, yoff, width, height, src, indexes_arr)
+            io_multi_band(self._hds, 1, xoff, yoff, width, height, src, indexes_arr,
+                          0, hook.func, hook.data)
         except CPLE_BaseError as cplerr:
+            hook.check()
             raise RasterioIOError("Read or write failed. {}".format(cplerr))
+        hook.check()
 
     def write_band(self, bidx, src, window=None):
         """Write the src array into the `bidx` band.
@@ -1554,34 +3132,43 @@ cdef class DatasetWriterBase(DatasetReaderBase):
         except CPLE_BaseError as cplerr:
             raise RasterioIOError("Read or write failed. {}".format(cplerr))
 
-    def build_overviews(self, factors, resampling=Resampling.nearest):
+    def build_overviews(self, factors, resampling=Resampling.nearest,
+                        cascade=False, num_threads=1, progress=None):
         """Build overviews at one or more decimation factors for all
-        bands of the dataset."""
+        bands of the dataset.
+
+        Parameters
+        ----------
+        factors : list of int
+            Decimation factors of the overviews.
+        resampling : Resampling, optional
+            Resampling algorithm. Nearest (the default), bilinear,
+            cubic, cubic_spline, lanczos, average, mode, and gauss are
+            supported.
+        cascade : bool, optional
+            If True, the overview levels are created empty and then
+            computed by `update_overviews()`, each from the previous
+            level instead of from the full resolution bands.
+        num_threads : int, optional
+            Number of threads used to compute the overviews. Values
+            greater than 1 imply `cascade` and have the requirements
+            described in `update_overviews()`.
+        progress : callable or CancellationToken, optional
+            A function called with the completed fraction of the
+            build, which cancels it by raising an exception, or a
+            CancellationToken.
+
+        Returns
+        -------
+        None
+        """
         cdef int *factors_c = NULL
         cdef const char *resampling_c = NULL
+        cdef _ProgressHook hook = _ProgressHook(progress)
 
-        try:
-            # GDALBuildOverviews() takes a string algo name, not a
-            # Resampling enum member (like warping) and accepts only
-            # a subset of the warp algorithms. 'NONE' is omitted below
-            # (what does that even mean?) and so is 'AVERAGE_MAGPHASE'
-            # (no corresponding member in the warp enum).
-            resampling_map = {
-                0: 'NEAREST',
-                1: 'BILINEAR',
-                2: 'CUBIC',
-                3: 'CUBICSPLINE',
-                4: 'LANCZOS',
-                5: 'AVERAGE',
-                6: 'MODE',
-                7: 'GAUSS'}
-            resampling_alg = resampling_map[Resampling(resampling.value)]
-
-        except (KeyError, ValueError):
-            raise ValueError(
-                "resampling must be one of: {0}".format(", ".join(
-                    ['Resampling.{0}'.format(Resampling(k).name) for k in
-                     resampling_map.keys()])))
+        resampling_alg = _overview_resampling_alg(resampling)
+        cascade = cascade or num_threads > 1
+        self._check_reopenable(num_threads)
 
         # Check factors
         ovr_shapes = Counter([(int((self.height + f - 1) / f), int((self.width + f - 1) / f)) for f in factors])
@@ -1596,17 +3183,186 @@ cdef class DatasetWriterBase(DatasetReaderBase):
                 factors_c[i] = factor
 
             try:
-                resampling_b = resampling_alg.encode('utf-8')
+                # Overview levels created with 'NONE' are allocated
+                # but not computed. Their allocation may be cancelled
+                # but isn't reported as progress, which
+                # update_overviews() reports from the start.
+                resampling_b = ('NONE' if cascade else resampling_alg).encode('utf-8')
                 resampling_c = resampling_b
+                if cascade and hook.callback is not None:
+                    hook = _ProgressHook(lambda complete: progress(0.0))
                 GDALFlushCache(self._hds)
-                exc_wrap_int(
-                    GDALBuildOverviews(self._hds, resampling_c,
-                                       len(factors), factors_c, 0, NULL, NULL,
-                                       NULL))
+                retval = GDALBuildOverviews(
+                    self._hds, resampling_c, len(factors), factors_c, 0,
+                    NULL, hook.func, hook.data)
+                hook.check()
+                exc_wrap_int(retval)
             finally:
                 if factors_c != NULL:
                     CPLFree(factors_c)
 
+            if cascade:
+                self.update_overviews(
+                    resampling=resampling, num_threads=num_threads,
+                    progress=progress)
+
+    def update_overviews(self, window=None, resampling=Resampling.nearest,
+                         num_threads=1, progress=None):
+        """Recompute existing overviews level by level
+
+        Each overview level is computed from the previous, finer level
+        instead of from the full resolution bands, and only the blocks
+        of each level that cover `window` are recomputed. This brings
+        overviews up to date after a partial `write()` without
+        recomputing them entirely.
+
+        Parameters
+        ----------
+        window : Window or tuple, optional
+            A window of the full resolution bands that has changed.
+            Defaults to the entire extent of the dataset.
+        resampling : Resampling, optional
+            Resampling algorithm. The algorithms supported by
+            `build_overviews()` are supported.
+        num_threads : int, optional
+            Number of threads that read and decimate blocks of the
+            previous level while this dataset writes the results.
+            Values greater than 1 require a dataset that can be opened
+            a second time for reading, by its file name, driver, and
+            opening options: a file and not a MEM dataset. Before each
+            level is computed, this dataset's cache is flushed and the
+            worker threads open new handles, so the file's driver must
+            write overview blocks on flush and read them back from a
+            new handle, as GTiff does.
+        progress : callable or CancellationToken, optional
+            As for build_overviews(). Progress is reported and
+            cancellation is checked after each block is written.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If num_threads is greater than 1 and the dataset can't be
+            reopened.
+        """
+        cdef GDALRasterBandH band = NULL
+        cdef GDALRasterBandH ovrband = NULL
+        cdef int xsize, ysize
+        cdef _ProgressHook hook = _ProgressHook(progress)
+
+        _overview_resampling_alg(resampling)
+
+        if window:
+            if isinstance(window, tuple):
+                window = Window.from_slices(
+                    *window, height=self.height, width=self.width)
+            window = window.crop(self.height, self.width)
+        else:
+            window = Window(0, 0, self.width, self.height)
+
+        band = self.band(1)
+        count = min(GDALGetOverviewCount(self.band(bidx)) for bidx in self.indexes)
+
+        # Levels are computed from the largest to the smallest, whatever
+        # order the overview factors were given in.
+        levels = sorted(
+            range(count), key=lambda k: self._overview_shape(1, k),
+            reverse=True)
+
+        # The source of a worker thread's reads must be on disk.
+        GDALFlushCache(self._hds)
+
+        src_level = None
+        src_height, src_width = self.shape
+        dirty = window
+
+        for k, level in enumerate(levels):
+            dst_height, dst_width = self._overview_shape(1, level)
+            yscale = float(dst_height) / src_height
+            xscale = float(dst_width) / src_width
+
+            # The dirty region at this level, expanded by a pixel for
+            # the benefit of interpolating kernels.
+            row_start = max(0, int(math.floor(dirty.row_off * yscale)) - 1)
+            row_stop = min(dst_height, int(math.ceil((dirty.row_off + dirty.height) * yscale)) + 1)
+            col_start = max(0, int(math.floor(dirty.col_off * xscale)) - 1)
+            col_stop = min(dst_width, int(math.ceil((dirty.col_off + dirty.width) * xscale)) + 1)
+            dirty = Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+
+            ovrband = GDALGetOverview(band, level)
+            GDALGetBlockSize(ovrband, &xsize, &ysize)
+            blocks = []
+            for row in range(row_start - row_start % ysize, row_stop, ysize):
+                for col in range(col_start - col_start % xsize, col_stop, xsize):
+                    block = intersection(
+                        dirty, Window(col, row, xsize, ysize))
+                    blocks.append(block)
+
+            log.debug(
+                "Updating %d blocks of overview level %d from level %r",
+                len(blocks), level, src_level)
+
+            decimated = self._decimate_overview_blocks(
+                blocks, src_level, (dst_height, dst_width), resampling,
+                num_threads)
+            try:
+                for n, (block, arrays) in enumerate(decimated, 1):
+                    for bidx, arr in zip(self.indexes, arrays):
+                        ovrband = GDALGetOverview(self.band(bidx), level)
+                        try:
+                            io_band(ovrband, 1, block.col_off, block.row_off,
+                                    block.width, block.height, arr)
+                        except CPLE_BaseError as cplerr:
+                            raise RasterioIOError(
+                                "Read or write failed. {}".format(cplerr))
+                    hook.report((k + float(n) / len(blocks)) / len(levels))
+            finally:
+                # Worker threads' datasets are closed if cancelled.
+                decimated.close()
+
+            GDALFlushCache(self._hds)
+            src_level = level
+            src_height, src_width = dst_height, dst_width
+
+    def _decimate_overview_blocks(self, blocks, src_level, dst_shape,
+                                  resampling, num_threads):
+        """Generate blocks of an overview level and their decimated data
+
+        Data is read from the overview at `src_level`, or from the full
+        resolution bands if it is None, in this thread or in a pool of
+        threads that each open their own dataset handle. Full resolution
+        bands are read without decimation, since GDAL would answer from
+        the very overviews being computed.
+        """
+        dst_height, dst_width = dst_shape
+        yfactor = float(self.height) / dst_height
+        xfactor = float(self.width) / dst_width
+
+        def decimate(reader, block):
+            # _read() takes windows in full resolution pixels.
+            src_window = Window(
+                block.col_off * xfactor, block.row_off * yfactor,
+                block.width * xfactor, block.height * yfactor)
+            arrays = []
+            for bidx in self.indexes:
+                dtype = self.dtypes[bidx - 1]
+                out = np.empty((1, block.height, block.width), dtype=dtype)
+                if src_level is None:
+                    _decimate_full_resolution(
+                        reader, bidx, src_window, out, resampling)
+                else:
+                    reader._read(
+                        [bidx], out, src_window, dtype,
+                        resampling=resampling, overview_level=src_level)
+                arrays.append(out[0])
+            return block, arrays
+
+        for result in self._map_windows(decimate, blocks, num_threads):
+            yield result
+
     def _set_gcps(self, gcps, crs=None):
         cdef char *srcwkt = NULL
         cdef GDAL_GCP *gcplist = <GDAL_GCP *>CPLMalloc(len(gcps) * sizeof(GDAL_GCP))
@@ -1638,6 +3394,38 @@ cdef class DatasetWriterBase(DatasetReaderBase):
         self._gcps = None
 
 
+def _decimate_full_resolution(reader, bidx, window, out, resampling):
+    """Read a window of a full resolution band decimated into out
+
+    GDAL answers decimated reads from existing overviews, which are
+    the overviews being computed, so the window is read at full
+    resolution and decimated from a MEM dataset, which has none.
+    """
+    cdef InMemoryRaster mem = None
+
+    row_start = int(math.floor(window.row_off))
+    col_start = int(math.floor(window.col_off))
+    row_stop = min(reader.height, int(math.ceil(window.row_off + window.height)))
+    col_stop = min(reader.width, int(math.ceil(window.col_off + window.width)))
+    dtype = reader.dtypes[bidx - 1]
+    full = np.empty(
+        (1, row_stop - row_start, col_stop - col_start), dtype=dtype)
+    reader._read(
+        [bidx], full,
+        Window(col_start, row_start, col_stop - col_start, row_stop - row_start),
+        dtype)
+
+    mem = InMemoryRaster(image=full[0])
+    try:
+        io_band(mem.band(1), 0, window.col_off - col_start,
+                window.row_off - row_start, window.width, window.height,
+                out[0], resampling=resampling)
+    except CPLE_BaseError as cplerr:
+        raise RasterioIOError("Read or write failed. {}".format(cplerr))
+    finally:
+        mem.close()
+
+
 cdef class InMemoryRaster:
     """
     Class that manages a single-band in memory GDAL raster dataset.  Data type
@@ -1824,7 +3612,9 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
 
     def __init__(self, path, mode='r', driver=None, width=None, height=None,
                  count=None, crs=None, transform=None, dtype=None, nodata=None,
-                 gcps=None, **kwargs):
+                 gcps=None, buffer_driver='MEM',
+                 buffer_memory_limit=64 * 1024 * 1024, progress=None,
+                 **kwargs):
         """Construct a new dataset
 
         Parameters
@@ -1867,6 +3657,20 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
         sharing : bool
             A flag that allows sharing of dataset handles. Default is
             `True`. Should be set to `False` in a multithreaded:w program.
+        buffer_driver : str, optional
+            'MEM' (the default) to buffer the dataset in memory or
+            'GTiff' to buffer it in a temporary tiled GeoTIFF, which
+            keeps memory use bounded by GDAL's block cache.
+        buffer_memory_limit : int, optional
+            A GTiff buffer no larger than this many bytes, uncompressed,
+            is kept in /vsimem. Larger buffers are written to a file in
+            the temporary directory of the tempfile module.
+        progress : callable or CancellationToken, optional
+            A function called with the completed fraction, from 0 to 1,
+            of the copy of the buffer to the dataset's format when it is
+            closed. An exception raised by the function cancels the copy
+            and is raised by close(). A CancellationToken records the
+            progress instead and cancels the copy if it is cancelled.
         kwargs : optional
             These are passed to format drivers as directives for creating or
             interpreting datasets. For example: in 'w' or 'w+' modes
@@ -1890,6 +3694,7 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
         cdef const char *drv_name = NULL
         cdef GDALDriverH memdrv = NULL
         cdef GDALDatasetH temp = NULL
+        cdef char **buffer_options = NULL
 
         # Validate write mode arguments.
 
@@ -1933,6 +3738,11 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
         self._units = ()
         self._descriptions = ()
         self._options = kwargs.copy()
+        self._buffer_path = None
+        self._progress = progress
+
+        if buffer_driver not in ('MEM', 'GTiff'):
+            raise ValueError("buffer_driver must be 'MEM' or 'GTiff'")
 
         # Make and store a GDAL dataset handle.
 
@@ -1941,7 +3751,14 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
         path = vsi_path(path)
         name_b = path.encode('utf-8')
 
-        memdrv = GDALGetDriverByName("MEM")
+        if buffer_driver == 'GTiff':
+            memdrv = GDALGetDriverByName("GTiff")
+            for key, val in (('TILED', 'YES'), ('BLOCKXSIZE', '256'),
+                             ('BLOCKYSIZE', '256'), ('BIGTIFF', 'IF_SAFER')):
+                buffer_options = CSLSetNameValue(
+                    buffer_options, key.encode('utf-8'), val.encode('utf-8'))
+        else:
+            memdrv = GDALGetDriverByName("MEM")
 
         if self.mode in ('w', 'w+'):
             # Find the equivalent GDAL data type or raise an exception
@@ -1957,9 +3774,19 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
             else:
                 gdal_dtype = dtypes.dtype_rev.get(self._init_dtype)
 
-            self._hds = exc_wrap_pointer(
-                GDALCreate(memdrv, "temp", self.width, self.height,
-                           self._count, gdal_dtype, NULL))
+            if buffer_driver == 'GTiff':
+                self._buffer_path = _buffer_gtiff_path(
+                    self.width * self.height * self._count *
+                    np.dtype(self._init_dtype).itemsize,
+                    buffer_memory_limit)
+
+            try:
+                self._hds = exc_wrap_pointer(
+                    GDALCreate(memdrv, (self._buffer_path or "temp").encode('utf-8'),
+                               self.width, self.height, self._count,
+                               gdal_dtype, <const char **>buffer_options))
+            finally:
+                CSLDestroy(buffer_options)
 
             if self._init_nodata is not None:
                 for i in range(self._count):
@@ -1978,10 +3805,24 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
             try:
                 temp = exc_wrap_pointer(GDALOpenShared(fname, <GDALAccess>0))
             except Exception as exc:
+                CSLDestroy(buffer_options)
                 raise RasterioIOError(str(exc))
 
-            self._hds = exc_wrap_pointer(
-                GDALCreateCopy(memdrv, "temp", temp, 1, NULL, NULL, NULL))
+            if buffer_driver == 'GTiff':
+                self._buffer_path = _buffer_gtiff_path(
+                    GDALGetRasterXSize(temp) * GDALGetRasterYSize(temp) *
+                    GDALGetRasterCount(temp) *
+                    GDALGetDataTypeSize(<GDALDataType>GDALGetRasterDataType(
+                        GDALGetRasterBand(temp, 1))) // 8,
+                    buffer_memory_limit)
+
+            try:
+                self._hds = exc_wrap_pointer(
+                    GDALCreateCopy(
+                        memdrv, (self._buffer_path or "temp").encode('utf-8'),
+                        temp, 1, buffer_options, NULL, NULL))
+            finally:
+                CSLDestroy(buffer_options)
 
             drv = GDALGetDatasetDriver(temp)
             self.driver = get_driver_name(drv).decode('utf-8')
@@ -2041,10 +3882,14 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
                 "Option: %r\n",
                 (k, CSLFetchNameValue(options, key_c)))
 
+        hook = _ProgressHook(self._progress)
+
         try:
-            temp = exc_wrap_pointer(
-                GDALCreateCopy(drv, fname, self._hds, 1, options, NULL, NULL))
-            log.debug("Created copy from MEM file: %s", self.name)
+            temp = GDALCreateCopy(
+                drv, fname, self._hds, 1, options, hook.func, hook.data)
+            hook.check()
+            temp = exc_wrap_pointer(temp)
+            log.debug("Created copy from buffer: %s", self.name)
         finally:
             if options != NULL:
                 CSLDestroy(options)
@@ -2053,6 +3898,145 @@ cdef class BufferedDatasetWriterBase(DatasetWriterBase):
             if self._hds != NULL:
                 GDALClose(self._hds)
                 self._hds = NULL
+            if self._buffer_path is not None:
+                _delete_dataset_if_exists(self._buffer_path)
+                self._buffer_path = None
+
+
+cdef class CancellationToken(object):
+    """A token for the progress and cancellation of GDAL operations
+
+    A token may be passed as the `progress` argument of reads, writes,
+    overview builds, reprojections, and copies. GDAL records the
+    completed fraction of the operation in the token and stops the
+    operation if the token has been cancelled, without acquiring
+    Python's GIL. The token may be cancelled from any thread and the
+    cancelled operation raises OperationCancelledError.
+
+    Attributes
+    ----------
+    cancelled : bool
+        True if cancel() has been called.
+    complete : float
+        The completed fraction, from 0 to 1, last reported by an
+        operation.
+    """
+
+    def __cinit__(self):
+        self.state.cancelled = 0
+        self.state.complete = 0.0
+
+    def __repr__(self):
+        return "<CancellationToken cancelled={} complete={:.3f}>".format(
+            self.cancelled, self.complete)
+
+    def cancel(self):
+        """Stop the operations using this token"""
+        self.state.cancelled = 1
+
+    property cancelled:
+        def __get__(self):
+            return bool(self.state.cancelled)
+
+    property complete:
+        def __get__(self):
+            return self.state.complete
+
+
+cdef int _token_progress(
+        double complete, const char *message, void *data) nogil:
+    """A GDALProgressFunc that polls a CancellationToken's state."""
+    cdef _CancellationState *state = <_CancellationState *>data
+    state.complete = complete
+    return not state.cancelled
+
+
+cdef int _progress_callback(
+        double complete, const char *message, void *data) with gil:
+    """A GDALProgressFunc that calls a Python function.
+
+    The data pointer is a _ProgressHook holding the function and,
+    after it raises, its exception. GDAL is told to stop when the
+    function raises.
+    """
+    hook = <_ProgressHook>data
+    try:
+        hook.callback(complete)
+        return 1
+    except BaseException as exc:
+        hook.exc = exc
+        return 0
+
+
+cdef class _ProgressHook(object):
+    """The GDALProgressFunc and data for a `progress` argument
+
+    The argument may be None, a CancellationToken, or a function that
+    is called with the completed fraction of an operation and cancels
+    it by raising an exception. The hook must outlive the operation.
+    """
+
+    def __init__(self, progress=None):
+        self.func = NULL
+        self.data = NULL
+        self.callback = None
+        self.token = None
+        self.exc = None
+
+        if progress is None:
+            pass
+        elif isinstance(progress, CancellationToken):
+            self.token = progress
+            self.func = <void *>_token_progress
+            self.data = <void *>&self.token.state
+        elif callable(progress):
+            self.callback = progress
+            self.func = <void *>_progress_callback
+            self.data = <void *>self
+        else:
+            raise TypeError(
+                "progress must be a callable or a CancellationToken")
+
+    def report(self, complete):
+        """Report progress of an operation that isn't done by GDAL
+
+        Raises
+        ------
+        Exception
+            Whatever the callback raises, or OperationCancelledError
+            if the token has been cancelled.
+        """
+        if self.token is not None:
+            self.token.state.complete = complete
+        elif self.callback is not None:
+            self.callback(complete)
+        self.check()
+
+    def check(self):
+        """Raise the exception that stopped an operation, if any
+
+        Raises
+        ------
+        Exception
+            The exception raised by the callback, or
+            OperationCancelledError if the token has been cancelled.
+        """
+        if self.exc is not None:
+            exc, self.exc = self.exc, None
+            raise exc
+        if self.token is not None and self.token.state.cancelled:
+            raise OperationCancelledError("The operation was cancelled")
+
+
+def _buffer_gtiff_path(nbytes, memory_limit):
+    """Path of a temporary GeoTIFF buffer of a given size.
+
+    Buffers no larger than the memory limit go in /vsimem.
+    """
+    name = 'buffer-{}.tif'.format(uuid.uuid4())
+    if nbytes <= memory_limit:
+        return '/vsimem/' + name
+    return os.path.join(tempfile.gettempdir(), name)
 
 
 def virtual_file_to_buffer(filename):
@@ -57,7 +57,8 @@ cdef int delete_nodata_value(GDALRasterBandH hBand) except 3:
 
 cdef int io_band(
         GDALRasterBandH band, int mode, float x0, float y0,
-        float width, float height, object data, int resampling=0) except -1:
+        float width, float height, object data, int resampling=0,
+        void *progress_func=NULL, void *progress_data=NULL) except -1:
     """Read or write a region of data for the band.
 
     Implicit are
@@ -66,7 +67,8 @@ cdef int io_band(
     2) decimation if `data` and `band` shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. GDAL 1.x does not report the progress
+    of RasterIO, so the progress function is ignored.
     """
     # GDAL handles all the buffering indexing, so a typed memoryview,
     # as in previous versions, isn't needed.
@@ -93,7 +95,8 @@ cdef int io_band(
 
 cdef int io_multi_band(
         GDALDatasetH hds, int mode, float x0, float y0, float width,
-        float height, object data, Py_ssize_t[:] indexes, int resampling=0) except -1:
+        float height, object data, Py_ssize_t[:] indexes, int resampling=0,
+        void *progress_func=NULL, void *progress_data=NULL) except -1:
     """Read or write a region of data for multiple bands.
 
     Implicit are
@@ -102,7 +105,8 @@ cdef int io_multi_band(
     2) decimation if `data` and band shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. GDAL 1.x does not report the progress
+    of RasterIO, so the progress function is ignored.
     """
     cdef int i = 0
     cdef int retval = 3
@@ -140,7 +144,8 @@ cdef int io_multi_band(
 
 cdef int io_multi_mask(
         GDALDatasetH hds, int mode, float x0, float y0, float width,
-        float height, object data, Py_ssize_t[:] indexes, int resampling=0) except -1:
+        float height, object data, Py_ssize_t[:] indexes, int resampling=0,
+        void *progress_func=NULL, void *progress_data=NULL) except -1:
     """Read or write a region of data for multiple band masks.
 
     Implicit are
@@ -149,10 +154,15 @@ cdef int io_multi_mask(
     2) decimation if `data` and band shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. GDAL 1.x does not report the progress
+    of RasterIO, so the progress function is ignored.
+
+    When reading, a mask shared by bands, such as a per-dataset mask,
+    is read once and copied to the rows of `data` of the other bands.
     """
     cdef int i = 0
     cdef int j = 0
+    cdef Py_ssize_t key = 0
     cdef int retval = 3
     cdef GDALRasterBandH band = NULL
     cdef GDALRasterBandH hmask = NULL
@@ -163,6 +173,7 @@ cdef int io_multi_mask(
     cdef int bufpixelspace = data.strides[2]
     cdef int buflinespace = data.strides[1]
     cdef int count = len(indexes)
+    cdef dict masks_read = {}
 
     cdef int xoff = <int>x0
     cdef int yoff = <int>y0
@@ -177,6 +188,17 @@ cdef int io_multi_mask(
         hmask = GDALGetMaskBand(band)
         if hmask == NULL:
             raise ValueError("Null mask band")
+        if mode == 0:
+            # All bands share a per-dataset mask, even if GDAL gives
+            # each its own mask band object.
+            if GDALGetMaskFlags(band) & GMF_PER_DATASET:
+                key = 0
+            else:
+                key = <Py_ssize_t>hmask
+            if key in masks_read:
+                data[i] = data[masks_read[key]]
+                continue
+            masks_read[key] = i
         buf = <void *>np.PyArray_DATA(data[i])
         if buf == NULL:
             raise ValueError("NULL data")
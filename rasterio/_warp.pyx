@@ -32,7 +32,8 @@ cimport numpy as np
 from rasterio._base cimport _osr_from_crs, get_driver_name, _safe_osr_release
 from rasterio._err cimport exc_wrap_pointer, exc_wrap_int
 from rasterio._io cimport (
-    DatasetReaderBase, InMemoryRaster, in_dtype_range, io_auto)
+    DatasetReaderBase, InMemoryRaster, in_dtype_range, io_auto,
+    _ProgressHook)
 from rasterio._features cimport GeomBuilder, OGRGeomBuilder
 from rasterio._shim cimport delete_nodata_value, open_dataset
 
@@ -212,6 +213,7 @@ def _reproject(
         init_dest_nodata=True,
         num_threads=1,
         warp_mem_limit=0,
+        progress=None,
         **kwargs):
     """
     Reproject a source raster to a destination raster.
@@ -283,6 +285,10 @@ def _reproject(
         56 MB. The default (0) means 64 MB with GDAL 2.2.
         The warp operation's memory limit in MB. The default (0)
         means 64 MB with GDAL 2.2.
+    progress : callable or CancellationToken, optional
+        A function called with the completed fraction of the warp,
+        which cancels it by raising an exception, or a
+        CancellationToken.
     kwargs:  dict, optional
         Additional arguments passed to both the image to image
         transformer GDALCreateGenImgProjTransformer2() (for example,
@@ -304,6 +310,7 @@ def _reproject(
     cdef void *hTransformArg = NULL
     cdef GDALTransformerFunc pfnTransformer = NULL
     cdef GDALWarpOptions *psWOptions = NULL
+    cdef _ProgressHook hook = _ProgressHook(progress)
 
     # Validate nodata values immediately.
     if src_nodata is not None:
@@ -469,6 +476,10 @@ def _reproject(
     psWOptions.hSrcDS = src_dataset
     psWOptions.hDstDS = dst_dataset
 
+    if hook.func != NULL:
+        psWOptions.pfnProgress = hook.func
+        psWOptions.pProgressArg = hook.data
+
     for idx, (s, d) in enumerate(zip(src_bidx, dst_bidx)):
         psWOptions.panSrcBands[idx] = s
         psWOptions.panDstBands[idx] = d
@@ -496,6 +507,8 @@ def _reproject(
             with nogil:
                 oWarper.ChunkAndWarpImage(0, 0, cols, rows)
 
+        hook.check()
+
         if dtypes.is_ndarray(destination):
             exc_wrap_int(io_auto(destination, dst_dataset, 0))
 
@@ -928,13 +941,19 @@ cdef class WarpedVRTReaderBase(DatasetReaderBase):
         self._hds = NULL
 
     def read(self, indexes=None, out=None, window=None, masked=False,
-            out_shape=None, boundless=False, resampling=Resampling.nearest,
-            fill_value=None):
-        """Read a dataset's raw pixels as an N-d array"""
+            out_shape=None, boundless=False, **kwargs):
+        """Read a dataset's raw pixels as an N-d array
+
+        Other keyword arguments are passed to DatasetReaderBase.read().
+        """
         if boundless:
             raise ValueError("WarpedVRT does not permit boundless reads")
         else:
-            return super(WarpedVRTReaderBase, self).read(indexes=indexes, out=out, window=window, masked=masked, out_shape=out_shape, resampling=resampling, fill_value=fill_value)
+            return super(WarpedVRTReaderBase, self).read(indexes=indexes, out=out, window=window, masked=masked, out_shape=out_shape, **kwargs)
+
+    def _reopenable(self):
+        """A WarpedVRT has no file from which it can be reopened"""
+        return False
 
     def read_masks(self, indexes=None, out=None, out_shape=None, window=None,
                    boundless=False, resampling=Resampling.nearest):
@@ -0,0 +1,532 @@
+"""A cache of decoded blocks, attached to datasets.
+
+GDAL's block cache is shared by all datasets and sized by GDAL_CACHEMAX,
+so a dataset read from end to end evicts the blocks of every other. A
+BlockCache holds decoded blocks of the datasets it is attached to,
+within its own size limit and by its own eviction policy, and the
+blocks of pinned datasets are never evicted.
+
+    cache = BlockCache(256 * 2**20, policy='lfu')
+    with rasterio.open('reference.tif') as src:
+        src.block_cache = cache
+        cache.pin(src)
+        data = src.read(1, window=Window(0, 0, 512, 512))
+
+Reads of windows aligned to a dataset's blocks are served from the
+cache. Blocks are keyed by dataset name, so datasets opened from the
+same path share them, and are invalidated when a dataset with the
+cache attached is written. Nothing else invalidates them: after a
+file is changed through a dataset object without the cache attached,
+or by another program, call the cache's invalidate() method.
+
+A SharedBlockCache has the same interface but keeps blocks in a
+memory-mapped file, such as one in /dev/shm, so that processes which
+attach it, such as the workers of a tile server, decode a block once
+between them. Processes coordinate by locking the file; there is no
+server process.
+"""
+
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+import numpy as np
+
+from rasterio.compat import string_types
+from rasterio.path import ParsedPath, parse_path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+BlockCacheStats = namedtuple(
+    'BlockCacheStats', ['hits', 'misses', 'evictions', 'blocks', 'nbytes'])
+BlockCacheStats.__doc__ = """Metrics of a block cache
+
+Hits and misses are counted by block and band. The number of blocks
+and their bytes are those currently cached.
+"""
+
+
+def _dataset_key(dataset):
+    """The key of a dataset or of a dataset name"""
+    if isinstance(dataset, string_types):
+        return dataset
+    return dataset.name
+
+
+def _file_identity(dataset):
+    """Size and modification time of a dataset's local file or None
+
+    They are part of the keys of blocks, so that the blocks of a file
+    replaced at the same path are not served.
+    """
+    try:
+        parsed = parse_path(_dataset_key(dataset))
+    except Exception:
+        return None
+    if not isinstance(parsed, ParsedPath) or not parsed.is_local:
+        return None
+    if parsed.archive:
+        return None
+    try:
+        stat = os.stat(parsed.path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+class BlockCache(object):
+    """A size-limited cache of decoded blocks of datasets
+
+    Attributes
+    ----------
+    max_bytes : int
+        The size limit of the cache's arrays.
+    policy : str
+        'lru' to evict the least recently used blocks first or 'lfu' to
+        evict the least frequently used blocks first, the least
+        recently used of them first.
+    """
+
+    def __init__(self, max_bytes, policy='lru'):
+        """Create an empty cache
+
+        Raises
+        ------
+        ValueError
+            If max_bytes is negative or the policy is unknown.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        if policy not in ('lru', 'lfu'):
+            raise ValueError("policy must be 'lru' or 'lfu'")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._blocks = OrderedDict()
+        self._uses = {}
+        self._pinned = set()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return "<BlockCache policy='{}' max_bytes={} nbytes={}>".format(
+            self.policy, self.max_bytes, self._nbytes)
+
+    def __len__(self):
+        return len(self._blocks)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def get(self, dataset, bidx, i, j):
+        """Get a block of a band or None
+
+        Parameters
+        ----------
+        dataset : dataset object or str
+            A dataset or its name.
+        bidx : int
+            The band index.
+        i, j : int
+            The row and column of the block.
+
+        Returns
+        -------
+        numpy ndarray or None
+            A read-only array.
+        """
+        key = (_dataset_key(dataset), bidx, i, j, _file_identity(dataset))
+        with self._lock:
+            arr = self._blocks.get(key)
+            if arr is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._uses[key] += 1
+            # Keys are kept in the order of their last use.
+            del self._blocks[key]
+            self._blocks[key] = arr
+            return arr
+
+    def put(self, dataset, bidx, i, j, arr):
+        """Store a block of a band
+
+        The array is made read-only and should not be modified. Blocks
+        of datasets that are not pinned are evicted until the cache
+        fits its size limit.
+        """
+        key = (_dataset_key(dataset), bidx, i, j, _file_identity(dataset))
+        arr.flags.writeable = False
+        with self._lock:
+            self._remove(key)
+            self._blocks[key] = arr
+            self._uses[key] = 1
+            self._nbytes += arr.nbytes
+            self._evict()
+
+    def pin(self, dataset):
+        """Never evict the blocks of a dataset"""
+        with self._lock:
+            self._pinned.add(_dataset_key(dataset))
+
+    def unpin(self, dataset):
+        """Let the blocks of a pinned dataset be evicted again"""
+        with self._lock:
+            self._pinned.discard(_dataset_key(dataset))
+            self._evict()
+
+    def invalidate(self, dataset=None):
+        """Remove the blocks of a dataset or, by default, of all datasets"""
+        with self._lock:
+            if dataset is None:
+                keys = list(self._blocks)
+            else:
+                name = _dataset_key(dataset)
+                keys = [key for key in self._blocks if key[0] == name]
+            for key in keys:
+                self._remove(key)
+
+    def stats(self):
+        """Get the cache's metrics
+
+        Returns
+        -------
+        BlockCacheStats
+        """
+        with self._lock:
+            return BlockCacheStats(
+                self._hits, self._misses, self._evictions,
+                len(self._blocks), self._nbytes)
+
+    def reset_stats(self):
+        """Set the counts of hits, misses, and evictions to zero"""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def _remove(self, key):
+        arr = self._blocks.pop(key, None)
+        if arr is not None:
+            del self._uses[key]
+            self._nbytes -= arr.nbytes
+
+    def _evict(self):
+        while self._nbytes > self.max_bytes:
+            candidates = (
+                key for key in self._blocks if key[0] not in self._pinned)
+            if self.policy == 'lfu':
+                candidates = list(candidates)
+                if not candidates:
+                    break
+                # min() keeps the first, least recently used, of equals.
+                key = min(candidates, key=self._uses.__getitem__)
+            else:
+                key = next(candidates, None)
+                if key is None:
+                    break
+            self._remove(key)
+            self._evictions += 1
+
+
+_MAGIC = b'RIOBLK01'
+
+_HEADER = np.dtype([
+    ('magic', 'S8'), ('slot_count', '<u8'), ('slot_size', '<u8'),
+    ('clock', '<u8'), ('hits', '<u8'), ('misses', '<u8'),
+    ('evictions', '<u8')])
+
+# A slot is free if its 'used' clock value is 0.
+_SLOT = np.dtype([
+    ('key', '<u8', (2,)), ('dataset', '<u8', (2,)), ('used', '<u8'),
+    ('nbytes', '<u8'), ('dtype', 'S12'), ('shape', '<u4', (2,))])
+
+
+def _digest(*parts):
+    """A key of 16 bytes as a pair of integers
+
+    Parts must be serializable as JSON, so numpy integers must be
+    converted first.
+    """
+    text = json.dumps(parts).encode('utf-8')
+    return np.frombuffer(hashlib.sha1(text).digest()[:16], dtype='<u8')
+
+
+def _aligned(offset, alignment=64):
+    return -(-offset // alignment) * alignment
+
+
+class SharedBlockCache(object):
+    """A block cache in a memory-mapped file shared by processes
+
+    The file is divided into slots of equal size, each holding one
+    block of a band, and a table indexing the slots by the digest of
+    the dataset name, overview level, band index, and block row and
+    column and, for local files, the file's size and modification
+    time. When all slots are used, the least recently used one is
+    reused. The file is locked while the table is read or changed and
+    while blocks are copied, so reads and writes of processes that
+    share it are consistent. Counts of hits, misses, and evictions are
+    shared too. A cache may be opened before worker processes are
+    forked: each process locks the file through its own descriptor.
+
+    Attributes
+    ----------
+    path : str
+        The path of the cache's file.
+    slot_count : int
+        The number of blocks the cache can hold.
+    slot_size : int
+        The largest number of bytes of a block. Larger blocks are not
+        cached.
+    """
+
+    def __init__(self, path, max_bytes=256 * 2**20, slot_size=2**20):
+        """Create a cache or attach to an existing one
+
+        If the file exists, its slot count and size are used and
+        `max_bytes` and `slot_size` are ignored.
+
+        Parameters
+        ----------
+        path : str
+            The path of the cache's file, preferably on a memory
+            filesystem such as /dev/shm.
+        max_bytes : int, optional
+            The size of the blocks of a new cache.
+        slot_size : int, optional
+            The largest number of bytes of a block in a new cache.
+
+        Raises
+        ------
+        ValueError
+            If the cache can't hold a block or the file isn't a
+            shared block cache.
+        OSError
+            If file locks aren't supported by the platform.
+        """
+        if fcntl is None:  # pragma: no cover
+            raise OSError("Shared block caches require POSIX file locks")
+        if slot_size < 1 or max_bytes < slot_size:
+            raise ValueError("max_bytes must be at least one slot_size")
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._mmap = None
+        try:
+            with self._locked():
+                if os.fstat(self._fd).st_size == 0:
+                    slot_count = max_bytes // slot_size
+                    slot_size = _aligned(slot_size)
+                    os.ftruncate(
+                        self._fd, self._data_offset(slot_count) +
+                        slot_count * slot_size)
+                    header = np.array(
+                        [(_MAGIC, slot_count, slot_size, 0, 0, 0, 0)],
+                        dtype=_HEADER)
+                    os.write(self._fd, header.tobytes())
+                self._map()
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self):
+        size = os.fstat(self._fd).st_size
+        if size < _HEADER.itemsize:
+            raise ValueError("{} is not a shared block cache".format(self.path))
+        self._mmap = mmap.mmap(self._fd, size)
+        self._header = np.ndarray((1,), dtype=_HEADER, buffer=self._mmap)
+        header = self._header[0]
+        slot_count = int(header['slot_count'])
+        slot_size = int(header['slot_size'])
+        if header['magic'] != _MAGIC or (
+                size < self._data_offset(slot_count) + slot_count * slot_size):
+            raise ValueError("{} is not a shared block cache".format(self.path))
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self._slots = np.ndarray(
+            (self.slot_count,), dtype=_SLOT, buffer=self._mmap,
+            offset=_aligned(_HEADER.itemsize))
+
+    @staticmethod
+    def _data_offset(slot_count):
+        return _aligned(
+            _aligned(_HEADER.itemsize) + slot_count * _SLOT.itemsize, 4096)
+
+    def __repr__(self):
+        return "<SharedBlockCache path='{}' slot_count={} slot_size={}>".format(
+            self.path, self.slot_count, self.slot_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Unmap the cache's file. Its blocks remain for other processes"""
+        if self._mmap is not None:
+            # Views of the map must be released before it's closed.
+            self._header = self._slots = None
+            self._mmap.close()
+            self._mmap = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _reopen(self):
+        """Give a forked process its own descriptor of the cache's file
+
+        flock() locks belong to open file descriptions, which a forked
+        process shares with its parent, so processes locking the same
+        inherited descriptor wouldn't exclude each other. The map is
+        shared and kept.
+        """
+        fd = os.open(self.path, os.O_RDWR)
+        old = os.fstat(self._fd)
+        new = os.fstat(fd)
+        if (new.st_dev, new.st_ino) != (old.st_dev, old.st_ino):
+            os.close(fd)
+            raise OSError(
+                "{} was replaced after the cache was opened".format(
+                    self.path))
+        os.close(self._fd)
+        self._fd = fd
+        self._pid = os.getpid()
+        # The parent's lock may have been held by one of its threads.
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        if os.getpid() != self._pid:
+            self._reopen()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _slot_data(self, n, nbytes):
+        offset = self._data_offset(self.slot_count) + n * self.slot_size
+        return np.frombuffer(
+            self._mmap, dtype='uint8', count=nbytes, offset=offset)
+
+    def _find(self, key):
+        slots = self._slots
+        matches = np.flatnonzero(
+            (slots['key'] == key).all(axis=1) & (slots['used'] > 0))
+        return int(matches[0]) if len(matches) else None
+
+    def _tick(self):
+        header = self._header
+        header['clock'] += 1
+        return header['clock'][0]
+
+    @staticmethod
+    def _block_key(dataset, level, bidx, i, j):
+        return _digest(
+            _dataset_key(dataset), _file_identity(dataset),
+            None if level is None else int(level), int(bidx), int(i), int(j))
+
+    def get(self, dataset, bidx, i, j, level=None):
+        """Get a copy of a block of a band or None
+
+        Parameters
+        ----------
+        dataset : dataset object or str
+            A dataset or its name.
+        bidx : int
+            The band index.
+        i, j : int
+            The row and column of the block.
+        level : int, optional
+            The overview level of the block. Default is the full
+            resolution band.
+
+        Returns
+        -------
+        numpy ndarray or None
+        """
+        key = self._block_key(dataset, level, bidx, i, j)
+        with self._locked():
+            n = self._find(key)
+            if n is None:
+                self._header['misses'] += 1
+                return None
+            self._header['hits'] += 1
+            slots = self._slots
+            slots['used'][n] = self._tick()
+            dtype = np.dtype(slots['dtype'][n].decode('ascii'))
+            shape = tuple(int(x) for x in slots['shape'][n])
+            data = self._slot_data(n, int(slots['nbytes'][n]))
+            return data.view(dtype).reshape(shape).copy()
+
+    def put(self, dataset, bidx, i, j, arr, level=None):
+        """Store a copy of a 2D block of a band
+
+        If no slot is free, the least recently used block is evicted.
+        Blocks larger than the slot size are not stored.
+        """
+        if arr.ndim != 2 or arr.nbytes > self.slot_size:
+            return
+        arr = np.ascontiguousarray(arr)
+        name = _dataset_key(dataset)
+        key = self._block_key(dataset, level, bidx, i, j)
+        with self._locked():
+            slots = self._slots
+            n = self._find(key)
+            if n is None:
+                n = int(np.argmin(slots['used']))
+                if slots['used'][n]:
+                    self._header['evictions'] += 1
+            slots['used'][n] = 0
+            self._slot_data(n, arr.nbytes)[:] = arr.view('uint8').ravel()
+            slots['key'][n] = key
+            slots['dataset'][n] = _digest(name)
+            slots['nbytes'][n] = arr.nbytes
+            slots['dtype'][n] = arr.dtype.name.encode('ascii')
+            slots['shape'][n] = arr.shape
+            slots['used'][n] = self._tick()
+
+    def invalidate(self, dataset=None):
+        """Remove the blocks of a dataset or, by default, of all datasets"""
+        with self._locked():
+            slots = self._slots
+            if dataset is None:
+                slots['used'] = 0
+            else:
+                name = _digest(_dataset_key(dataset))
+                slots['used'][(slots['dataset'] == name).all(axis=1)] = 0
+
+    def stats(self):
+        """Get the cache's metrics, shared by the processes using it
+
+        Returns
+        -------
+        BlockCacheStats
+        """
+        with self._locked():
+            header = self._header[0]
+            used = self._slots['used'] > 0
+            return BlockCacheStats(
+                int(header['hits']), int(header['misses']),
+                int(header['evictions']), int(used.sum()),
+                int(self._slots['nbytes'][used].sum()))
+
+    def reset_stats(self):
+        """Set the counts of hits, misses, and evictions to zero"""
+        with self._locked():
+            for name in ('hits', 'misses', 'evictions'):
+                self._header[name] = 0
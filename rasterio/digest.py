@@ -0,0 +1,273 @@
+"""Content digests of datasets, composed from digests of chunks.
+
+A dataset's pixels are divided into chunks of a fixed grid that does
+not depend on how the dataset is stored, so that datasets with equal
+pixels have equal digests whatever their format, blocks, or
+compression. Each chunk of each band is hashed independently. A band's
+digest is the hash of its chunks' digests and the dataset's digest is
+the hash of its shape, data types, and band digests, like the levels of
+a Merkle tree. Georeferencing and metadata are not hashed.
+
+Since chunk digests are kept, a changed window of a dataset can be
+found or verified by hashing only the chunks it intersects.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from rasterio.stats import _chunk_windows
+from rasterio.windows import Window, intersection
+
+
+def _hash_chunk(algorithm, arr):
+    """Digest of a band chunk's little-endian pixel values"""
+    arr = np.ascontiguousarray(arr, dtype=arr.dtype.newbyteorder('<'))
+    h = hashlib.new(algorithm)
+    h.update(b'\x00')
+    h.update(arr)
+    return h.digest()
+
+
+class DatasetDigest(object):
+    """The digests of a dataset and of its bands and chunks
+
+    Attributes
+    ----------
+    algorithm : str
+        The name of a hashlib algorithm.
+    chunk_shape : tuple
+        The (rows, columns) of chunks.
+    width, height : int
+        The dataset's shape.
+    indexes : tuple
+        The indexes of hashed bands.
+    dtypes : tuple
+        The data types of hashed bands.
+    """
+
+    def __init__(self, algorithm, chunk_shape, width, height, indexes,
+                 dtypes, chunks):
+        """Create a digest from the digests of chunks
+
+        Parameters
+        ----------
+        chunks : dict
+            Digests of chunks as bytes, keyed by (bidx, i, j) where i
+            and j are the row and column of the chunk in the grid.
+        """
+        self.algorithm = algorithm
+        self.chunk_shape = tuple(chunk_shape)
+        self.width = width
+        self.height = height
+        self.indexes = tuple(indexes)
+        self.dtypes = tuple(dtypes)
+        self._chunks = dict(chunks)
+        self._band_digests = {}
+        self._digest = None
+
+    def __repr__(self):
+        return "<DatasetDigest {}:{}>".format(self.algorithm, self.hexdigest())
+
+    def __eq__(self, other):
+        return (isinstance(other, DatasetDigest) and
+                self.algorithm == other.algorithm and
+                self.digest() == other.digest())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.digest())
+
+    def windows(self, window=None):
+        """Generate the (i, j) indexes and windows of chunks
+
+        Parameters
+        ----------
+        window : Window, optional
+            Only chunks that intersect this window are generated.
+        """
+        full = Window(0, 0, self.width, self.height)
+        if window is None:
+            window = full
+        else:
+            window = window.round_offsets().round_lengths('ceil')
+            window = intersection([window, full])
+        chunk_height, chunk_width = self.chunk_shape
+        for chunk in _chunk_windows(window, self.chunk_shape, min_height=0):
+            i = int(chunk.row_off) // chunk_height
+            j = int(chunk.col_off) // chunk_width
+            yield (i, j), Window(
+                j * chunk_width, i * chunk_height,
+                min(chunk_width, self.width - j * chunk_width),
+                min(chunk_height, self.height - i * chunk_height))
+
+    def chunk_digest(self, bidx, i, j):
+        """The digest of a band's chunk"""
+        return self._chunks[(bidx, i, j)]
+
+    def band_digest(self, bidx):
+        """The digest of a band"""
+        if bidx not in self._band_digests:
+            h = hashlib.new(self.algorithm)
+            h.update(b'\x01')
+            for (i, j), _ in self.windows():
+                h.update(self._chunks[(bidx, i, j)])
+            self._band_digests[bidx] = h.digest()
+        return self._band_digests[bidx]
+
+    def digest(self):
+        """The digest of the dataset"""
+        if self._digest is None:
+            header = json.dumps({
+                'width': self.width, 'height': self.height,
+                'dtypes': list(self.dtypes),
+                'chunk_shape': list(self.chunk_shape)}, sort_keys=True)
+            h = hashlib.new(self.algorithm)
+            h.update(b'\x02')
+            h.update(header.encode('utf-8'))
+            for bidx in self.indexes:
+                h.update(self.band_digest(bidx))
+            self._digest = h.digest()
+        return self._digest
+
+    def hexdigest(self):
+        """The digest of the dataset as a string of hex digits"""
+        return ''.join('{:02x}'.format(c) for c in bytearray(self.digest()))
+
+    def _check_dataset(self, src):
+        if (src.width, src.height) != (self.width, self.height):
+            raise ValueError("Dataset shape differs from the digest's")
+        if tuple(src.dtypes[bidx - 1] for bidx in self.indexes) != self.dtypes:
+            raise ValueError("Dataset data types differ from the digest's")
+
+    def changed(self, src, window=None, num_threads=1):
+        """Find chunks of a dataset whose pixels differ from the digest's
+
+        Only the chunks that intersect `window` are read and hashed.
+
+        Parameters
+        ----------
+        src : dataset object opened in 'r' or 'r+' mode
+            A dataset of the same shape and data types.
+        window : Window, optional
+            A window of the dataset. Default is the entire dataset.
+        num_threads : int, optional
+            The number of threads reading and hashing chunks.
+
+        Returns
+        -------
+        dict
+            New digests of changed chunks, keyed by (bidx, i, j).
+
+        Raises
+        ------
+        ValueError
+            If the dataset's shape or data types differ.
+        """
+        self._check_dataset(src)
+        chunks = _hash_chunks(
+            src, self.indexes, self.windows(window), self.algorithm,
+            num_threads)
+        return dict(
+            (key, value) for key, value in chunks.items()
+            if self._chunks[key] != value)
+
+    def verify(self, src, window=None, num_threads=1):
+        """True if a window of a dataset matches the digest
+
+        Parameters are those of changed().
+        """
+        return not self.changed(src, window=window, num_threads=num_threads)
+
+    def update(self, src, window=None, num_threads=1):
+        """Update the digest with a changed window of a dataset
+
+        Only the chunks that intersect `window` are read and hashed.
+        Band and dataset digests are recomputed from chunk digests.
+
+        Parameters are those of changed().
+
+        Returns
+        -------
+        list
+            Sorted (bidx, i, j) keys of changed chunks.
+        """
+        changed = self.changed(src, window=window, num_threads=num_threads)
+        if changed:
+            self._chunks.update(changed)
+            for bidx in set(key[0] for key in changed):
+                self._band_digests.pop(bidx, None)
+            self._digest = None
+        return sorted(changed)
+
+
+def _hash_chunks(src, indexes, windows, algorithm, num_threads):
+    """Digests of chunks keyed by (bidx, i, j)"""
+
+    def hash_window(reader, item):
+        (i, j), window = item
+        # Bands may have different data types.
+        data = reader.read_bands(indexes, window=window)
+        return [((bidx, i, j), _hash_chunk(algorithm, arr))
+                for bidx, arr in zip(indexes, data)]
+
+    chunks = {}
+    for items in src._map_windows(hash_window, windows, num_threads):
+        chunks.update(items)
+    return chunks
+
+
+def dataset_digest(src, indexes=None, chunk_shape=(256, 256),
+                   algorithm='sha256', num_threads=1):
+    """Compute the content digest of a dataset
+
+    Parameters
+    ----------
+    src : dataset object opened in 'r' or 'r+' mode
+        The dataset.
+    indexes : list of ints, optional
+        The bands to hash. Default is all bands.
+    chunk_shape : tuple, optional
+        The (rows, columns) of chunks. Datasets are comparable only if
+        hashed with the same chunk shape and algorithm.
+    algorithm : str, optional
+        The name of an algorithm of hashlib, such as 'sha256' or, from
+        Python 3.6, 'blake2b'.
+    num_threads : int, optional
+        The number of threads reading and hashing chunks. Each has its
+        own dataset handle.
+
+    Returns
+    -------
+    DatasetDigest
+
+    Raises
+    ------
+    ValueError
+        If the algorithm is unknown, num_threads is less than 1, or
+        chunk_shape is not positive.
+    """
+    hashlib.new(algorithm)
+
+    if num_threads < 1:
+        raise ValueError("num_threads must be at least 1")
+
+    chunk_shape = tuple(int(n) for n in chunk_shape)
+    if len(chunk_shape) != 2 or min(chunk_shape) < 1:
+        raise ValueError("chunk_shape must be a pair of positive integers")
+
+    if indexes is None:
+        indexes = src.indexes
+    elif isinstance(indexes, int):
+        indexes = [indexes]
+    indexes = tuple(indexes)
+
+    digest = DatasetDigest(
+        algorithm, chunk_shape, src.width, src.height, indexes,
+        [src.dtypes[bidx - 1] for bidx in indexes], {})
+    digest._chunks = _hash_chunks(
+        src, indexes, digest.windows(), algorithm, num_threads)
+    return digest
@@ -14,7 +14,8 @@ from rasterio._env import (
 from rasterio.compat import string_types, getargspec
 from rasterio.errors import (
     EnvError, GDALVersionError, RasterioDeprecationWarning)
-from rasterio.session import Session, AWSSession, DummySession
+from rasterio.session import (
+    Session, AWSSession, DummySession, session_cache, _expiry_timestamp)
 
 
 class ThreadEnv(threading.local):
@@ -382,6 +383,39 @@ def ensure_env_credentialled(f):
     return ensure_env_with_credentials(f)
 
 
+def _default_env(session_cls):
+    """The default environment for paths needing a session_cls
+
+    Calls made without an environment share one per session class.
+    Like sessions, environments are kept in the session cache until
+    their time to live elapses or their credentials near expiry, and
+    are keyed by the AWS variables from which credentials may be
+    resolved.
+
+    Parameters
+    ----------
+    session_cls : class
+        A Session class.
+
+    Returns
+    -------
+    Env
+    """
+    # Sessions are cached themselves, so the session is created before
+    # the environment is looked up rather than within its resolution.
+    session = session_cls()
+
+    def resolve():
+        env = Env.from_defaults(session=session)
+        return env, _expiry_timestamp(getattr(session, '_creds', None))
+
+    key = (
+        Env, session_cls,
+        tuple(sorted((k, v) for k, v in os.environ.items()
+                     if k.startswith('AWS_'))))
+    return session_cache.get(key, resolve)
+
+
 def ensure_env_with_credentials(f):
     """Ensures a config environment exists and is credentialized
 
@@ -400,26 +434,31 @@ def ensure_env_with_credentials(f):
     credentializes the environment if the first argument is a URI with
     scheme "s3".
 
+    If an environment exists and already has the credentials needed,
+    f is called within it. Entering a `rasterio.Env()` once around
+    many calls to `rasterio.open()` thus saves the cost of configuring
+    GDAL for each call. Otherwise, f is called within a default
+    environment that is created once for the path's session class and
+    reused by later calls.
+
     """
     @wraps(f)
     def wrapper(*args, **kwds):
-        if local._env:
-            env_ctor = Env
-        else:
-            env_ctor = Env.from_defaults
-
         if isinstance(args[0], str):
             session_cls = Session.cls_from_path(args[0])
+        else:
+            session_cls = DummySession
 
-            if local._env and session_cls.hascreds(getenv()):
-                session_cls = DummySession
-
-            session = session_cls()
-
+        if local._env:
+            # The existing environment is used as is, without nesting
+            # another, unless it lacks credentials that the path needs.
+            if session_cls.hascreds(local._env.options):
+                return f(*args, **kwds)
+            env = Env(session=session_cls())
         else:
-            session = DummySession()
+            env = _default_env(session_cls)
 
-        with env_ctor(session=session):
+        with env:
             return f(*args, **kwds)
 
     return wrapper
@@ -102,3 +102,11 @@ class UnsupportedOperation(RasterioError):
 
 class OverviewCreationError(RasterioError):
     """Raised when creation of an overview fails"""
+
+
+class MemoryMapError(RasterioError):
+    """Raised when a dataset's pixels can't be memory-mapped"""
+
+
+class OperationCancelledError(RasterioError):
+    """Raised when an operation is cancelled by a CancellationToken"""
@@ -1,6 +1,8 @@
 """Functions for working with features in a raster dataset."""
 
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 import logging
 import warnings
 import math
@@ -9,7 +11,8 @@ import os
 import numpy as np
 
 import rasterio
-from rasterio._features import _shapes, _sieve, _rasterize, _bounds
+from rasterio._features import (
+    _shapes, _sieve, _rasterize, _bounds, _wkb_bounds)
 from rasterio.crs import CRS
 from rasterio.dtypes import validate_dtype, can_cast_dtype, get_minimum_dtype
 from rasterio.enums import MergeAlg
@@ -22,6 +25,9 @@ from rasterio import warp
 
 log = logging.getLogger(__name__)
 
+# Number of shapes converted to OGR geometries and burned at a time.
+RASTERIZE_BATCH_SIZE = 10000
+
 
 @ensure_env
 def geometry_mask(
@@ -69,7 +75,8 @@ def geometry_mask(
 
 
 @ensure_env
-def shapes(source, mask=None, connectivity=4, transform=IDENTITY):
+def shapes(source, mask=None, connectivity=4, transform=IDENTITY,
+           strip_height=None):
     """Yield (polygon, value for each set of adjacent pixels of the same value.
 
     Parameters
@@ -89,6 +96,14 @@ def shapes(source, mask=None, connectivity=4, transform=IDENTITY):
     transform : Affine transformation, optional
         If not provided, feature coordinates will be generated based on pixel
         coordinates
+    strip_height : int, optional
+        If given, the source is polygonized in strips of this many rows
+        and polygons that cross the boundaries between strips are
+        stitched together. Only one strip of the source and mask, plus
+        the polygons that are not yet closed off by a strip boundary,
+        are held in memory at a time. When `source` is a Band, its data
+        and mask are read from the dataset strip by strip and the
+        dataset's own transform is used.
 
     Yields
     -------
@@ -107,14 +122,361 @@ def shapes(source, mask=None, connectivity=4, transform=IDENTITY):
     as imagery, may produce one polygon per pixel and consume large amounts of
     memory.
 
+    Features are yielded in a different order when `strip_height` is
+    given: a polygon is yielded as soon as the strip that completes it
+    has been processed.
+
     """
     if hasattr(source, 'mask') and mask is None:
         mask = ~source.mask
         source = source.data
 
     transform = guard_transform(transform)
-    for s, v in _shapes(source, mask, connectivity, transform):
-        yield s, v
+
+    if strip_height is None:
+        for s, v in _shapes(source, mask, connectivity, transform):
+            yield s, v
+
+    else:
+        if isinstance(source, tuple):
+            transform = source.ds.transform
+        strips = _iter_strips(source, mask, strip_height)
+        for s, v in _polygonize_strips(
+                strips, source.shape[-2], connectivity, transform):
+            yield s, v
+
+
+def _iter_strips(source, mask, strip_height):
+    """Yield (row offset, image, mask) for strips of a source
+
+    Strips of Band sources and masks are read from their datasets.
+    """
+    if strip_height < 1:
+        raise ValueError("strip_height must be a positive integer")
+
+    if mask is not None and mask.shape != source.shape:
+        raise ValueError("Mask must have same shape as image")
+
+    height, width = source.shape[-2:]
+
+    for row_off in range(0, height, strip_height):
+        rows = min(strip_height, height - row_off)
+        window = Window(0, row_off, width, rows)
+
+        if isinstance(source, tuple):
+            img = source.ds.read(source.bidx, window=window)
+        else:
+            img = source[row_off:row_off + rows]
+
+        if mask is None:
+            msk = None
+        elif isinstance(mask, tuple):
+            msk = mask.ds.read(mask.bidx, window=window)
+        else:
+            msk = mask[row_off:row_off + rows]
+
+        yield row_off, img, msk
+
+
+def _polygonize_strips(strips, height, connectivity, transform):
+    """Polygonize strips of a raster and stitch them together
+
+    Each strip is polygonized in pixel coordinates, which are exact
+    integers. Polygons that share an edge (or, with 8 connectivity, a
+    corner) with a polygon of the same value across the boundary
+    between two strips are joined into a group, and a group is merged
+    and yielded once no member of it reaches the bottom of the latest
+    strip.
+
+    Parameters
+    ----------
+    strips : iterable
+        (row offset, image, mask) tuples, in row order.
+    height : int
+        Number of rows in the raster.
+    connectivity : int
+        4 or 8.
+    transform : Affine
+        Transformation from pixel coordinates to output coordinates.
+
+    Yields
+    ------
+    tuple
+        (polygon, value) pairs like those of shapes().
+    """
+    if connectivity not in (4, 8):
+        raise ValueError("Connectivity Option must be 4 or 8")
+
+    # Union-find over pieces that may still be joined to pieces in the
+    # next strip, or which have been joined to such pieces.
+    parent = {}
+    pieces = {}
+    seams = set()
+    prev_bottom = []
+    counter = 0
+
+    def find(pid):
+        root = pid
+        while parent[root] != root:
+            root = parent[root]
+        while parent[pid] != root:
+            parent[pid], pid = root, parent[pid]
+        return root
+
+    for row_off, img, msk in strips:
+        row_end = row_off + img.shape[0]
+        top = []
+        bottom = []
+
+        for geom, value in _shapes(
+                img, msk, connectivity, Affine.translation(0, row_off)):
+            rings = [[(int(round(x)), int(round(y))) for x, y in ring]
+                     for ring in geom['coordinates']]
+            top_spans = _ring_spans(rings[0], row_off) if row_off > 0 else []
+            bottom_spans = (
+                _ring_spans(rings[0], row_end) if row_end < height else [])
+
+            if not top_spans and not bottom_spans:
+                yield _pixel_polygon(rings, transform), value
+                continue
+
+            counter += 1
+            pieces[counter] = (rings, value)
+            parent[counter] = counter
+            top.extend((x0, x1, value, counter) for x0, x1 in top_spans)
+            bottom.extend((x0, x1, value, counter) for x0, x1 in bottom_spans)
+
+        if row_off > 0:
+            seams.add(row_off)
+        for pid, other in _touching_spans(prev_bottom, top, connectivity):
+            parent[find(pid)] = find(other)
+
+        # Groups with no piece reaching the bottom of this strip are
+        # complete.
+        open_pids = set(pid for x0, x1, v, pid in bottom)
+        groups = {}
+        for pid in pieces:
+            groups.setdefault(find(pid), []).append(pid)
+
+        for members in groups.values():
+            if open_pids.intersection(members):
+                continue
+            value = pieces[members[0]][1]
+            for rings in _merge_pieces(
+                    [pieces[pid][0] for pid in members], seams, connectivity):
+                yield _pixel_polygon(rings, transform), value
+            for pid in members:
+                del pieces[pid]
+                del parent[pid]
+
+        prev_bottom = bottom
+
+
+def _ring_spans(ring, y):
+    """Sorted (x0, x1) spans of a ring's edges that lie on row y"""
+    spans = []
+    for (x0, y0), (x1, y1) in zip(ring[:-1], ring[1:]):
+        if y0 == y1 == y and x0 != x1:
+            spans.append((min(x0, x1), max(x0, x1)))
+    return sorted(spans)
+
+
+def _touching_spans(above, below, connectivity):
+    """Yield pairs of pieces with touching spans of the same value
+
+    Spans touch if they overlap or, with 8 connectivity, if they meet at
+    a corner.
+    """
+    above = sorted(above)
+    below = sorted(below)
+    i = j = 0
+    while i < len(above) and j < len(below):
+        ax0, ax1, aval, apid = above[i]
+        bx0, bx1, bval, bpid = below[j]
+        if connectivity == 8:
+            touching = ax0 <= bx1 and bx0 <= ax1
+        else:
+            touching = ax0 < bx1 and bx0 < ax1
+        if touching and aval == bval:
+            yield apid, bpid
+        # Corners are shared by the next spans, so the span ending
+        # first advances.
+        if ax1 < bx1:
+            i += 1
+        elif bx1 < ax1:
+            j += 1
+        else:
+            if connectivity == 8:
+                if i + 1 < len(above) and above[i + 1][0] == ax1:
+                    if above[i + 1][2] == bval:
+                        yield above[i + 1][3], bpid
+                if j + 1 < len(below) and below[j + 1][0] == bx1:
+                    if below[j + 1][2] == aval:
+                        yield apid, below[j + 1][3]
+            i += 1
+            j += 1
+
+
+def _signed_area(ring):
+    """Twice the signed area of a closed ring"""
+    return sum(x0 * y1 - x1 * y0
+               for (x0, y0), (x1, y1) in zip(ring[:-1], ring[1:]))
+
+
+def _merge_pieces(pieces, seams, connectivity):
+    """Merge pixel aligned polygons that meet along seams
+
+    The edges of all pieces, with exterior rings oriented positively
+    and interior rings negatively, are pooled. Edges on the seams are
+    split at every vertex on the seam and pairs of opposite edges, which
+    separate two pieces, cancel out. The remaining edges are linked back
+    into rings. At a vertex shared by two rings the sharpest left turn
+    is taken with 4 connectivity, keeping diagonally adjacent pixels
+    apart, and the sharpest right turn with 8 connectivity, joining
+    them.
+
+    Returns
+    -------
+    list
+        A list of rings lists, one per exterior ring, each with the
+        exterior ring first.
+    """
+    edges = []
+    for rings in pieces:
+        for k, ring in enumerate(rings):
+            area = _signed_area(ring)
+            if (k == 0) != (area > 0):
+                ring = ring[::-1]
+            edges.extend(zip(ring[:-1], ring[1:]))
+
+    # Split edges lying on seams at all vertices on the seam.
+    breaks = {}
+    for (x0, y0), (x1, y1) in edges:
+        if y0 == y1 and y0 in seams:
+            breaks.setdefault(y0, set()).update((x0, x1))
+    if breaks:
+        split = []
+        for edge in edges:
+            (x0, y0), (x1, y1) = edge
+            if y0 == y1 and y0 in breaks:
+                step = 1 if x1 > x0 else -1
+                xs = sorted((x for x in breaks[y0]
+                             if min(x0, x1) < x < max(x0, x1)),
+                            reverse=(step < 0))
+                points = [x0] + xs + [x1]
+                split.extend(((a, y0), (b, y0))
+                             for a, b in zip(points[:-1], points[1:]))
+            else:
+                split.append(edge)
+        edges = split
+
+    # Cancel opposite edges.
+    counts = {}
+    for edge in edges:
+        counts[edge] = counts.get(edge, 0) + 1
+    for p, q in list(counts):
+        if counts.get((p, q)) and counts.get((q, p)):
+            n = min(counts[(p, q)], counts[(q, p)])
+            counts[(p, q)] -= n
+            counts[(q, p)] -= n
+
+    outgoing = {}
+    for (p, q), n in counts.items():
+        for _ in range(n):
+            outgoing.setdefault(p, []).append(q)
+
+    turn = 1 if connectivity == 4 else -1
+
+    def rank(prev, point, nxt):
+        dx0, dy0 = point[0] - prev[0], point[1] - prev[1]
+        dx1, dy1 = nxt[0] - point[0], nxt[1] - point[1]
+        cross = dx0 * dy1 - dy0 * dx1
+        dot = dx0 * dx1 + dy0 * dy1
+        if cross * turn > 0:
+            return 0
+        elif cross == 0 and dot > 0:
+            return 1
+        elif cross * turn < 0:
+            return 2
+        return 3
+
+    rings = []
+    while outgoing:
+        start = next(iter(outgoing))
+        first = outgoing[start].pop()
+        if not outgoing[start]:
+            del outgoing[start]
+        ring = [start, first]
+        while True:
+            prev, point = ring[-2], ring[-1]
+            candidates = list(outgoing.get(point, []))
+            if point == start:
+                candidates.append(None)
+            nxt = min(candidates, key=lambda q: rank(
+                prev, point, first if q is None else q))
+            if nxt is None:
+                break
+            outgoing[point].remove(nxt)
+            if not outgoing[point]:
+                del outgoing[point]
+            ring.append(nxt)
+        rings.append(_simplify_ring(ring))
+
+    exteriors = [ring for ring in rings if _signed_area(ring) > 0]
+    holes = [ring for ring in rings if _signed_area(ring) < 0]
+
+    if len(exteriors) == 1:
+        return [exteriors[:1] + holes]
+
+    polygons = [[ring] for ring in exteriors]
+    for hole in holes:
+        (x0, y0), (x1, y1) = hole[0], hole[1]
+        # The center of the pixel to the right of the first edge lies
+        # inside the hole.
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        px = x0 + 0.5 * dx + 0.5 * dy
+        py = y0 + 0.5 * dy - 0.5 * dx
+        containing = [poly for poly in polygons
+                      if _contains(poly[0], (px, py))]
+        if containing:
+            min(containing, key=lambda poly: _signed_area(poly[0])).append(
+                hole)
+    return polygons
+
+
+def _simplify_ring(ring):
+    """Remove collinear vertices from a closed rectilinear ring"""
+    points = ring[:-1]
+    kept = []
+    n = len(points)
+    for k, point in enumerate(points):
+        prev = points[k - 1]
+        nxt = points[(k + 1) % n]
+        if (prev[0] == point[0] == nxt[0]) or (prev[1] == point[1] == nxt[1]):
+            continue
+        kept.append(point)
+    return kept + kept[:1]
+
+
+def _contains(ring, point):
+    """Test whether a point lies inside a ring by ray casting"""
+    x, y = point
+    inside = False
+    for (x0, y0), (x1, y1) in zip(ring[:-1], ring[1:]):
+        if (y0 > y) != (y1 > y):
+            if x < x0 + (y - y0) * (x1 - x0) / float(y1 - y0):
+                inside = not inside
+    return inside
+
+
+def _pixel_polygon(rings, transform):
+    """A GeoJSON-like polygon from rings in pixel coordinates"""
+    return {
+        'type': 'Polygon',
+        'coordinates': [
+            [transform * (float(x), float(y)) for x, y in ring]
+            for ring in rings]}
 
 
 @ensure_env
@@ -179,7 +541,10 @@ def rasterize(
     ----------
     shapes : iterable of (geometry, value) pairs or iterable over
         geometries. `geometry` can either be an object that implements
-        the geo interface or GeoJSON-like object.
+        the geo interface, a GeoJSON-like object, or a WKB string
+        (bytes) such as the `wkb` property of a Shapely geometry. The
+        coordinates of lines and rings may be Numpy arrays, as made by
+        `shapes_from_ragged_array()`.
     out_shape : tuple or list with 2 integers
         Shape of output numpy ndarray.
     fill : int or float, optional
@@ -218,6 +583,13 @@ def rasterize(
     rasterio.uint16, rasterio.uint32, rasterio.float32,
     rasterio.float64.
 
+    If `out` or `dtype` is given, `shapes` is consumed and burned in
+    batches instead of being read into a list first, and invalid
+    geometries or values are reported when the batch containing them
+    is reached. When a ValueError is raised for the values of a batch,
+    the batches before it have already been burned, so a given `out`
+    array may be partially written.
+
     """
     valid_dtypes = (
         'int16', 'int32', 'uint8', 'uint16', 'uint32', 'float32', 'float64'
@@ -250,14 +622,276 @@ def rasterize(
     if dtype is not None and np.dtype(dtype).name not in valid_dtypes:
         raise ValueError(format_invalid_dtype('dtype'))
 
-    valid_shapes = []
-    shape_values = []
+    def check_values(shape_values, dtype):
+        if not validate_dtype(shape_values, valid_dtypes):
+            raise ValueError(format_invalid_dtype('shape values'))
+
+        if not can_cast_dtype(shape_values, dtype):
+            raise ValueError(format_cast_error('shape values', dtype))
+
+    def checked_batches(valid_shapes, dtype):
+        valid_shapes = iter(valid_shapes)
+        while True:
+            batch = list(islice(valid_shapes, RASTERIZE_BATCH_SIZE))
+            if not batch:
+                return
+            check_values(np.array([value for geom, value in batch]), dtype)
+            for item in batch:
+                yield item
+
+    if out is not None:
+        if np.dtype(out.dtype).name not in valid_dtypes:
+            raise ValueError(format_invalid_dtype('out'))
+
+        valid_shapes = checked_batches(
+            _iter_valid_shapes(shapes, default_value), out.dtype.name)
+
+    elif out_shape is not None:
+
+        if len(out_shape) != 2:
+            raise ValueError('Invalid out_shape, must be 2D')
+
+        if dtype is None:
+            # The smallest data type that fits all values must be
+            # found before any shape can be burned.
+            valid_shapes = list(_iter_valid_shapes(shapes, default_value))
+
+            if not valid_shapes:
+                raise ValueError(
+                    'No valid geometry objects found for rasterize')
+
+            shape_values = np.array([value for geom, value in valid_shapes])
+
+            if not validate_dtype(shape_values, valid_dtypes):
+                raise ValueError(format_invalid_dtype('shape values'))
+
+            dtype = get_minimum_dtype(np.append(shape_values, fill))
+
+        else:
+            valid_shapes = checked_batches(
+                _iter_valid_shapes(shapes, default_value), dtype)
+
+        out = np.empty(out_shape, dtype=dtype)
+        out.fill(fill)
+
+    else:
+        raise ValueError('Either an out_shape or image must be provided')
+
+    if min(out.shape) == 0:
+        raise ValueError("width and height must be > 0")
+
+    transform = guard_transform(transform)
+    if not _rasterize(valid_shapes, out, transform, all_touched, merge_alg,
+                      batch_size=RASTERIZE_BATCH_SIZE):
+        raise ValueError('No valid geometry objects found for rasterize')
+    return out
+
+
+@ensure_env
+def rasterize_blocks(
+        shapes,
+        dst,
+        bidx=1,
+        fill=0,
+        all_touched=False,
+        merge_alg=MergeAlg.replace,
+        default_value=1,
+        num_threads=1,
+        overlay=False):
+    """Burn geometries into a dataset one block at a time.
+
+    Unlike rasterize(), the output never needs to fit in memory. The
+    geometries are indexed by the blocks of the dataset that their
+    bounds intersect and each block is burned with only the geometries
+    that may touch it. Blocks are burned by a pool of threads and
+    written to the dataset as they are completed.
+
+    Parameters
+    ----------
+    shapes : iterable of (geometry, value) pairs or iterable over
+        geometries. Geometries may be of any kind accepted by
+        rasterize().
+    dst : dataset object opened in 'w' or 'r+' mode
+        The dataset to burn geometries into. Its transform is used to
+        locate the geometries. Tiled datasets are most efficient.
+    bidx : int, optional
+        Index of the band to burn geometries into.
+    fill : int or float, optional
+        Value of pixels not covered by geometries. If None, geometries
+        are burned on top of the dataset's existing pixels.
+    all_touched : boolean, optional
+        As in rasterize().
+    merge_alg : MergeAlg, optional
+        As in rasterize().
+    default_value : int or float, optional
+        Used as value for all geometries, if not provided in `shapes`.
+    num_threads : int, optional
+        Number of threads that burn blocks.
+    overlay : bool, optional
+        If True, geometries are burned into blocks filled with `fill`
+        and only the burned pixels that differ from `fill` replace the
+        dataset's existing pixels, as the rio rasterize command does
+        for an existing output.
+
+    Returns
+    -------
+    None
+    """
+    valid_dtypes = (
+        'int16', 'int32', 'uint8', 'uint16', 'uint32', 'float32', 'float64'
+    )
+
+    dtype = dst.dtypes[bidx - 1]
+
+    if dtype not in valid_dtypes:
+        raise ValueError('dst dtype must be one of: {0}'.format(
+            ', '.join(valid_dtypes)))
+
+    if num_threads < 1:
+        raise ValueError("num_threads must be a positive integer")
+
+    if overlay and fill is None:
+        raise ValueError("overlay requires a fill value")
+
+    valid_shapes = list(_iter_valid_shapes(shapes, default_value))
+
+    if not valid_shapes:
+        raise ValueError('No valid geometry objects found for rasterize')
+
+    shape_values = np.array([value for geom, value in valid_shapes])
+
+    if not validate_dtype(shape_values, valid_dtypes):
+        raise ValueError('shape values dtype must be one of: {0}'.format(
+            ', '.join(valid_dtypes)))
+
+    if not can_cast_dtype(shape_values, dtype):
+        raise ValueError(
+            'shape values cannot be cast to specified dtype: {0}'.format(
+                dtype))
+
+    if fill is not None and not can_cast_dtype(np.array([fill]), dtype):
+        raise ValueError(
+            'fill cannot be cast to specified dtype: {0}'.format(dtype))
+
+    block_height, block_width = dst.block_shapes[bidx - 1]
+
+    # Strips of a few rows are grouped into blocks of at least 256 rows.
+    if block_width == dst.width and block_height < 256:
+        block_height *= int(math.ceil(256.0 / block_height))
+
+    index = _block_index(
+        valid_shapes, dst.transform, dst.height, dst.width, block_height,
+        block_width)
+
+    def burn(data, keys, transform, existing):
+        if keys:
+            _rasterize(
+                [valid_shapes[k] for k in keys], data, transform,
+                all_touched, merge_alg)
+        if existing is None:
+            return data
+        burned = data != fill
+        existing[burned] = data[burned]
+        return existing
+
+    def blocks():
+        for row_off in range(0, dst.height, block_height):
+            for col_off in range(0, dst.width, block_width):
+                window = Window(
+                    col_off, row_off, min(block_width, dst.width - col_off),
+                    min(block_height, dst.height - row_off))
+                keys = index.pop(
+                    (row_off // block_height, col_off // block_width), [])
+                existing = None
+                if fill is None:
+                    data = dst.read(bidx, window=window)
+                else:
+                    data = np.empty(
+                        (int(window.height), int(window.width)), dtype=dtype)
+                    data.fill(fill)
+                    if overlay:
+                        existing = dst.read(bidx, window=window)
+                yield window, data, keys, dst.window_transform(window), existing
+
+    # Datasets are read and written only by this thread.
+    if num_threads == 1:
+        for window, data, keys, transform, existing in blocks():
+            dst.write(burn(data, keys, transform, existing), bidx,
+                      window=window)
+
+    else:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            pending = {}
+            for window, data, keys, transform, existing in blocks():
+                future = executor.submit(
+                    burn, data, keys, transform, existing)
+                pending[future] = window
+
+                # Bound the number of blocks held in memory.
+                if len(pending) >= 2 * num_threads:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        dst.write(
+                            future.result(), bidx, window=pending.pop(future))
+
+            for future in list(pending):
+                dst.write(future.result(), bidx, window=pending.pop(future))
+
+
+def _block_index(shapes, transform, height, width, block_height,
+                 block_width):
+    """Map (row, col) block indexes to the shapes they may intersect
+
+    Shapes are located by the pixel bounds of their bounding boxes,
+    padded by a pixel. Each list of shape positions is in the order of
+    `shapes`.
+    """
+    inverse = ~transform
+    index = {}
+
+    for k, (geom, value) in enumerate(shapes):
+        if isinstance(geom, (bytes, bytearray)):
+            left, bottom, right, top = _wkb_bounds(geom)
+        else:
+            left, bottom, right, top = bounds(geom)
+
+        corners = [inverse * (x, y) for x in (left, right)
+                   for y in (bottom, top)]
+        cols, rows = zip(*corners)
+        col_off = max(int(math.floor(min(cols))) - 1, 0)
+        col_end = min(int(math.ceil(max(cols))) + 1, width)
+        row_off = max(int(math.floor(min(rows))) - 1, 0)
+        row_end = min(int(math.ceil(max(rows))) + 1, height)
+
+        if col_off >= col_end or row_off >= row_end:
+            continue
+
+        for i in range(row_off // block_height,
+                       (row_end - 1) // block_height + 1):
+            for j in range(col_off // block_width,
+                           (col_end - 1) // block_width + 1):
+                index.setdefault((i, j), []).append(k)
+
+    return index
+
+
+def _iter_valid_shapes(shapes, default_value):
+    """Yield (geometry, value) pairs for rasterize()
+
+    Parts of GeometryCollections are yielded separately.
+    """
     for index, item in enumerate(shapes):
         if isinstance(item, (tuple, list)):
             geom, value = item
         else:
             geom = item
             value = default_value
+
+        if isinstance(geom, (bytes, bytearray)):
+            # WKB is checked by GDAL as it is parsed.
+            yield geom, value
+            continue
+
         geom = getattr(geom, '__geo_interface__', None) or geom
 
         # geom must be a valid GeoJSON geometry type and non-empty
@@ -273,51 +907,88 @@ def rasterize(
             # Only 1-level deep since GeoJSON spec discourages nested
             # GeometryCollections
             for part in geom['geometries']:
-                valid_shapes.append((part, value))
+                yield part, value
 
         else:
-            valid_shapes.append((geom, value))
+            yield geom, value
 
-        shape_values.append(value)
 
-    if not valid_shapes:
-        raise ValueError('No valid geometry objects found for rasterize')
-
-    shape_values = np.array(shape_values)
-
-    if not validate_dtype(shape_values, valid_dtypes):
-        raise ValueError(format_invalid_dtype('shape values'))
-
-    if dtype is None:
-        dtype = get_minimum_dtype(np.append(shape_values, fill))
-
-    elif not can_cast_dtype(shape_values, dtype):
-        raise ValueError(format_cast_error('shape values', dtype))
-
-    if out is not None:
-        if np.dtype(out.dtype).name not in valid_dtypes:
-            raise ValueError(format_invalid_dtype('out'))
-
-        if not can_cast_dtype(shape_values, out.dtype):
-            raise ValueError(format_cast_error('shape values', out.dtype.name))
+def shapes_from_ragged_array(geometry_type, coords, offsets=(), values=None):
+    """Yield geometries stored in flat coordinate and offset arrays
 
-    elif out_shape is not None:
-
-        if len(out_shape) != 2:
-            raise ValueError('Invalid out_shape, must be 2D')
+    The layout is that of Shapely's `to_ragged_array()` and of
+    GeoArrow: the coordinates of all geometries are stored in one
+    array and each level of nesting (parts, rings, geometries) is
+    described by an array of offsets into the level below. The
+    geometries are GeoJSON-like objects whose coordinates are views of
+    `coords`, which `rasterize()` converts to OGR geometries without a
+    Python object per point.
 
-        out = np.empty(out_shape, dtype=dtype)
-        out.fill(fill)
+    Parameters
+    ----------
+    geometry_type : str
+        One of 'Point', 'LineString', 'Polygon', 'MultiPoint',
+        'MultiLineString', or 'MultiPolygon'.
+    coords : numpy ndarray
+        Array of shape (N, 2) or (N, 3).
+    offsets : sequence of numpy ndarrays
+        Offsets from the innermost level to the geometries: none for
+        Points, (geometry offsets,) for LineStrings and MultiPoints,
+        (ring offsets, geometry offsets) for Polygons, (line offsets,
+        geometry offsets) for MultiLineStrings, and (ring offsets,
+        polygon offsets, geometry offsets) for MultiPolygons.
+    values : sequence, optional
+        Values of the geometries.
 
+    Yields
+    ------
+    dict or tuple
+        A GeoJSON-like geometry, or a (geometry, value) pair if
+        `values` is given.
+    """
+    depths = {
+        'Point': 0, 'LineString': 1, 'MultiPoint': 1, 'Polygon': 2,
+        'MultiLineString': 2, 'MultiPolygon': 3}
+
+    if geometry_type not in depths:
+        raise ValueError(
+            "geometry_type must be one of: {0}".format(
+                ', '.join(sorted(depths))))
+
+    if len(offsets) != depths[geometry_type]:
+        raise ValueError(
+            "{0} geometries require {1} offset arrays".format(
+                geometry_type, depths[geometry_type]))
+
+    coords = np.asarray(coords, dtype='float64')
+    if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+        raise ValueError("coords must have shape (N, 2) or (N, 3)")
+
+    offsets = [np.asarray(arr) for arr in offsets]
+
+    def nested(level, start, stop):
+        if level < 0:
+            return coords[start:stop]
+        bounds = offsets[level][start:stop + 1]
+        return [nested(level - 1, bounds[k], bounds[k + 1])
+                for k in range(len(bounds) - 1)]
+
+    if offsets:
+        count = len(offsets[-1]) - 1
     else:
-        raise ValueError('Either an out_shape or image must be provided')
-
-    if min(out.shape) == 0:
-        raise ValueError("width and height must be > 0")
+        count = len(coords)
 
-    transform = guard_transform(transform)
-    _rasterize(valid_shapes, out, transform, all_touched, merge_alg)
-    return out
+    for i in range(count):
+        if offsets:
+            bounds = offsets[-1]
+            coordinates = nested(len(offsets) - 2, bounds[i], bounds[i + 1])
+        else:
+            coordinates = coords[i]
+        geom = {'type': geometry_type, 'coordinates': coordinates}
+        if values is None:
+            yield geom
+        else:
+            yield geom, values[i]
 
 
 def bounds(geometry, north_up=True, transform=None):
@@ -528,7 +1199,8 @@ def dataset_features(
         as_mask=False,
         with_nodata=False,
         geographic=True,
-        precision=-1):
+        precision=-1,
+        strip_height=None):
     """Yield GeoJSON features for the dataset
 
     The geometries are polygons bounding contiguous regions of the same raster value.
@@ -558,6 +1230,11 @@ def dataset_features(
     precision: int (DEFAULT: -1)
         Decimal precision of coordinates. -1 for full float precision output
 
+    strip_height: int (DEFAULT: None)
+        Read and polygonize the dataset in strips of this many rows,
+        stitching shapes across strips, instead of all at once. Not
+        compatible with sampling.
+
     Yields
     ------
     GeoJSON-like Feature dictionaries for shapes found in the given band
@@ -565,8 +1242,8 @@ def dataset_features(
     if bidx is not None and bidx > src.count:
         raise ValueError('bidx is out of range for raster')
 
-    img = None
-    msk = None
+    if strip_height is not None and sampling > 1:
+        raise ValueError('strip_height cannot be combined with sampling')
 
     # Adjust transforms.
     transform = src.transform
@@ -587,58 +1264,79 @@ def dataset_features(
         # And follow by scaling.
         transform *= Affine.scale(x_sampling, y_sampling)
 
-    # Most of the time, we'll use the valid data mask.
-    # We skip reading it if we're extracting every possible
-    # feature (even invalid data features) from a band.
-    if not band or (band and not as_mask and not with_nodata):
-        if sampling == 1:
-            msk = src.read_masks(bidx)
-        else:
-            msk_shape = shape
+    def read_arrays(window=None):
+        img = None
+        msk = None
+
+        # Most of the time, we'll use the valid data mask.
+        # We skip reading it if we're extracting every possible
+        # feature (even invalid data features) from a band.
+        if not band or (band and not as_mask and not with_nodata):
+            if sampling == 1:
+                msk = src.read_masks(bidx, window=window)
+            else:
+                msk_shape = shape
+                if bidx is None:
+                    msk = np.zeros(
+                        (src.count,) + msk_shape, 'uint8')
+                else:
+                    msk = np.zeros(msk_shape, 'uint8')
+                msk = src.read_masks(bidx, msk)
+
             if bidx is None:
-                msk = np.zeros(
-                    (src.count,) + msk_shape, 'uint8')
+                msk = np.logical_or.reduce(msk).astype('uint8')
+
+            # Possibly overridden below.
+            img = msk
+
+        # Read the band data unless the --mask option is given.
+        if band:
+            if sampling == 1:
+                img = src.read(bidx, masked=False, window=window)
             else:
-                msk = np.zeros(msk_shape, 'uint8')
-            msk = src.read_masks(bidx, msk)
+                img = np.zeros(
+                    shape,
+                    dtype=src.dtypes[src.indexes.index(bidx)])
+                img = src.read(bidx, img, masked=False)
+
+        # If as_mask option was given, convert the image
+        # to a binary image. This reduces the number of shape
+        # categories to 2 and likely reduces the number of
+        # shapes.
+        if as_mask:
+            tmp = np.ones_like(img, 'uint8') * 255
+            tmp[img == 0] = 0
+            img = tmp
+            if not with_nodata:
+                msk = tmp
+
+        if with_nodata:
+            msk = None
+
+        return img, msk
+
+    if strip_height is None:
+        img, msk = read_arrays()
+        features = rasterio.features.shapes(
+            img, mask=msk, transform=transform)
 
-        if bidx is None:
-            msk = np.logical_or.reduce(msk).astype('uint8')
+    else:
+        if strip_height < 1:
+            raise ValueError("strip_height must be a positive integer")
 
-        # Possibly overridden below.
-        img = msk
+        def strips():
+            for row_off in range(0, src.height, strip_height):
+                window = Window(0, row_off, src.width,
+                                min(strip_height, src.height - row_off))
+                img, msk = read_arrays(window)
+                yield row_off, img, msk
 
-    # Read the band data unless the --mask option is given.
-    if band:
-        if sampling == 1:
-            img = src.read(bidx, masked=False)
-        else:
-            img = np.zeros(
-                shape,
-                dtype=src.dtypes[src.indexes.index(bidx)])
-            img = src.read(bidx, img, masked=False)
-
-    # If as_mask option was given, convert the image
-    # to a binary image. This reduces the number of shape
-    # categories to 2 and likely reduces the number of
-    # shapes.
-    if as_mask:
-        tmp = np.ones_like(img, 'uint8') * 255
-        tmp[img == 0] = 0
-        img = tmp
-        if not with_nodata:
-            msk = tmp
-
-    # Prepare keyword arguments for shapes().
-    kwargs = {'transform': transform}
-    if not with_nodata:
-        kwargs['mask'] = msk
+        features = _polygonize_strips(strips(), src.height, 4, transform)
 
     src_basename = os.path.basename(src.name)
 
     # Yield GeoJSON features.
-    for i, (g, val) in enumerate(
-            rasterio.features.shapes(img, **kwargs)):
+    for i, (g, val) in enumerate(features):
         if geographic:
             g = warp.transform_geom(
                 src.crs, 'EPSG:4326', g,
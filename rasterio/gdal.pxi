@@ -6,6 +6,7 @@ from libc.stdio cimport FILE
 cdef extern from "cpl_conv.h" nogil:
 
     void *CPLMalloc(size_t)
+    void *CPLRealloc(void *ptr, size_t)
     void CPLFree(void* ptr)
     void CPLSetThreadLocalConfigOption(const char* key, const char* val)
     void CPLSetConfigOption(const char* key, const char* val)
@@ -50,7 +51,7 @@ cdef extern from "cpl_string.h" nogil:
 
 cdef extern from "cpl_vsi.h" nogil:
 
-    ctypedef int vsi_l_offset
+    ctypedef unsigned long long vsi_l_offset
     ctypedef FILE VSILFILE
 
     unsigned char *VSIGetMemFileBuffer(const char *path,
@@ -210,6 +211,7 @@ cdef extern from "gdal.h" nogil:
     int GDALSetProjection(GDALDatasetH hds, const char *wkt)
     void GDALGetBlockSize(GDALRasterBandH , int *xsize, int *ysize)
     int GDALGetRasterDataType(GDALRasterBandH band)
+    int GDALGetDataTypeSize(GDALDataType dtype)
     double GDALGetRasterNoDataValue(GDALRasterBandH band, int *success)
     int GDALSetRasterNoDataValue(GDALRasterBandH band, double value)
     int GDALDatasetRasterIO(GDALRasterBandH band, int, int xoff, int yoff,
@@ -219,6 +221,10 @@ cdef extern from "gdal.h" nogil:
     int GDALRasterIO(GDALRasterBandH band, int, int xoff, int yoff, int xsize,
                      int ysize, void *buffer, int width, int height, int,
                      int poff, int loff)
+    int GDALDatasetAdviseRead(GDALDatasetH hds, int xoff, int yoff,
+                              int xsize, int ysize, int bufxsize,
+                              int bufysize, GDALDataType datatype, int count,
+                              int *bmap, char **options)
     int GDALFillRaster(GDALRasterBandH band, double rvalue, double ivalue)
     GDALDatasetH GDALCreate(GDALDriverH driver, const char *path, int width,
                             int height, int nbands, GDALDataType dtype,
@@ -244,6 +250,8 @@ cdef extern from "gdal.h" nogil:
     int GDALGetRasterColorInterpretation(GDALRasterBandH band)
     int GDALSetRasterColorInterpretation(GDALRasterBandH band, GDALColorInterp)
     int GDALGetMaskFlags(GDALRasterBandH band)
+    enum:
+        GMF_PER_DATASET
     int GDALCreateDatasetMaskBand(GDALDatasetH hds, int flags)
     void *GDALGetMaskBand(GDALRasterBandH band)
     int GDALCreateMaskBand(GDALDatasetH hds, int flags)
@@ -350,13 +358,18 @@ cdef extern from "ogr_api.h" nogil:
     OGRErr OGR_G_AddGeometryDirectly(OGRGeometryH geometry, OGRGeometryH part)
     void OGR_G_AddPoint(OGRGeometryH geometry, double x, double y, double z)
     void OGR_G_AddPoint_2D(OGRGeometryH geometry, double x, double y)
+    OGRGeometryH OGR_G_Clone(OGRGeometryH geometry)
     void OGR_G_CloseRings(OGRGeometryH geometry)
+    OGRErr OGR_G_CreateFromWkb(unsigned char *bytes,
+                               OGRSpatialReferenceH srs,
+                               OGRGeometryH *geometry, int nbytes)
     OGRGeometryH OGR_G_CreateGeometry(int wkbtypecode)
     OGRGeometryH OGR_G_CreateGeometryFromJson(const char *json)
     void OGR_G_DestroyGeometry(OGRGeometryH geometry)
     char *OGR_G_ExportToJson(OGRGeometryH geometry)
     void OGR_G_ExportToWkb(OGRGeometryH geometry, int endianness, char *buffer)
     int OGR_G_GetCoordinateDimension(OGRGeometryH geometry)
+    void OGR_G_GetEnvelope(OGRGeometryH geometry, OGREnvelope *envelope)
     int OGR_G_GetGeometryCount(OGRGeometryH geometry)
     const char *OGR_G_GetGeometryName(OGRGeometryH geometry)
     int OGR_G_GetGeometryType(OGRGeometryH geometry)
@@ -367,6 +380,10 @@ cdef extern from "ogr_api.h" nogil:
     double OGR_G_GetZ(OGRGeometryH geometry, int n)
     void OGR_G_ImportFromWkb(OGRGeometryH geometry, unsigned char *bytes,
                              int nbytes)
+    void OGR_G_SetPoint(OGRGeometryH geometry, int i, double x, double y,
+                        double z)
+    void OGR_G_SetPoint_2D(OGRGeometryH geometry, int i, double x, double y)
+    void OGR_G_SetPointCount(OGRGeometryH geometry, int n)
     int OGR_G_WkbSize(OGRGeometryH geometry)
     OGRErr OGR_L_CreateFeature(OGRLayerH layer, OGRFeatureH feature)
     int OGR_L_CreateField(OGRLayerH layer, OGRFieldDefnH, int flexible)
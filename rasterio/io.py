@@ -9,7 +9,7 @@ from rasterio._base import (
     get_dataset_driver, driver_can_create, driver_can_create_copy)
 from rasterio._io import (
     DatasetReaderBase, DatasetWriterBase, BufferedDatasetWriterBase,
-    MemoryFileBase)
+    MemoryFileBase, CancellationToken)
 from rasterio.windows import WindowMethodsMixin
 from rasterio.env import ensure_env, env_ctx_if_needed
 from rasterio.transform import TransformMethodsMixin
@@ -46,6 +46,11 @@ class BufferedDatasetWriter(BufferedDatasetWriterBase, WindowMethodsMixin,
 
     This allows incremental updates to datasets using formats that don't
     otherwise support updates, such as JPEG.
+
+    The buffer is a MEM dataset by default. With `buffer_driver='GTiff'`
+    it is a temporary tiled GeoTIFF instead, in /vsimem or, if larger
+    than `buffer_memory_limit`, on disk. A `progress` function or
+    CancellationToken is given the completed fraction of the final copy.
     """
 
     def __repr__(self):
@@ -62,6 +67,12 @@ class MemoryFile(MemoryFileBase):
     MemoryFile created without initial bytes may be written to using
     either file-like or dataset interfaces.
 
+    Initial bytes given as bytes, bytearray, mmap, or any other
+    contiguous buffer are adopted without being copied, and
+    `getbuffer()` returns a memoryview of the file that shares its
+    memory. Writing to a MemoryFile that adopted a caller's buffer
+    first copies the buffer, so the caller's object is never modified.
+
     Examples
     --------
 
@@ -85,24 +96,67 @@ class MemoryFile(MemoryFileBase):
      'width': 791}
 
     """
-    def __init__(self, file_or_bytes=None, filename=None, ext=''):
+    def __init__(self, file_or_bytes=None, filename=None, ext='',
+                 capacity=None):
         """Create a new file in memory
 
         Parameters
         ----------
-        file_or_bytes : file-like object or bytes, optional
-            File or bytes holding initial data.
+        file_or_bytes : file-like object or bytes-like object, optional
+            File or buffer holding initial data. Buffers are adopted
+            without copying.
         filename : str, optional
             An optional filename. A unique one will otherwise be generated.
         ext : str, optional
             An optional extension.
+        capacity : int, optional
+            Number of bytes to allocate at the first write. Ignored if
+            there is initial data.
 
         Returns
         -------
         MemoryFile
         """
         super(MemoryFile, self).__init__(
-            file_or_bytes=file_or_bytes, filename=filename, ext=ext)
+            file_or_bytes=file_or_bytes, filename=filename, ext=ext,
+            capacity=capacity)
+
+    @classmethod
+    def from_stream(cls, chunks, capacity=None, filename=None, ext=''):
+        """Create a new file in memory from an iterable of chunks
+
+        The chunks are written in order through a single open handle
+        and the file is positioned at its start when they are
+        exhausted.
+
+        Parameters
+        ----------
+        chunks : iterable of bytes-like objects
+            Bytes, bytearrays, or memoryviews, such as the chunks of an
+            HTTP response body.
+        capacity : int, optional
+            The expected total size of the file in bytes, such as the
+            value of a Content-Length header. The file is allocated
+            once with this capacity and grows beyond it if needed.
+        filename : str, optional
+            An optional filename. A unique one will otherwise be generated.
+        ext : str, optional
+            An optional extension.
+
+        Returns
+        -------
+        MemoryFile
+
+        """
+        memfile = cls(filename=filename, ext=ext, capacity=capacity)
+        try:
+            for chunk in chunks:
+                memfile.write(chunk)
+        except Exception:
+            memfile.close()
+            raise
+        memfile.seek(0)
+        return memfile
 
     @ensure_env
     def open(self, driver=None, width=None, height=None, count=None, crs=None,
@@ -7,15 +7,19 @@ import warnings
 
 import numpy as np
 
+import rasterio
 from rasterio import windows
+from rasterio.compat import string_types
 from rasterio.enums import Resampling
+from rasterio.metacache import DatasetMetadata
 from rasterio.transform import Affine
 
 
 logger = logging.getLogger(__name__)
 
 
-def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=None):
+def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=None,
+          metadata_cache=None):
     """Copy valid pixels from input files to an output file.
 
     All files must have the same number of bands, data type, and
@@ -31,8 +35,10 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
 
     Parameters
     ----------
-    datasets: list of dataset objects opened in 'r' mode
-        source datasets to be merged.
+    datasets: list of dataset objects opened in 'r' mode or paths
+        source datasets to be merged. Datasets given by path are only
+        opened to read their pixels, and only if they intersect the
+        output bounds.
     bounds: tuple, optional
         Bounds of the output image (left, bottom, right, top).
         If not set, bounds are determined from bounds of input rasters.
@@ -47,6 +53,9 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
         Number of decimal points of precision when computing inverse transform.
     indexes : list of ints or a single int, optional
         bands to read and merge
+    metadata_cache : MetadataCache, optional
+        A cache consulted for the metadata of datasets given by path.
+        Without one, these datasets are opened to get their metadata.
 
     Returns
     -------
@@ -61,7 +70,10 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
                 Information for mapping pixel coordinates in `dest` to another
                 coordinate system
     """
-    first = datasets[0]
+    sources = [_source_metadata(dataset, metadata_cache)
+               for dataset in datasets]
+
+    first = sources[0]
     first_res = first.res
     nodataval = first.nodatavals[0]
     dtype = first.dtypes[0]
@@ -81,7 +93,7 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
         # scan input files
         xs = []
         ys = []
-        for src in datasets:
+        for src in sources:
             left, bottom, right, top = src.bounds
             xs.extend([left, right])
             ys.extend([bottom, top])
@@ -141,7 +153,7 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
     else:
         nodataval = 0
 
-    for src in datasets:
+    for dataset, src in zip(datasets, sources):
         # Real World (tm) use of boundless reads.
         # This approach uses the maximum amount of memory to solve the
         # problem. Making it more efficient is a TODO.
@@ -154,6 +166,10 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
         int_e = src_e if src_e < dst_e else dst_e
         int_n = src_n if src_n < dst_n else dst_n
 
+        if int_w >= int_e or int_s >= int_n:
+            logger.debug("Src %s is outside output bounds", src.name)
+            continue
+
         # 2. Compute the source window
         src_window = windows.from_bounds(
             int_w, int_s, int_e, int_n, src.transform, precision=precision)
@@ -169,8 +185,13 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
         trows, tcols = (
             int(round(dst_window.height)), int(round(dst_window.width)))
         temp_shape = (output_count, trows, tcols)
-        temp = src.read(out_shape=temp_shape, window=src_window,
-                        boundless=False, masked=True, indexes=indexes)
+        read_kwds = dict(out_shape=temp_shape, window=src_window,
+                         boundless=False, masked=True, indexes=indexes)
+        if isinstance(dataset, string_types):
+            with rasterio.open(dataset) as opened:
+                temp = opened.read(**read_kwds)
+        else:
+            temp = dataset.read(**read_kwds)
 
         # 5. Copy elements of temp into dest
         roff, coff = (
@@ -187,3 +208,14 @@ def merge(datasets, bounds=None, res=None, nodata=None, precision=7, indexes=Non
         np.copyto(region, temp, where=mask)
 
     return dest, output_transform
+
+
+def _source_metadata(dataset, metadata_cache=None):
+    """Get an object with the metadata of a dataset or a path"""
+    if not isinstance(dataset, string_types):
+        return dataset
+    elif metadata_cache is not None:
+        return metadata_cache.metadata(dataset)
+    else:
+        with rasterio.open(dataset) as src:
+            return DatasetMetadata.from_dataset(src)
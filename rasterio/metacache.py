@@ -0,0 +1,281 @@
+"""An on-disk cache of dataset metadata.
+
+Opening a dataset reads its header, which for a GeoTIFF includes its
+image file directories and the WKT of its CRS. A MetadataCache stores
+what was read in a SQLite database so that questions about metadata,
+such as the bounds of thousands of files, can be answered later
+without opening them again.
+
+Entries are keyed by the absolute path of a local file and are stale
+as soon as its size or modification time changes. Datasets that are
+not local files are never cached.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from affine import Affine
+
+import rasterio
+from rasterio.coords import BoundingBox
+from rasterio.crs import CRS
+from rasterio.path import parse_path, ParsedPath
+from rasterio.profiles import Profile
+from rasterio.scan import FIELDS, dataset_info
+
+
+log = logging.getLogger(__name__)
+
+
+class DatasetMetadata(object):
+    """Metadata of a dataset, available without opening it
+
+    Attributes mirror those of dataset objects: `name`, `driver`,
+    `width`, `height`, `shape`, `count`, `indexes`, `dtypes`,
+    `nodata`, `nodatavals`, `crs`, `transform`, `bounds`, `res`,
+    `block_shapes`, `meta`, and `profile`.
+    """
+
+    def __init__(self, name, record):
+        """Create metadata from a record of dataset_info()
+
+        Parameters
+        ----------
+        name : str
+            The dataset's path.
+        record : dict
+            All the FIELDS of rasterio.scan.dataset_info().
+        """
+        self.name = name
+        self._record = record
+        self.driver = record['driver']
+        self.width = record['width']
+        self.height = record['height']
+        self.count = record['count']
+        self.dtypes = tuple(record['dtypes'])
+        self.nodata = record['nodata']
+        self.nodatavals = tuple(record['nodatavals'])
+        self.transform = Affine(*record['transform'])
+        self.bounds = BoundingBox(*record['bounds'])
+        self.res = tuple(record['res'])
+        self.block_shapes = [tuple(shape) for shape in record['block_shapes']]
+        if record['crs_wkt']:
+            self.crs = CRS.from_wkt(record['crs_wkt'])
+        else:
+            self.crs = None
+
+    def __repr__(self):
+        return "<DatasetMetadata name='{}'>".format(self.name)
+
+    @property
+    def shape(self):
+        return self.height, self.width
+
+    @property
+    def indexes(self):
+        return tuple(range(1, self.count + 1))
+
+    def overviews(self, bidx):
+        """The decimation factors of a band's overviews"""
+        return self._record['overviews'][bidx - 1]
+
+    def tags(self):
+        """The dataset's tags in the default namespace"""
+        return dict(self._record['tags'])
+
+    @property
+    def meta(self):
+        """The basic metadata of the dataset"""
+        return {
+            'driver': self.driver,
+            'dtype': self.dtypes[0] if self.count else 'float_',
+            'nodata': self.nodata,
+            'width': self.width,
+            'height': self.height,
+            'count': self.count,
+            'crs': self.crs,
+            'transform': self.transform}
+
+    @property
+    def profile(self):
+        """Basic metadata and creation options of the dataset"""
+        m = Profile(**self.meta)
+        block_height, block_width = (
+            self.block_shapes[0] if self.block_shapes else (0, 0))
+        if block_width < self.width and block_width <= 1024:
+            m.update(
+                blockxsize=block_width, blockysize=block_height, tiled=True)
+        else:
+            m.update(tiled=False)
+        if self._record['compress']:
+            m['compress'] = self._record['compress']
+        if self._record['interleave']:
+            m['interleave'] = self._record['interleave']
+        return m
+
+    @classmethod
+    def from_dataset(cls, src):
+        """Get the metadata of an opened dataset"""
+        return cls(src.name, dataset_info(src, FIELDS))
+
+
+class MetadataCache(object):
+    """An on-disk cache of dataset metadata
+
+    A MetadataCache may be shared by threads. Its database may be
+    shared by processes.
+
+    Examples
+    --------
+
+    >>> with MetadataCache('/tmp/rasterio-cache') as cache:
+    ...     cache.metadata('tests/data/RGB.byte.tif').bounds
+    ...
+    BoundingBox(left=101985.0, bottom=2611485.0, right=339315.0, top=2826915.0)
+
+    """
+
+    filename = 'rasterio-metadata.sqlite'
+
+    # Incremented when the format of records changes.
+    version = 1
+
+    def __init__(self, directory):
+        """Open or create a cache
+
+        Parameters
+        ----------
+        directory : str
+            A directory for the cache's database. It is created if it
+            doesn't exist.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = os.path.join(directory, self.filename)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None,
+            timeout=30.0)
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.version:
+                self._conn.execute("DROP TABLE IF EXISTS metadata")
+                self._conn.execute(
+                    "PRAGMA user_version={:d}".format(self.version))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, "
+                "record TEXT)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the cache's database"""
+        self._conn.close()
+
+    @staticmethod
+    def _key(path):
+        """Absolute path, size and mtime of a local file or None"""
+        parsed = parse_path(path)
+        if not isinstance(parsed, ParsedPath) or not parsed.is_local:
+            return None
+        if parsed.archive or not os.path.isfile(parsed.path):
+            return None
+        stat = os.stat(parsed.path)
+        return os.path.abspath(parsed.path), stat.st_size, stat.st_mtime
+
+    def get(self, path):
+        """Get the cached metadata of a dataset
+
+        Parameters
+        ----------
+        path : str
+            The dataset's path.
+
+        Returns
+        -------
+        DatasetMetadata or None
+            None if the dataset's metadata isn't cached or is stale.
+        """
+        key = self._key(path)
+        if key is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime, record FROM metadata WHERE path = ?",
+                (key[0],)).fetchone()
+
+        if row is None or (row[0], row[1]) != key[1:]:
+            return None
+        return DatasetMetadata(path, json.loads(row[2]))
+
+    def put(self, path, src):
+        """Cache the metadata of a dataset
+
+        Parameters
+        ----------
+        path : str
+            The dataset's path.
+        src : dataset object opened in 'r' mode
+            The dataset.
+
+        Returns
+        -------
+        DatasetMetadata
+        """
+        metadata = DatasetMetadata(path, dataset_info(src, FIELDS))
+        key = self._key(path)
+        if key is not None:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)",
+                    key + (json.dumps(metadata._record),))
+        return metadata
+
+    def metadata(self, path):
+        """Get the metadata of a dataset, opening it only if needed
+
+        Parameters
+        ----------
+        path : str
+            The dataset's path.
+
+        Returns
+        -------
+        DatasetMetadata
+        """
+        metadata = self.get(path)
+        if metadata is None:
+            log.debug("Metadata cache miss: %r", path)
+            with rasterio.open(path) as src:
+                metadata = self.put(path, src)
+        return metadata
+
+    def invalidate(self, path):
+        """Remove the cached metadata of a dataset"""
+        key = self._key(path)
+        if key is not None:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE path = ?", (key[0],))
+
+    def clear(self):
+        """Remove all cached metadata"""
+        with self._lock:
+            self._conn.execute("DELETE FROM metadata")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM metadata").fetchone()[0]
@@ -10,6 +10,7 @@ from cligj import (
 
 from .helpers import write_features, to_lower
 import rasterio
+from rasterio.metacache import MetadataCache
 from rasterio.rio import options
 from rasterio.warp import transform_bounds
 
@@ -32,13 +33,14 @@ logger = logging.getLogger(__name__)
     '--dst-crs', default='', metavar="EPSG:NNNN", callback=to_lower,
     help="Output in specified coordinates.")
 @options.sequence_opt
+@options.metadata_cache_opt
 @use_rs_opt
 @geojson_type_collection_opt(True)
 @geojson_type_feature_opt(False)
 @geojson_type_bbox_opt(False)
 @click.pass_context
 def bounds(ctx, input, precision, indent, compact, projection, dst_crs,
-           sequence, use_rs, geojson_type):
+           sequence, metadata_cache, use_rs, geojson_type):
     """Write bounding boxes to stdout as GeoJSON for use with, e.g.,
     geojsonio
 
@@ -46,6 +48,9 @@ def bounds(ctx, input, precision, indent, compact, projection, dst_crs,
 
     If a destination crs is passed via dst_crs, it takes precedence over
     the projection parameter.
+
+    With --metadata-cache, the bounds of files that are unchanged since
+    they were cached are found without opening them.
     """
     import rasterio.warp
     dump_kwds = {'sort_keys': True}
@@ -58,10 +63,11 @@ def bounds(ctx, input, precision, indent, compact, projection, dst_crs,
     # This is the generator for (feature, bbox) pairs.
     class Collection(object):
 
-        def __init__(self, env):
+        def __init__(self, env, cache=None):
             self._xs = []
             self._ys = []
             self.env = env
+            self.cache = cache
 
         @property
         def bbox(self):
@@ -69,19 +75,23 @@ def bounds(ctx, input, precision, indent, compact, projection, dst_crs,
 
         def __call__(self):
             for i, path in enumerate(input):
-                with rasterio.open(path) as src:
-                    bounds = src.bounds
-                    if dst_crs:
-                        bbox = transform_bounds(src.crs,
-                                                dst_crs, *bounds)
-                    elif projection == 'mercator':
-                        bbox = transform_bounds(src.crs,
-                                                {'init': 'epsg:3857'}, *bounds)
-                    elif projection == 'geographic':
-                        bbox = transform_bounds(src.crs,
-                                                {'init': 'epsg:4326'}, *bounds)
-                    else:
-                        bbox = bounds
+                if self.cache is not None:
+                    src = self.cache.metadata(path)
+                    src_crs, bounds = src.crs, src.bounds
+                else:
+                    with rasterio.open(path) as src:
+                        src_crs, bounds = src.crs, src.bounds
+
+                if dst_crs:
+                    bbox = transform_bounds(src_crs, dst_crs, *bounds)
+                elif projection == 'mercator':
+                    bbox = transform_bounds(
+                        src_crs, {'init': 'epsg:3857'}, *bounds)
+                elif projection == 'geographic':
+                    bbox = transform_bounds(
+                        src_crs, {'init': 'epsg:4326'}, *bounds)
+                else:
+                    bbox = bounds
 
                 if precision >= 0:
                     bbox = [round(b, precision) for b in bbox]
@@ -107,10 +117,15 @@ def bounds(ctx, input, precision, indent, compact, projection, dst_crs,
 
     try:
         with ctx.obj['env'] as env:
-            write_features(
-                stdout, Collection(env), sequence=sequence,
-                geojson_type=geojson_type, use_rs=use_rs,
-                **dump_kwds)
+            cache = MetadataCache(metadata_cache) if metadata_cache else None
+            try:
+                write_features(
+                    stdout, Collection(env, cache), sequence=sequence,
+                    geojson_type=geojson_type, use_rs=use_rs,
+                    **dump_kwds)
+            finally:
+                if cache is not None:
+                    cache.close()
 
     except Exception:
         logger.exception("Exception caught during processing")
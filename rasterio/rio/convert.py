@@ -73,21 +73,20 @@ def convert(
 
             with rasterio.open(outputfile, 'w', **profile) as dst:
 
-                data = src.read()
-
-                if scale_ratio:
-                    # Cast to float64 before multiplying.
-                    data = data.astype('float64', casting='unsafe', copy=False)
-                    np.multiply(
-                        data, scale_ratio, out=data, casting='unsafe')
-
-                if scale_offset:
-                    # My understanding of copy=False is that this is a
-                    # no-op if the array was cast for multiplication.
-                    data = data.astype('float64', casting='unsafe', copy=False)
-                    np.add(
-                        data, scale_offset, out=data, casting='unsafe')
-
-                # Cast to the output dtype and write.
-                result = data.astype(dst_dtype, casting='unsafe', copy=False)
-                dst.write(result)
+                if scale_ratio or scale_offset:
+                    # Read as float64 before scaling.
+                    data = src.read(out_dtype='float64')
+                    if scale_ratio:
+                        np.multiply(data, scale_ratio, out=data)
+                    if scale_offset:
+                        np.add(data, scale_offset, out=data)
+                else:
+                    data = src.read()
+
+                # GDAL converts the data to the output dtype while
+                # writing. It rounds floats converted to integers, so
+                # they are first truncated as they would be by numpy.
+                if (data.dtype.kind == 'f' and
+                        np.dtype(dst_dtype).kind in ('i', 'u')):
+                    np.trunc(data, out=data)
+                dst.write(data)
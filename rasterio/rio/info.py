@@ -1,16 +1,21 @@
 """Command access to dataset metadata, stats, and more."""
 
 
+import csv
 import json
 
 import click
 
 import rasterio
+from rasterio.compat import string_types
 from rasterio.rio import options
+from rasterio.scan import FIELDS, scan_metadata
+from rasterio.stats import _Moments, _chunk_windows
+from rasterio.windows import Window
 
 
 @click.command(short_help="Print information about a data file.")
-@options.file_in_arg
+@click.argument('INPUT')
 @click.option('--meta', 'aspect', flag_value='meta', default=True,
               help="Show data file structure (default).")
 @click.option('--tags', 'aspect', flag_value='tags',
@@ -53,15 +58,45 @@ from rasterio.rio import options
               help="Print subdataset identifiers.")
 @click.option('-v', '--tell-me-more', '--verbose', 'verbose', is_flag=True,
               help="Output extra information.")
+@click.option('--batch', is_flag=True,
+              help="Read the paths of many datasets from INPUT, a text "
+                   "file with one path per line or - for stdin, and print "
+                   "a record of metadata for each.")
+@click.option('--fields', default=None,
+              help="Comma-separated metadata fields of --batch records. "
+                   "Default: {}.".format(','.join(FIELDS)))
+@click.option('--batch-format', type=click.Choice(['ndjson', 'csv']),
+              default='ndjson',
+              help="Format of --batch records: newline-delimited JSON "
+                   "(default) or CSV with JSON values.")
+@click.option('--threads', type=int, default=1,
+              help="Number of threads opening datasets in --batch mode.")
 @options.bidx_opt
 @options.masked_opt
 @click.pass_context
 def info(ctx, input, aspect, indent, namespace, meta_member, verbose, bidx,
-         masked):
+         masked, batch, fields, batch_format, threads):
     """Print metadata about the dataset as JSON.
 
     Optionally print a single metadata item as a string.
+
+    With --batch, INPUT lists datasets, one per line, and a record of
+    metadata is printed for each as soon as it is ready, in the order
+    of INPUT. Datasets are opened concurrently if --threads is greater
+    than 1. A dataset that can't be opened doesn't stop the batch: its
+    record has an "error" field instead of metadata.
+
+    \b
+      find /data -name '*.tif' | rio info --batch - --threads 8 > catalog.json
     """
+    if batch:
+        with ctx.obj['env']:
+            batch_info(input, fields, batch_format, threads,
+                       env=ctx.obj['env'])
+        return
+
+    input = options.file_in_handler(ctx, None, input)
+
     with ctx.obj['env'], rasterio.open(input) as src:
 
         info = dict(src.profile)
@@ -102,11 +137,9 @@ def info(ctx, input, aspect, indent, namespace, meta_member, verbose, bidx,
                 info['gcps']['crs'] = None
 
         if verbose:
-            stats = [{'min': float(b.min()),
-                      'max': float(b.max()),
-                      'mean': float(b.mean())
-                      } for b in src.read(masked=masked)]
-            info['stats'] = stats
+            info['stats'] = [
+                dict(zip(('min', 'max', 'mean'), _band_stats(src, i, masked)))
+                for i in src.indexes]
             info['checksum'] = [src.checksum(i) for i in src.indexes]
 
         if aspect == 'meta':
@@ -114,11 +147,7 @@ def info(ctx, input, aspect, indent, namespace, meta_member, verbose, bidx,
                 for name in src.subdatasets:
                     click.echo(name)
             elif meta_member == 'stats':
-                band = src.read(bidx, masked=masked)
-                click.echo('%f %f %f' % (
-                    float(band.min()),
-                    float(band.max()),
-                    float(band.mean())))
+                click.echo('%f %f %f' % _band_stats(src, bidx, masked))
             elif meta_member == 'checksum':
                 click.echo(str(src.checksum(bidx)))
             elif meta_member:
@@ -132,3 +161,75 @@ def info(ctx, input, aspect, indent, namespace, meta_member, verbose, bidx,
         elif aspect == 'tags':
             click.echo(
                 json.dumps(src.tags(ns=namespace), indent=indent))
+
+
+def _band_stats(src, bidx, masked):
+    """Min, max, and mean of a band, read one chunk at a time
+
+    Unless masked, nodata pixels are included.
+    """
+    if masked:
+        stats = src.statistics(bidx)
+    else:
+        moments = _Moments()
+        window = Window(0, 0, src.width, src.height)
+        for chunk in _chunk_windows(window, src.block_shapes[bidx - 1]):
+            moments.update(_Moments.from_array(src.read(bidx, window=chunk)))
+        stats = moments.statistics()
+    if not stats.count:
+        return (float('nan'),) * 3
+    return float(stats.min), float(stats.max), float(stats.mean)
+
+
+class _EchoWriter(object):
+    """A file-like object that writes with click.echo"""
+
+    def write(self, text):
+        click.echo(text, nl=False)
+
+
+def _csv_value(value):
+    """CSV cells hold strings as is and other values as JSON"""
+    if value is None:
+        return ''
+    elif isinstance(value, string_types):
+        return value
+    else:
+        return json.dumps(value, sort_keys=True)
+
+
+def batch_info(input, fields, batch_format, threads, env=None):
+    """Print records of metadata for the datasets listed in input
+
+    The datasets are opened within env, if given, in every thread.
+    """
+    if fields:
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in FIELDS]
+        if unknown:
+            raise click.BadParameter(
+                "Unknown fields {}".format(','.join(unknown)),
+                param_hint='--fields')
+    else:
+        fields = list(FIELDS)
+
+    if threads < 1:
+        raise click.BadParameter(
+            "Must be at least 1", param_hint='--threads')
+
+    with click.open_file(input) as f:
+        paths = (line.strip() for line in f)
+        records = scan_metadata(
+            (path for path in paths if path), fields=fields,
+            num_threads=threads, env=env)
+
+        if batch_format == 'csv':
+            columns = ['path'] + fields + ['error']
+            writer = csv.writer(_EchoWriter(), lineterminator='\n')
+            writer.writerow(columns)
+            for record in records:
+                writer.writerow(
+                    [_csv_value(record.get(name)) for name in columns])
+        else:
+            for record in records:
+                click.echo(json.dumps(record, sort_keys=True))
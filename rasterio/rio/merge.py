@@ -5,6 +5,7 @@ import click
 from cligj import format_opt
 
 import rasterio
+from rasterio.metacache import MetadataCache
 from rasterio.rio import options
 from rasterio.rio.helpers import resolve_inout
 
@@ -21,10 +22,11 @@ from rasterio.rio.helpers import resolve_inout
 @click.option('--precision', type=int, default=7,
               help="Number of decimal places of precision in alignment of "
                    "pixels")
+@options.metadata_cache_opt
 @options.creation_options
 @click.pass_context
 def merge(ctx, files, output, driver, bounds, res, nodata, bidx, overwrite,
-          precision, creation_options):
+          precision, metadata_cache, creation_options):
     """Copy valid pixels from input files to an output file.
 
     All files must have the same number of bands, data type, and
@@ -38,6 +40,9 @@ def merge(ctx, files, output, driver, bounds, res, nodata, bidx, overwrite,
     units of the input file coordinate reference system may be provided
     and are otherwise taken from the first input file.
 
+    With --metadata-cache, input files are opened only to read pixels
+    and only if they intersect the output bounds.
+
     Note: --res changed from 2 parameters in 0.25.
 
     \b
@@ -49,13 +54,30 @@ def merge(ctx, files, output, driver, bounds, res, nodata, bidx, overwrite,
     output, files = resolve_inout(
         files=files, output=output, overwrite=overwrite)
 
+    merge_kwds = dict(bounds=bounds, res=res, nodata=nodata,
+                      precision=precision, indexes=(bidx or None))
+
     with ctx.obj['env']:
-        datasets = [rasterio.open(f) for f in files]
-        dest, output_transform = merge_tool(datasets, bounds=bounds, res=res,
-                                            nodata=nodata, precision=precision,
-                                            indexes=(bidx or None))
+        if metadata_cache:
+            with MetadataCache(metadata_cache) as cache:
+                dest, output_transform = merge_tool(
+                    files, metadata_cache=cache, **merge_kwds)
+        else:
+            datasets = [rasterio.open(f) for f in files]
+            try:
+                dest, output_transform = merge_tool(datasets, **merge_kwds)
+            finally:
+                for src in datasets:
+                    src.close()
+
+        # The profile and colormap of the first input raster are used.
+        with rasterio.open(files[0]) as first:
+            profile = first.profile
+            try:
+                colormap = first.colormap(1)
+            except ValueError:
+                colormap = None
 
-        profile = datasets[0].profile
         profile['transform'] = output_transform
         profile['height'] = dest.shape[1]
         profile['width'] = dest.shape[2]
@@ -70,9 +92,5 @@ def merge(ctx, files, output, driver, bounds, res, nodata, bidx, overwrite,
         with rasterio.open(output, 'w', **profile) as dst:
             dst.write(dest)
 
-            # uses the colormap in the first input raster.
-            try:
-                colormap = datasets[0].colormap(1)
+            if colormap is not None:
                 dst.write_colormap(1, colormap)
-            except ValueError:
-                pass
@@ -324,6 +324,13 @@ rgb_opt = click.option(
     default=False,
     help="Set RGB photometric interpretation.")
 
+metadata_cache_opt = click.option(
+    '--metadata-cache',
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory of a cache of input dataset metadata. Cached "
+         "metadata of unchanged files is used without opening them.")
+
 overwrite_opt = click.option(
     '--overwrite', 'overwrite',
     is_flag=True, type=bool, default=False,
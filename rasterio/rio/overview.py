@@ -40,8 +40,12 @@ def build_handler(ctx, param, value):
               type=click.Choice(
                   [it.name for it in Resampling if it.value in [0, 1, 2, 3, 4, 5, 6, 7]]),
               default='nearest', show_default=True)
+@click.option('--cascade', is_flag=True, default=False,
+              help="Compute each overview level from the previous level.")
+@click.option('--threads', type=int, default=1,
+              help="Number of threads computing cascaded overviews.")
 @click.pass_context
-def overview(ctx, input, build, ls, rebuild, resampling):
+def overview(ctx, input, build, ls, rebuild, resampling, cascade, threads):
     """Construct overviews in an existing dataset.
 
     A pyramid of overviews computed once and stored in the dataset can
@@ -60,12 +64,27 @@ def overview(ctx, input, build, ls, rebuild, resampling):
     automatically updated when the dataset's primary bands are
     modified.
 
+    Existing overviews can be reconstructed using the --rebuild option.
+
+      rio overview --rebuild
+
+    With the --cascade option, each overview level is computed from the
+    previous level instead of from the full resolution bands, which is
+    faster for large datasets but compounds resampling, and blocks are
+    computed in parallel if --threads is greater than 1.
+
+      rio overview --rebuild --cascade --threads 4
+
     Information about existing overviews can be printed using the --ls
     option.
 
       rio overview --ls
 
     """
+    if threads > 1 and not cascade:
+        raise click.BadParameter(
+            "requires --cascade.", param_hint="--threads")
+
     with ctx.obj['env']:
         if ls:
             with rasterio.open(input, 'r') as dst:
@@ -87,12 +106,24 @@ def overview(ctx, input, build, ls, rebuild, resampling):
                 resampling_method = dst.tags(
                     ns='rio_overview').get('resampling') or resampling
 
-                dst.build_overviews(
-                    list(factors), Resampling[resampling_method])
+                # When cascading, bands sharing the same overviews are
+                # updated in place, level by level. Otherwise the
+                # missing levels are built first.
+                if cascade and all(sorted(factors) == sorted(dst.overviews(i))
+                                   for i in dst.indexes):
+                    dst.update_overviews(
+                        resampling=Resampling[resampling_method],
+                        num_threads=threads)
+                else:
+                    dst.build_overviews(
+                        list(factors), Resampling[resampling_method],
+                        cascade=cascade, num_threads=threads)
 
         elif build:
             with rasterio.open(input, 'r+') as dst:
-                dst.build_overviews(build, Resampling[resampling])
+                dst.build_overviews(
+                    build, Resampling[resampling], cascade=cascade,
+                    num_threads=threads)
 
                 # Save the resampling method to a tag.
                 dst.update_tags(ns='rio_overview', resampling=resampling)
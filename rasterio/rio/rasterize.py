@@ -57,6 +57,11 @@ files_inout_arg = click.argument(
 @click.option('--property', 'prop', type=str, default=None, help='Property in '
               'GeoJSON features to use for rasterized values.  Any features '
               'that lack this property will be given --default_value instead.')
+@click.option('--by-block', is_flag=True, default=False,
+              help='Rasterize the output one block at a time instead of '
+              'holding all of it in memory.')
+@click.option('--threads', type=int, default=1,
+              help='Number of processing threads used with --by-block.')
 @options.overwrite_opt
 @options.nodata_opt
 @options.creation_options
@@ -75,6 +80,8 @@ def rasterize(
         default_value,
         fill,
         prop,
+        by_block,
+        threads,
         overwrite,
         nodata,
         creation_options):
@@ -110,6 +117,11 @@ def rasterize(
     If --res is provided, the bottom and right coordinates of bounds are
     ignored.
 
+    Outputs too large to be held in memory can be rasterized block by
+    block with --by-block. Only the features that intersect a block are
+    burned into it, by as many threads as --threads. New GeoTIFF
+    outputs are tiled unless the creation options say otherwise.
+
     Note
     ----
 
@@ -120,7 +132,8 @@ def rasterize(
     """
 
     from rasterio.crs import CRS
-    from rasterio.features import rasterize
+    from rasterio.dtypes import get_minimum_dtype
+    from rasterio.features import rasterize, rasterize_blocks
     from rasterio.features import bounds as calculate_bounds
 
     output, files = resolve_inout(
@@ -177,6 +190,21 @@ def rasterize(
 
                 meta = out.meta
 
+                if by_block:
+                    # As below, pixels burned with values other than
+                    # the fill value replace existing pixels.
+                    for bidx in range(1, meta['count'] + 1):
+                        rasterize_blocks(
+                            geometries,
+                            out,
+                            bidx=bidx,
+                            fill=fill,
+                            all_touched=all_touched,
+                            default_value=default_value,
+                            num_threads=threads,
+                            overlay=True)
+                    return
+
                 result = rasterize(
                     geometries,
                     out_shape=(meta['height'], meta['width']),
@@ -263,6 +291,24 @@ def rasterize(
             if nodata is not None:
                 kwargs['nodata'] = nodata
 
+            if by_block:
+                if 'dtype' not in kwargs:
+                    values = [value for geom, value in geometries]
+                    kwargs['dtype'] = get_minimum_dtype(values + [fill])
+
+                if kwargs['driver'] == 'GTiff':
+                    kwargs.setdefault('tiled', True)
+
+                with rasterio.open(output, 'w', **kwargs) as out:
+                    rasterize_blocks(
+                        geometries,
+                        out,
+                        fill=fill,
+                        all_touched=all_touched,
+                        default_value=default_value,
+                        num_threads=threads)
+                return
+
             result = rasterize(
                 geometries,
                 out_shape=(kwargs['height'], kwargs['width']),
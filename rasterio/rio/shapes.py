@@ -40,10 +40,14 @@ logger = logging.getLogger(__name__)
 @click.option('--as-mask/--not-as-mask', default=False,
               help="Interpret a band as a mask and output only one class of "
                    "valid data shapes.")
+@click.option('--strip-height', type=int, default=None,
+              help="Read and polygonize the dataset in strips of this many "
+                   "rows to limit memory use.")
 @click.pass_context
 def shapes(
         ctx, input, output, precision, indent, compact, projection, sequence,
-        use_rs, geojson_type, band, bandidx, sampling, with_nodata, as_mask):
+        use_rs, geojson_type, band, bandidx, sampling, with_nodata, as_mask,
+        strip_height):
     """Extracts shapes from one band or mask of a dataset and writes
     them out as GeoJSON. Unless otherwise specified, the shapes will be
     transformed to WGS 84 coordinates.
@@ -71,6 +75,12 @@ def shapes(
     the `--as-mask` option:
 
       $ rio shapes --as-mask --bidx 1 tests/data/RGB.byte.tif
+
+    Datasets too large to be read into memory at once can be processed
+    in strips of rows with the `--strip-height` option. Shapes that
+    cross the boundaries between strips are stitched together:
+
+      $ rio shapes --strip-height 256 tests/data/RGB.byte.tif
     """
     # These import numpy, which we don't want to do unless it's needed.
     dump_kwds = {'sort_keys': True}
@@ -101,7 +111,8 @@ def shapes(
                         as_mask=as_mask,
                         with_nodata=with_nodata,
                         geographic=geographic,
-                        precision=precision),
+                        precision=precision,
+                        strip_height=strip_height),
                     sequence=sequence,
                     geojson_type=geojson_type, use_rs=use_rs,
                     **dump_kwds)
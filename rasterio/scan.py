@@ -0,0 +1,173 @@
+"""Bulk scanning of dataset metadata."""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import rasterio
+from rasterio.env import getenv, hasenv
+
+
+log = logging.getLogger(__name__)
+
+
+def _crs(src):
+    if not src.crs:
+        return None
+    epsg = src.crs.to_epsg()
+    if epsg:
+        return 'EPSG:{}'.format(epsg)
+    return src.crs.to_wkt()
+
+
+def _compress(src):
+    compression = src.compression
+    return compression.name if compression else None
+
+
+def _interleave(src):
+    interleaving = src.interleaving
+    return interleaving.name if interleaving else None
+
+
+# Extractors of metadata fields, each returning a JSON-serializable
+# value.
+_EXTRACTORS = {
+    'driver': lambda src: src.driver,
+    'width': lambda src: src.width,
+    'height': lambda src: src.height,
+    'count': lambda src: src.count,
+    'dtype': lambda src: src.dtypes[0] if src.count else None,
+    'dtypes': lambda src: list(src.dtypes),
+    'nodata': lambda src: src.nodata,
+    'nodatavals': lambda src: list(src.nodatavals),
+    'crs': _crs,
+    'crs_wkt': lambda src: src.crs.to_wkt() if src.crs else None,
+    'transform': lambda src: list(src.transform)[:6],
+    'bounds': lambda src: list(src.bounds),
+    'res': lambda src: list(src.res),
+    'block_shapes': lambda src: [list(shape) for shape in src.block_shapes],
+    'overviews': lambda src: [src.overviews(i) for i in src.indexes],
+    'compress': _compress,
+    'interleave': _interleave,
+    'tags': lambda src: src.tags(),
+}
+
+FIELDS = (
+    'driver', 'width', 'height', 'count', 'dtype', 'dtypes', 'nodata',
+    'nodatavals', 'crs', 'crs_wkt', 'transform', 'bounds', 'res',
+    'block_shapes', 'overviews', 'compress', 'interleave', 'tags')
+
+
+def _check_fields(fields):
+    """Return a tuple of valid field names"""
+    if fields is None:
+        return FIELDS
+    fields = tuple(fields)
+    unknown = [name for name in fields if name not in _EXTRACTORS]
+    if unknown:
+        raise ValueError(
+            "Unknown metadata fields {}. Valid fields are {}".format(
+                unknown, list(FIELDS)))
+    return fields
+
+
+def dataset_info(src, fields=None):
+    """Get metadata fields of an opened dataset
+
+    Parameters
+    ----------
+    src : dataset object opened in 'r' mode
+        The dataset.
+    fields : sequence of str, optional
+        Names of the fields to get, by default all of those in
+        FIELDS.
+
+    Returns
+    -------
+    dict
+        JSON-serializable values keyed by field name. A CRS is
+        represented by its EPSG code, such as 'EPSG:4326', if it has
+        one, or else by its WKT.
+    """
+    return dict(
+        (name, _EXTRACTORS[name](src)) for name in _check_fields(fields))
+
+
+def _scan_one(path, fields, env=None):
+    """Open a dataset and get its metadata or the error that occurred
+
+    If env is given, the dataset is opened within an equivalent
+    environment, as is needed in a thread other than env's.
+    """
+    try:
+        if env is None:
+            with rasterio.open(path) as src:
+                record = dataset_info(src, fields)
+        else:
+            with rasterio.Env(session=env.session, **env.options):
+                with rasterio.open(path) as src:
+                    record = dataset_info(src, fields)
+    except Exception as err:
+        log.debug("Failed to scan %r: %r", path, err)
+        record = {'error': '{}: {}'.format(type(err).__name__, err)}
+    record['path'] = path
+    return record
+
+
+def scan_metadata(paths, fields=None, num_threads=1, env=None):
+    """Get the metadata of many datasets
+
+    Datasets are opened concurrently by a pool of threads and results
+    are produced in the order of the paths as soon as they are ready.
+    At most a few paths per thread are consumed ahead of the results,
+    so `paths` may be a generator over millions of items.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        Paths or URIs of datasets.
+    fields : sequence of str, optional
+        Names of the fields to get, by default all of those in
+        FIELDS.
+    num_threads : int, optional
+        The number of threads opening datasets.
+    env : Env, optional
+        The environment whose session and options the threads use.
+        GDAL configuration is local to a thread, so by default the
+        threads use the options of the calling thread's environment,
+        if any, with a default session.
+
+    Yields
+    ------
+    dict
+        The metadata of a dataset as returned by dataset_info() with
+        its path under the 'path' key or, if the dataset can't be
+        opened or read, its path and a message under the 'error' key.
+
+    Raises
+    ------
+    ValueError
+        If a field name is unknown or num_threads is less than 1.
+    """
+    fields = _check_fields(fields)
+
+    if num_threads < 1:
+        raise ValueError("num_threads must be at least 1")
+
+    if num_threads == 1:
+        for path in paths:
+            yield _scan_one(path, fields)
+        return
+
+    if env is None and hasenv():
+        env = rasterio.Env(**getenv())
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending = deque()
+        for path in paths:
+            pending.append(executor.submit(_scan_one, path, fields, env))
+            if len(pending) >= 4 * num_threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,9 +1,100 @@
 """Abstraction for sessions in various clouds."""
 
+import calendar
+from collections import OrderedDict
+import os
+import threading
+import time
 
 from rasterio.path import parse_path, UnparsedPath
 
 
+class SessionCache(object):
+    """A cache of foreign sessions and their resolved credentials.
+
+    Creating a foreign session, such as a boto3 session, and resolving
+    its credentials may take tens of milliseconds. Entries of this
+    cache are reused until their time to live elapses or, for temporary
+    credentials, until shortly before the credentials expire.
+
+    Attributes
+    ----------
+    ttl : float
+        Time to live of entries in seconds.
+    margin : float
+        Entries holding credentials that expire are refreshed this
+        many seconds before expiry.
+    maxsize : int
+        The maximum number of entries. The oldest entries are evicted
+        first.
+
+    """
+
+    def __init__(self, ttl=900.0, margin=60.0, maxsize=128, clock=time.time):
+        self.ttl = ttl
+        self.margin = margin
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, resolve):
+        """Get a cached value or resolve and cache a new one
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies a session class and its configuration.
+        resolve : function
+            Called without arguments if there is no fresh entry for key.
+            Returns a value and the time, in seconds since the epoch, at
+            which its credentials expire, or None if they don't.
+
+        Returns
+        -------
+        object
+            The value returned by resolve, now or earlier.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self._clock():
+                return entry[0]
+
+        # Resolving may take long and may itself use the cache, so it
+        # is done without the lock. Should another thread have cached
+        # a value for key meanwhile, that one is kept.
+        value, expiry = resolve()
+
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+            expires = now + self.ttl
+            if expiry is not None:
+                expires = min(expires, expiry - self.margin)
+
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Sessions are cached per process.
+session_cache = SessionCache()
+
+
 class Session(object):
     """Base for classes that configure access to secured resources.
 
@@ -200,17 +291,29 @@ class AWSSession(Session):
 
         if session:
             self._session = session
+            self._creds = self._session._session.get_credentials()
         else:
-            self._session = boto3.Session(
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                aws_session_token=aws_session_token,
-                region_name=region_name,
-                profile_name=profile_name)
+            def resolve():
+                session = boto3.Session(
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    aws_session_token=aws_session_token,
+                    region_name=region_name,
+                    profile_name=profile_name)
+                creds = session._session.get_credentials()
+                return (session, creds), _expiry_timestamp(creds)
+
+            # Sessions without explicit keys resolve credentials from
+            # the environment, so its AWS variables are part of the key.
+            key = (
+                AWSSession, aws_access_key_id, aws_secret_access_key,
+                aws_session_token, region_name, profile_name,
+                tuple(sorted((k, v) for k, v in os.environ.items()
+                             if k.startswith('AWS_'))))
+            self._session, self._creds = session_cache.get(key, resolve)
 
         self.requester_pays = requester_pays
         self.unsigned = aws_unsigned
-        self._creds = self._session._session.get_credentials()
 
     @classmethod
     def hascreds(cls, config):
@@ -262,6 +365,17 @@ class AWSSession(Session):
             return {k.upper(): v for k, v in self.credentials.items()}
 
 
+def _expiry_timestamp(creds):
+    """Expiry of botocore credentials in seconds since the epoch
+
+    Returns None for credentials that don't expire.
+    """
+    expiry = getattr(creds, '_expiry_time', None)
+    if expiry is None:
+        return None
+    return calendar.timegm(expiry.utctimetuple())
+
+
 class OSSSession(Session):
     """Configures access to secured resources stored in Alibaba Cloud OSS.
     """
@@ -33,7 +33,8 @@ cdef extern from "gdal.h" nogil:
 
 
 cdef int io_band(GDALRasterBandH band, int mode, float x0, float y0,
-                 float width, float height, object data, int resampling=0) except -1:
+                 float width, float height, object data, int resampling=0,
+                 void *progress_func=NULL, void *progress_data=NULL) except -1:
     """Read or write a region of data for the band.
 
     Implicit are
@@ -42,7 +43,8 @@ cdef int io_band(GDALRasterBandH band, int mode, float x0, float y0,
     2) decimation if `data` and `band` shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. A GDALProgressFunc and its data may
+    be given to report progress or cancel the request.
     """
     # GDAL handles all the buffering indexing, so a typed memoryview,
     # as in previous versions, isn't needed.
@@ -67,8 +69,8 @@ cdef int io_band(GDALRasterBandH band, int mode, float x0, float y0,
     extras.dfYOff = y0
     extras.dfXSize = width
     extras.dfYSize = height
-    extras.pfnProgress = NULL
-    extras.pProgressData = NULL
+    extras.pfnProgress = <GDALProgressFunc>progress_func
+    extras.pProgressData = progress_data
 
     with nogil:
         retval = GDALRasterIOEx(
@@ -80,7 +82,9 @@ cdef int io_band(GDALRasterBandH band, int mode, float x0, float y0,
 
 cdef int io_multi_band(GDALDatasetH hds, int mode, float x0, float y0,
                        float width, float height, object data,
-                       Py_ssize_t[:] indexes, int resampling=0) except -1:
+                       Py_ssize_t[:] indexes, int resampling=0,
+                       void *progress_func=NULL,
+                       void *progress_data=NULL) except -1:
     """Read or write a region of data for multiple bands.
 
     Implicit are
@@ -89,7 +93,8 @@ cdef int io_multi_band(GDALDatasetH hds, int mode, float x0, float y0,
     2) decimation if `data` and band shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. A GDALProgressFunc and its data may
+    be given to report progress or cancel the request.
     """
     cdef int i = 0
     cdef int retval = 3
@@ -116,8 +121,8 @@ cdef int io_multi_band(GDALDatasetH hds, int mode, float x0, float y0,
     extras.dfYOff = y0
     extras.dfXSize = width
     extras.dfYSize = height
-    extras.pfnProgress = NULL
-    extras.pProgressData = NULL
+    extras.pfnProgress = <GDALProgressFunc>progress_func
+    extras.pProgressData = progress_data
 
     bandmap = <int *>CPLMalloc(count*sizeof(int))
     for i in range(count):
@@ -138,7 +143,9 @@ cdef int io_multi_band(GDALDatasetH hds, int mode, float x0, float y0,
 
 cdef int io_multi_mask(GDALDatasetH hds, int mode, float x0, float y0,
                        float width, float height, object data,
-                       Py_ssize_t[:] indexes, int resampling=0) except -1:
+                       Py_ssize_t[:] indexes, int resampling=0,
+                       void *progress_func=NULL,
+                       void *progress_data=NULL) except -1:
     """Read or write a region of data for multiple band masks.
 
     Implicit are
@@ -147,10 +154,15 @@ cdef int io_multi_mask(GDALDatasetH hds, int mode, float x0, float y0,
     2) decimation if `data` and band shapes differ.
 
     The striding of `data` is passed to GDAL so that it can navigate
-    the layout of ndarray views.
+    the layout of ndarray views. A GDALProgressFunc and its data may
+    be given to report progress or cancel the request.
+
+    When reading, a mask shared by bands, such as a per-dataset mask,
+    is read once and copied to the rows of `data` of the other bands.
     """
     cdef int i = 0
     cdef int j = 0
+    cdef Py_ssize_t key = 0
     cdef int retval = 3
     cdef GDALRasterBandH band = NULL
     cdef GDALRasterBandH hmask = NULL
@@ -161,6 +173,7 @@ cdef int io_multi_mask(GDALDatasetH hds, int mode, float x0, float y0,
     cdef GSpacing bufpixelspace = data.strides[2]
     cdef GSpacing buflinespace = data.strides[1]
     cdef int count = len(indexes)
+    cdef dict masks_read = {}
 
     cdef int xoff = <int>x0
     cdef int yoff = <int>y0
@@ -175,8 +188,8 @@ cdef int io_multi_mask(GDALDatasetH hds, int mode, float x0, float y0,
     extras.dfYOff = y0
     extras.dfXSize = width
     extras.dfYSize = height
-    extras.pfnProgress = NULL
-    extras.pProgressData = NULL
+    extras.pfnProgress = <GDALProgressFunc>progress_func
+    extras.pProgressData = progress_data
 
     for i in range(count):
         j = <int>indexes[i]
@@ -186,6 +199,17 @@ cdef int io_multi_mask(GDALDatasetH hds, int mode, float x0, float y0,
         hmask = GDALGetMaskBand(band)
         if hmask == NULL:
             raise ValueError("Null mask band")
+        if mode == 0:
+            # All bands share a per-dataset mask, even if GDAL gives
+            # each its own mask band object.
+            if GDALGetMaskFlags(band) & GMF_PER_DATASET:
+                key = 0
+            else:
+                key = <Py_ssize_t>hmask
+            if key in masks_read:
+                data[i] = data[masks_read[key]]
+                continue
+            masks_read[key] = i
         buf = <void *>np.PyArray_DATA(data[i])
         if buf == NULL:
             raise ValueError("NULL data")
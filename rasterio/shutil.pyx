@@ -10,7 +10,7 @@ except ImportError:  # pragma: no cover
     class Path:
         pass
 
-from rasterio._io cimport DatasetReaderBase
+from rasterio._io cimport DatasetReaderBase, _ProgressHook
 from rasterio._err cimport exc_wrap_int, exc_wrap_pointer
 from rasterio.env import ensure_env_with_credentials
 from rasterio._err import CPLE_OpenFailedError
@@ -53,7 +53,8 @@ def exists(path):
 
 
 @ensure_env_with_credentials
-def copy(src, dst, driver='GTiff', strict=True, **creation_options):
+def copy(src, dst, driver='GTiff', strict=True, progress=None,
+         **creation_options):
 
     """Copy a raster from a path or open dataset handle to a new destination
     with driver specific creation options.
@@ -69,6 +70,10 @@ def copy(src, dst, driver='GTiff', strict=True, **creation_options):
     strict : bool, optional.  Default: True
         Indicates if the output must be strictly equivalent or if the
         driver may adapt as necessary
+    progress : callable or CancellationToken, optional
+        A function called with the completed fraction of the copy,
+        which cancels the copy by raising an exception, or a
+        rasterio.io.CancellationToken.
     creation_options : **kwargs, optional
         Creation options for output dataset
 
@@ -86,6 +91,7 @@ def copy(src, dst, driver='GTiff', strict=True, **creation_options):
     cdef GDALDatasetH dst_dataset = NULL
     cdef GDALDriverH drv = NULL
     cdef bint close_src = False
+    cdef _ProgressHook hook = _ProgressHook(progress)
 
     # Creation options
     for key, val in creation_options.items():
@@ -135,7 +141,9 @@ def copy(src, dst, driver='GTiff', strict=True, **creation_options):
     try:
         with nogil:
             dst_dataset = GDALCreateCopy(
-                drv, c_dst_path, src_dataset, c_strictness, options, NULL, NULL)
+                drv, c_dst_path, src_dataset, c_strictness, options,
+                hook.func, hook.data)
+        hook.check()
         dst_dataset = exc_wrap_pointer(dst_dataset)
 
     finally:
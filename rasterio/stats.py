@@ -0,0 +1,129 @@
+"""Statistics of raster bands computed one chunk at a time.
+
+Partial results of chunks are mergeable: moments are combined by the
+parallel form of Welford's algorithm and histograms with the same bin
+edges are summed. This lets a band be reduced block by block, by a
+pool of threads, without reading it into memory at once.
+"""
+
+from collections import namedtuple
+import math
+
+import numpy as np
+
+from rasterio.windows import Window
+
+
+Statistics = namedtuple('Statistics', ['min', 'max', 'mean', 'std', 'count'])
+Statistics.__doc__ = """Statistics of the valid pixels of a band
+
+The standard deviation is that of the population. The count is None
+if the statistics were read from metadata of the dataset. The other
+values are None if no pixels are valid.
+"""
+
+
+def _valid_values(arr):
+    """Flat array of unmasked values that are not NaN"""
+    if np.ma.isMaskedArray(arr):
+        values = arr.compressed()
+    else:
+        values = np.asarray(arr).ravel()
+    if values.dtype.kind in 'fc':
+        values = values[~np.isnan(values)]
+    return values
+
+
+class _Moments(object):
+    """Mergeable count, extremes, mean, and sum of squared deviations"""
+
+    __slots__ = ('count', 'min', 'max', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @classmethod
+    def from_array(cls, arr):
+        """Moments of an array's valid values"""
+        moments = cls()
+        values = _valid_values(arr)
+        if values.size:
+            mean = values.mean(dtype='float64')
+            moments.count = int(values.size)
+            moments.min = values.min().item()
+            moments.max = values.max().item()
+            moments.mean = float(mean)
+            moments.m2 = float(
+                np.square(values.astype('float64') - mean).sum())
+        return moments
+
+    def update(self, other):
+        """Merge the moments of other values into these"""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.min, self.max = other.count, other.min, other.max
+            self.mean, self.m2 = other.mean, other.m2
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def statistics(self):
+        if not self.count:
+            return Statistics(None, None, None, None, 0)
+        return Statistics(
+            self.min, self.max, self.mean, math.sqrt(self.m2 / self.count),
+            self.count)
+
+
+def _histogram(arr, bins, range):
+    """Counts of an array's valid values in bins"""
+    return np.histogram(_valid_values(arr), bins=bins, range=range)[0]
+
+
+def _cached_statistics(tags):
+    """Statistics from a band's STATISTICS_* metadata items or None"""
+    try:
+        return Statistics(
+            float(tags['STATISTICS_MINIMUM']),
+            float(tags['STATISTICS_MAXIMUM']),
+            float(tags['STATISTICS_MEAN']),
+            float(tags['STATISTICS_STDDEV']),
+            None)
+    except (KeyError, ValueError):
+        return None
+
+
+def _chunk_windows(window, block_shape, min_height=256):
+    """Windows covering a window, aligned to a band's blocks
+
+    Strips of a few rows are grouped so that chunks have at least
+    `min_height` rows.
+    """
+    block_height, block_width = block_shape
+    (row_start, row_stop), (col_start, col_stop) = window.toranges()
+
+    if block_width >= col_stop and block_height < min_height:
+        block_height *= int(math.ceil(float(min_height) / block_height))
+
+    row = row_start - row_start % block_height
+    while row < row_stop:
+        next_row = row + block_height
+        col = col_start - col_start % block_width
+        while col < col_stop:
+            next_col = col + block_width
+            top, left = max(row, row_start), max(col, col_start)
+            yield Window(
+                left, top, min(next_col, col_stop) - left,
+                min(next_row, row_stop) - top)
+            col = next_col
+        row = next_row
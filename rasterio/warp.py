@@ -179,7 +179,8 @@ def reproject(source, destination, src_transform=None, gcps=None,
               src_crs=None, src_nodata=None, dst_transform=None, dst_crs=None,
               dst_nodata=None, src_alpha=0, dst_alpha=0,
               resampling=Resampling.nearest, num_threads=1,
-              init_dest_nodata=True, warp_mem_limit=0, **kwargs):
+              init_dest_nodata=True, warp_mem_limit=0, progress=None,
+              **kwargs):
     """Reproject a source raster to a destination raster.
 
     If the source and destination are ndarrays, coordinate reference
@@ -260,6 +261,11 @@ def reproject(source, destination, src_transform=None, gcps=None,
         memory required to warp a 3-band uint8 2000 row x 2000 col
         raster to a destination of the same size is approximately
         56 MB. The default (0) means 64 MB with GDAL 2.2.
+    progress : callable or CancellationToken, optional
+        A function called with the completed fraction of the warp,
+        which cancels the warp by raising an exception, or a
+        rasterio.io.CancellationToken. A cancelled warp raises
+        OperationCancelledError.
     kwargs:  dict, optional
         Additional arguments passed to transformation function.
 
@@ -294,7 +300,7 @@ def reproject(source, destination, src_transform=None, gcps=None,
         dst_crs=dst_crs, dst_nodata=dst_nodata, dst_alpha=dst_alpha,
         src_alpha=src_alpha, resampling=resampling,
         init_dest_nodata=init_dest_nodata, num_threads=num_threads,
-        warp_mem_limit=warp_mem_limit, **kwargs)
+        warp_mem_limit=warp_mem_limit, progress=progress, **kwargs)
 
 
 def aligned_target(transform, width, height, resolution):
@@ -470,6 +470,64 @@ def round_window_to_full_blocks(window, block_shapes, height=0, width=0):
     return Window(col_min, row_min, col_max - col_min, row_max - row_min)
 
 
+def _block_indexes(window, block_shape):
+    """Ranges of the rows and columns of the blocks a window intersects
+
+    The window's offsets and lengths must be whole numbers.
+    """
+    block_height, block_width = block_shape
+    (row_start, row_stop), (col_start, col_stop) = window.toranges()
+    if row_stop <= row_start or col_stop <= col_start:
+        return range(0), range(0)
+    return (
+        range(int(row_start) // block_height,
+              (int(row_stop) - 1) // block_height + 1),
+        range(int(col_start) // block_width,
+              (int(col_stop) - 1) // block_width + 1))
+
+
+def _block_runs(windows, block_shape, height, width):
+    """Coalesce the blocks that windows intersect into runs of blocks
+
+    Adjacent blocks of a row of blocks are merged into one window, so
+    that every block needed by the windows is read once and by one
+    request per run.
+
+    Parameters
+    ----------
+    windows : iterable of Window
+        Windows with whole number offsets and lengths.
+    block_shape : tuple
+        The (rows, columns) of blocks.
+    height, width : int
+        The dataset's shape, to which runs are cropped.
+
+    Returns
+    -------
+    list of Window
+        Runs in the order of rows and columns of blocks.
+    """
+    block_height, block_width = block_shape
+    needed = {}
+    for window in windows:
+        rows, cols = _block_indexes(window, block_shape)
+        for i in rows:
+            needed.setdefault(i, set()).update(cols)
+
+    runs = []
+    for i in sorted(needed):
+        cols = sorted(needed[i])
+        start = cols[0]
+        for prev, j in zip(cols, cols[1:] + [None]):
+            if j == prev + 1:
+                continue
+            runs.append(Window.from_slices(
+                (i * block_height, min((i + 1) * block_height, height)),
+                (start * block_width, min((prev + 1) * block_width, width))))
+            start = j
+    return runs
+
+
 def validate_length_value(instance, attribute, value):
     if value and value < 0:
         raise ValueError("Number of columns or rows must be non-negative")
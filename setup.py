@@ -337,6 +337,9 @@ inst_reqs = [
 if sys.version_info < (3, 4):
     inst_reqs.append('enum34')
 
+if sys.version_info < (3, 2):
+    inst_reqs.append('futures')
+
 extra_reqs = {
     'ipython': ['ipython>=2.0'],
     's3': ['boto3>=1.2.4'],
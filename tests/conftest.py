@@ -479,6 +479,32 @@ def path_rgb_byte_tif(data_dir):
     return os.path.join(data_dir, 'RGB.byte.tif')
 
 
+MIXED_BAND_TEMPLATE = """
+  <VRTRasterBand dataType="{dtype}" band="{bidx}">
+    <NoDataValue>0</NoDataValue>
+    <SimpleSource>
+      <SourceFilename relativeToVRT="0">{path}</SourceFilename>
+      <SourceBand>{src_bidx}</SourceBand>
+    </SimpleSource>
+  </VRTRasterBand>"""
+
+
+@pytest.fixture
+def path_mixed_vrt(tmpdir, path_rgb_byte_tif):
+    """A VRT of RGB.byte.tif's bands as uint8, uint16, float32, uint16"""
+    bands = [
+        MIXED_BAND_TEMPLATE.format(
+            dtype=dtype, bidx=bidx, src_bidx=src_bidx,
+            path=os.path.abspath(path_rgb_byte_tif))
+        for bidx, (dtype, src_bidx) in enumerate(
+            [('Byte', 1), ('UInt16', 2), ('Float32', 3), ('UInt16', 1)], 1)]
+    path = str(tmpdir.join('mixed.vrt'))
+    with open(path, 'w') as f:
+        f.write('<VRTDataset rasterXSize="791" rasterYSize="718">{}\n'
+                '</VRTDataset>\n'.format(''.join(bands)))
+    return path
+
+
 @pytest.fixture(scope='session')
 def path_rgba_byte_tif(data_dir):
     """Derived from RGB.byte.tif, this has an alpha band"""
@@ -168,3 +168,45 @@ def test_masking_sidecar_mask(tiffs):
         assert r.mask.all()
         masks = src.read_masks()
         assert not masks.any()
+
+
+def test_read_masks_shared_rgba():
+    """A per-dataset mask read once equals the masks read band by band"""
+    with rasterio.open('tests/data/RGBA.byte.tif') as src:
+        masks = src.read_masks()
+        for i, bidx in enumerate(src.indexes):
+            assert (masks[i] == src.read_masks(bidx)).all()
+        assert (masks[0] == masks[2]).all()
+        assert masks[3].all()
+        assert not masks[0].all()
+
+
+def test_read_masks_shared_window(tiffs):
+    with rasterio.open(str(tiffs.join('sidecar-masked.tif'))) as src:
+        masks = src.read_masks([3, 1], window=((10, 20), (30, 50)))
+        assert masks.shape == (2, 10, 20)
+        assert not masks.any()
+
+
+def test_read_masks_shared_out(tiffs):
+    """Masks are copied into a strided output array"""
+    with rasterio.open('tests/data/RGBA.byte.tif') as src:
+        out = np.zeros((3, src.height, src.width, 2), dtype='uint8')
+        masks = src.read_masks([1, 2, 3], out=out[..., 0])
+        expected = src.read_masks(1)
+        for mask in masks:
+            assert (mask == expected).all()
+        assert not out[..., 1].any()
+
+
+def test_read_shared_mask_overview(data):
+    path = str(data.join('RGBA.byte.tif'))
+    with rasterio.open(path, 'r+') as dst:
+        dst.build_overviews([2])
+    with rasterio.open(path) as src:
+        rgb = src.read([1, 2, 3], masked=True, overview_level=0)
+        assert rgb.shape[0] == 3
+        assert rgb.shape[1] < src.height
+        assert rgb.mask.any()
+        assert (rgb.mask[0] == rgb.mask[1]).all()
+        assert (rgb.mask[0] == rgb.mask[2]).all()
@@ -0,0 +1,268 @@
+"""Tests of the per-dataset block cache."""
+
+import multiprocessing
+import sys
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.blockcache import BlockCache, BlockCacheStats, SharedBlockCache
+from rasterio.windows import Window
+
+
+def block(value=0):
+    return np.full((10, 10), value, dtype='uint8')
+
+
+def test_cache_lru():
+    cache = BlockCache(300)
+    for j in range(3):
+        cache.put('a', 1, 0, j, block(j))
+    assert cache.get('a', 1, 0, 0)[0, 0] == 0
+    cache.put('a', 1, 0, 3, block(3))
+    assert cache.get('a', 1, 0, 1) is None
+    assert cache.get('a', 1, 0, 2) is not None
+    assert cache.stats() == BlockCacheStats(2, 1, 1, 3, 300)
+
+
+def test_cache_lfu():
+    cache = BlockCache(300, policy='lfu')
+    for j in range(3):
+        cache.put('a', 1, 0, j, block(j))
+    cache.get('a', 1, 0, 0)
+    cache.get('a', 1, 0, 1)
+    cache.put('a', 1, 0, 3, block(3))
+    assert cache.get('a', 1, 0, 2) is None
+    assert len(cache) == 3
+    assert cache.nbytes == 300
+
+
+def test_cache_pinned():
+    cache = BlockCache(200)
+    cache.pin('a')
+    for j in range(3):
+        cache.put('a', 1, 0, j, block())
+    cache.put('b', 1, 0, 0, block())
+    assert len(cache) == 3
+    assert cache.get('b', 1, 0, 0) is None
+    cache.unpin('a')
+    assert len(cache) == 2
+    assert cache.stats().evictions == 2
+
+
+def test_cache_blocks_read_only():
+    cache = BlockCache(1000)
+    cache.put('a', 1, 0, 0, block())
+    with pytest.raises(ValueError):
+        cache.get('a', 1, 0, 0)[0, 0] = 1
+
+
+def test_cache_invalidate():
+    cache = BlockCache(1000)
+    cache.put('a', 1, 0, 0, block())
+    cache.put('b', 1, 0, 0, block())
+    cache.invalidate('a')
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_cache_bad_args():
+    with pytest.raises(ValueError):
+        BlockCache(-1)
+    with pytest.raises(ValueError):
+        BlockCache(100, policy='fifo')
+
+
+def test_read_block_cache(path_rgb_byte_tif):
+    cache = BlockCache(10 * 2**20)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.block_cache = cache
+        block_height, block_width = src.block_shapes[0]
+        window = Window(0, block_height, src.width, 2 * block_height)
+        expected = src.read(window=window)
+        assert cache.stats() == BlockCacheStats(0, 6, 0, 6, expected.nbytes)
+        data = src.read(window=window)
+        assert cache.stats().hits == 6
+        assert (data == expected).all()
+        data = src.read(2, window=window, masked=True)
+        assert cache.stats().hits == 8
+        assert (data == expected[1]).all()
+
+
+def test_read_block_cache_unaligned(path_rgb_byte_tif):
+    cache = BlockCache(10 * 2**20)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.block_cache = cache
+        src.read(1, window=Window(0, 1, src.width, 3))
+        src.read(1, window=Window(0, 0, 10, 3))
+        src.read(1, window=Window(0, 0, src.width, 3), out_dtype='float32')
+        src.read(1, window=Window(0, 0, src.width, 3), out_shape=(1, 10))
+    assert cache.stats() == BlockCacheStats(0, 0, 0, 0, 0)
+
+
+def test_read_block_cache_last_blocks(path_rgb_byte_tif):
+    """Blocks at the edges of the dataset may be partial"""
+    cache = BlockCache(10 * 2**20)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read(3)
+        src.block_cache = cache
+        assert (src.read(3) == expected).all()
+        assert (src.read(3) == expected).all()
+    assert cache.stats().hits == cache.stats().misses
+
+
+def test_read_block_cache_shared(path_rgb_byte_tif):
+    """Datasets opened from the same path share blocks"""
+    cache = BlockCache(10 * 2**20)
+    window = Window(0, 0, 791, 3)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.block_cache = cache
+        src.read(1, window=window)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.block_cache = cache
+        src.read(1, window=window)
+    assert cache.stats().hits == 1
+
+
+def test_read_block_cache_copies(path_rgb_byte_tif):
+    """Cached blocks don't hold on to the arrays they were read into"""
+    cache = BlockCache(10 * 2**20)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.block_cache = cache
+        window = Window(0, 0, src.width, src.block_shapes[0][0])
+        src.read(window=window)
+        blocks = [cache.get(src, bidx, 0, 0) for bidx in (1, 2, 3)]
+    assert all(block.base is None for block in blocks)
+    assert cache.nbytes == sum(block.nbytes for block in blocks)
+
+
+def test_write_invalidates(tmpdir, path_rgb_byte_tif):
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(path_rgb_byte_tif) as src:
+        profile = src.profile
+        data = src.read()
+    cache = BlockCache(10 * 2**20)
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data)
+    with rasterio.open(path, 'r+') as dst:
+        dst.block_cache = cache
+        block_height = dst.block_shapes[0][0]
+        window = Window(0, 0, dst.width, block_height)
+        assert (dst.read(1, window=window) == data[0, :block_height]).all()
+        dst.write(np.ones((block_height, dst.width), dtype='uint8'), 1,
+                  window=window)
+        assert len(cache) == 0
+        assert (dst.read(1, window=window) == 1).all()
+
+
+def test_shared_cache(tmpdir):
+    path = str(tmpdir.join('blocks'))
+    arr = np.arange(100, dtype='float64').reshape((10, 10))
+    with SharedBlockCache(path, max_bytes=3000, slot_size=1000) as cache:
+        assert cache.slot_count == 3
+        cache.put('a', 1, 0, 0, arr)
+        assert (cache.get('a', 1, 0, 0) == arr).all()
+        assert cache.get('a', 1, 0, 0, level=0) is None
+        assert cache.stats() == BlockCacheStats(1, 1, 0, 1, arr.nbytes)
+
+        # Another cache object attached to the same file, as in
+        # another process, sees the block.
+        with SharedBlockCache(path) as other:
+            assert (other.get('a', 1, 0, 0) == arr).all()
+            other.invalidate('a')
+        assert cache.get('a', 1, 0, 0) is None
+
+
+def test_shared_cache_lru(tmpdir):
+    path = str(tmpdir.join('blocks'))
+    with SharedBlockCache(path, max_bytes=3000, slot_size=1000) as cache:
+        for j in range(3):
+            cache.put('a', 1, 0, j, block(j))
+        cache.get('a', 1, 0, 0)
+        cache.put('a', 1, 0, 3, block(3))
+        assert cache.get('a', 1, 0, 1) is None
+        assert cache.get('a', 1, 0, 0)[0, 0] == 0
+        assert cache.stats().evictions == 1
+        # Blocks larger than a slot aren't stored.
+        cache.put('b', 1, 0, 0, np.zeros((100, 100)))
+        assert cache.get('b', 1, 0, 0) is None
+
+
+def test_shared_cache_bad_file(tmpdir):
+    path = tmpdir.join('blocks')
+    path.write('not a cache' * 100)
+    with pytest.raises(ValueError):
+        SharedBlockCache(str(path))
+
+
+def test_read_shared_cache(tmpdir, path_rgb_byte_tif):
+    path = str(tmpdir.join('blocks'))
+    with SharedBlockCache(path, max_bytes=2**20, slot_size=4096) as cache:
+        with rasterio.open(path_rgb_byte_tif) as src:
+            src.block_cache = cache
+            window = Window(0, 0, src.width, 6)
+            expected = src.read(window=window)
+        with rasterio.open(path_rgb_byte_tif) as src:
+            src.block_cache = cache
+            assert (src.read(window=window) == expected).all()
+        assert cache.stats().hits == 6
+
+
+def _count_locked(cache, times):
+    """Increment the shared hit count under the cache's lock"""
+    for _ in range(times):
+        with cache._locked():
+            hits = int(cache._header['hits'][0])
+            for _ in range(100):
+                pass
+            cache._header['hits'] = hits + 1
+
+
+@pytest.mark.skipif(
+    sys.platform == 'win32', reason="Shared block caches require fork")
+def test_shared_cache_forked_processes(tmpdir):
+    """Processes forked after the cache is opened exclude each other"""
+    if hasattr(multiprocessing, 'get_context'):
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing
+    path = str(tmpdir.join('blocks'))
+    with SharedBlockCache(path, max_bytes=3000, slot_size=1000) as cache:
+        workers = [
+            context.Process(target=_count_locked, args=(cache, 500))
+            for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert all(worker.exitcode == 0 for worker in workers)
+        assert cache.stats().hits == 2000
+
+
+def test_shared_cache_numpy_indexes(tmpdir):
+    path = str(tmpdir.join('blocks'))
+    with SharedBlockCache(path, max_bytes=3000, slot_size=1000) as cache:
+        cache.put('a', np.int64(1), np.int32(0), np.uint16(2), block(2),
+                  level=np.int64(0))
+        assert cache.get('a', 1, 0, 2, level=0)[0, 0] == 2
+
+
+@pytest.mark.parametrize('shared', [False, True])
+def test_cache_replaced_file(tmpdir, shared):
+    """Blocks of a file replaced at the same path are not served"""
+    path = tmpdir.join('test.tif')
+    path.write('version one')
+    if shared:
+        cache = SharedBlockCache(
+            str(tmpdir.join('blocks')), max_bytes=3000, slot_size=1000)
+    else:
+        cache = BlockCache(3000)
+    cache.put(str(path), 1, 0, 0, block(1))
+    assert cache.get(str(path), 1, 0, 0) is not None
+    path.write('version two, longer')
+    assert cache.get(str(path), 1, 0, 0) is None
+    if shared:
+        cache.close()
@@ -0,0 +1,82 @@
+"""Tests of buffered dataset writers for copy-only formats."""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+import rasterio
+
+
+def write_png(path, **kwargs):
+    data = np.arange(100 * 120, dtype='uint8').reshape((1, 100, 120))
+    with rasterio.open(
+            path, 'w', driver='PNG', width=120, height=100, count=1,
+            dtype='uint8', **kwargs) as dst:
+        dst.write(data)
+    return data
+
+
+@pytest.mark.parametrize('limit', [0, 64 * 1024 * 1024])
+def test_gtiff_buffer(tmpdir, monkeypatch, limit):
+    """A GTiff buffer in /vsimem or on disk is removed on close"""
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmpdir.mkdir('temp')))
+    path = str(tmpdir.join('test.png'))
+    data = write_png(path, buffer_driver='GTiff', buffer_memory_limit=limit)
+
+    with rasterio.open(path) as src:
+        assert src.driver == 'PNG'
+        assert (src.read() == data).all()
+
+    assert os.listdir(tempfile.tempdir) == []
+
+
+def test_gtiff_buffer_on_disk(tmpdir, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmpdir.mkdir('temp')))
+    with rasterio.open(
+            str(tmpdir.join('test.png')), 'w', driver='PNG', width=120,
+            height=100, count=1, dtype='uint8', buffer_driver='GTiff',
+            buffer_memory_limit=0) as dst:
+        assert dst._buffer_path.startswith(tempfile.tempdir)
+        assert len(os.listdir(tempfile.tempdir)) == 1
+
+
+def test_gtiff_buffer_update(tmpdir):
+    path = str(tmpdir.join('test.png'))
+    data = write_png(path)
+
+    with rasterio.open(path, 'r+', buffer_driver='GTiff') as dst:
+        assert (dst.read() == data).all()
+        dst.write(np.zeros((10, 10), dtype='uint8'), 1,
+                  window=((0, 10), (0, 10)))
+
+    with rasterio.open(path) as src:
+        result = src.read(1)
+        assert not result[:10, :10].any()
+        assert (result[10:] == data[0, 10:]).all()
+
+
+def test_invalid_buffer_driver(tmpdir):
+    with pytest.raises(ValueError):
+        write_png(str(tmpdir.join('test.png')), buffer_driver='JPEG')
+
+
+def test_progress(tmpdir):
+    fractions = []
+    write_png(str(tmpdir.join('test.png')), progress=fractions.append)
+    assert fractions
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == 1.0
+
+
+def test_progress_exception(tmpdir):
+    """An exception raised by the progress function cancels the copy"""
+    class Cancelled(Exception):
+        pass
+
+    def progress(complete):
+        raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        write_png(str(tmpdir.join('test.png')), progress=progress)
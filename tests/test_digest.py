@@ -0,0 +1,92 @@
+"""Tests of content digests of datasets."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.digest import dataset_digest
+from rasterio.windows import Window
+
+
+@pytest.fixture
+def path_rgb_tiled(tmpdir, path_rgb_byte_tif):
+    """A tiled and compressed copy of RGB.byte.tif"""
+    path = str(tmpdir.join('tiled.tif'))
+    with rasterio.open(path_rgb_byte_tif) as src:
+        profile = src.profile
+        profile.update(
+            tiled=True, blockxsize=128, blockysize=128, compress='deflate')
+        with rasterio.open(path, 'w', **profile) as dst:
+            dst.write(src.read())
+    return path
+
+
+def test_digest_independent_of_layout(path_rgb_byte_tif, path_rgb_tiled):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = dataset_digest(src)
+    with rasterio.open(path_rgb_tiled) as src:
+        digest = dataset_digest(src)
+    assert digest == expected
+    assert digest.hexdigest() == expected.hexdigest()
+    assert len(digest.hexdigest()) == 64
+
+
+def test_digest_threads(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        assert dataset_digest(src, num_threads=4) == dataset_digest(src)
+
+
+def test_digest_bands(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        digest = dataset_digest(src)
+        band_digest = dataset_digest(src, indexes=2)
+    assert band_digest != digest
+    assert band_digest.band_digest(2) == digest.band_digest(2)
+    assert digest.band_digest(1) != digest.band_digest(2)
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_digest_mixed_dtypes(path_mixed_vrt, num_threads):
+    with rasterio.open(path_mixed_vrt) as src:
+        digest = dataset_digest(src, num_threads=num_threads)
+        for bidx in src.indexes:
+            assert (digest.band_digest(bidx) ==
+                    dataset_digest(src, indexes=bidx).band_digest(bidx))
+        assert digest.band_digest(1) != digest.band_digest(4)
+        assert digest.verify(src, window=Window(0, 0, 300, 300))
+
+
+def test_digest_chunk_shape(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        assert (dataset_digest(src, chunk_shape=(100, 100)) !=
+                dataset_digest(src))
+
+
+def test_digest_bad_args(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            dataset_digest(src, algorithm='nope')
+        with pytest.raises(ValueError):
+            dataset_digest(src, num_threads=0)
+        with pytest.raises(ValueError):
+            dataset_digest(src, chunk_shape=(0, 256))
+
+
+def test_digest_changed_window(path_rgb_tiled):
+    """Only chunks in a window are rehashed to find changes"""
+    with rasterio.open(path_rgb_tiled) as src:
+        digest = dataset_digest(src)
+        original = digest.hexdigest()
+
+    with rasterio.open(path_rgb_tiled, 'r+') as dst:
+        dst.write(np.full((10, 10), 7, dtype='uint8'), 2,
+                  window=Window(300, 260, 10, 10))
+
+    with rasterio.open(path_rgb_tiled) as src:
+        assert digest.verify(src, window=Window(0, 0, 256, 256))
+        assert not digest.verify(src, window=Window(305, 265, 1, 1))
+        assert digest.update(src, window=Window(300, 260, 10, 10)) == [
+            (2, 1, 1)]
+        assert digest.hexdigest() != original
+        assert digest == dataset_digest(src)
+        assert digest.verify(src)
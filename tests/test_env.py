@@ -13,9 +13,10 @@ from rasterio import _env
 from rasterio._env import del_gdal_config, get_gdal_config, set_gdal_config
 from rasterio.env import Env, defenv, delenv, getenv, setenv, ensure_env, ensure_env_credentialled
 from rasterio.env import GDALVersion, require_gdal_version
+from rasterio.env import ensure_env_with_credentials, hasenv, _default_env
 from rasterio.errors import EnvError, RasterioIOError, GDALVersionError
 from rasterio.rio.main import main_group
-from rasterio.session import AWSSession, OSSSession
+from rasterio.session import AWSSession, DummySession, OSSSession
 
 from .conftest import requires_gdal21
 
@@ -812,3 +813,69 @@ def test_oss_session_credentials(gdalenv):
         assert getenv()['OSS_ACCESS_KEY_ID'] == 'id'
         assert getenv()['OSS_SECRET_ACCESS_KEY'] == 'key'
         assert getenv()['OSS_ENDPOINT'] == 'null-island-1'
+
+
+def test_drivers_registered_once():
+    """Drivers are registered by the first environment of the process"""
+    with rasterio.Env():
+        pass
+    assert _env._have_registered_drivers
+    with rasterio.Env():
+        assert rasterio.env.local._env._have_registered_drivers
+
+
+def test_open_reuses_env(path_rgb_byte_tif):
+    """rasterio.open() doesn't replace an existing environment"""
+    with rasterio.Env(CPL_DEBUG=True):
+        gdalenv = rasterio.env.local._env
+        with rasterio.open(path_rgb_byte_tif) as src:
+            assert rasterio.env.local._env is gdalenv
+        assert rasterio.env.local._env is gdalenv
+        assert getenv()['CPL_DEBUG'] is True
+
+
+def test_open_credentials_nest_env(monkeypatch):
+    """An environment lacking credentials is nested"""
+
+    @ensure_env_credentialled
+    def fake_opener(path):
+        return getenv()
+
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'lol')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'wut')
+
+    with rasterio.Env(session=DummySession()):
+        assert 'AWS_ACCESS_KEY_ID' not in getenv()
+        gdalenv = fake_opener('s3://foo/bar')
+        assert gdalenv['AWS_ACCESS_KEY_ID'] == 'lol'
+        assert 'AWS_ACCESS_KEY_ID' not in getenv()
+
+
+def test_default_env_reused():
+    """Calls without an environment share a default one"""
+    env = _default_env(DummySession)
+    assert _default_env(DummySession) is env
+    assert isinstance(env.session, DummySession)
+
+    @ensure_env_with_credentials
+    def fake_opener(path):
+        return getenv()
+
+    assert fake_opener('tests/data/RGB.byte.tif')['CHECK_WITH_INVERT_PROJ']
+    assert fake_opener('tests/data/RGB.byte.tif')['CHECK_WITH_INVERT_PROJ']
+    assert not hasenv()
+
+
+def test_default_env_credentials(monkeypatch):
+    """Default environments follow the AWS variables"""
+
+    @ensure_env_with_credentials
+    def fake_opener(path):
+        return getenv()
+
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'lol')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'wut')
+    assert fake_opener('s3://foo/bar')['AWS_ACCESS_KEY_ID'] == 'lol'
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'foo')
+    assert fake_opener('s3://foo/bar')['AWS_ACCESS_KEY_ID'] == 'foo'
+    assert not hasenv()
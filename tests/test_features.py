@@ -1,5 +1,6 @@
 from copy import deepcopy
 import logging
+import struct
 import sys
 
 import numpy as np
@@ -7,11 +8,12 @@ import pytest
 from affine import Affine
 
 import rasterio
+from rasterio._features import _rasterize
 from rasterio.enums import MergeAlg
 from rasterio.errors import WindowError
 from rasterio.features import (
-    bounds, geometry_mask, geometry_window, is_valid_geom, rasterize, sieve,
-    shapes)
+    bounds, dataset_features, geometry_mask, geometry_window, is_valid_geom,
+    rasterize, rasterize_blocks, shapes_from_ragged_array, sieve, shapes)
 
 from .conftest import MockGeoInterface
 
@@ -500,6 +502,170 @@ def test_rasterize_invalid_geom():
             {'type': 'Invalid', 'coordinates': []}]}], out_shape=DEFAULT_SHAPE)
 
 
+def _polygon_wkb(rings):
+    """Little endian WKB of a polygon"""
+    wkb = struct.pack('<bII', 1, 3, len(rings))
+    for ring in rings:
+        wkb += struct.pack('<I', len(ring))
+        for x, y in ring:
+            wkb += struct.pack('<dd', x, y)
+    return wkb
+
+
+def test_rasterize_wkb(basic_geometry, basic_image_2x2):
+    wkb = _polygon_wkb(basic_geometry['coordinates'])
+    assert np.array_equal(
+        rasterize([wkb], out_shape=DEFAULT_SHAPE), basic_image_2x2)
+    assert np.array_equal(
+        rasterize([(wkb, 5)], out_shape=DEFAULT_SHAPE), basic_image_2x2 * 5)
+
+
+def test_rasterize_wkb_geomcollection_no_hole():
+    """Parts of WKB collections are burned separately, like GeoJSON"""
+    parts = [
+        [[(0, 0), (0, 5), (5, 5), (5, 0), (0, 0)]],
+        [[(2, 2), (2, 7), (7, 7), (7, 2), (2, 2)]]]
+    wkb = struct.pack('<bII', 1, 7, 2) + b''.join(
+        _polygon_wkb(rings) for rings in parts)
+    expected = rasterize(
+        [{'type': 'Polygon', 'coordinates': rings} for rings in parts],
+        out_shape=DEFAULT_SHAPE)
+    assert np.array_equal(
+        rasterize([wkb], out_shape=DEFAULT_SHAPE), expected)
+
+
+def test_rasterize_ragged_array(basic_geometry, basic_image_2x2):
+    """Polygons from flat coordinate and offset arrays"""
+    ring = np.array(basic_geometry['coordinates'][0], dtype='float64')
+    coords = np.concatenate([ring, ring + 4])
+    ring_offsets = np.array([0, 5, 10])
+    geom_offsets = np.array([0, 1, 2])
+    geoms = list(shapes_from_ragged_array(
+        'Polygon', coords, (ring_offsets, geom_offsets), values=[1, 2]))
+    assert len(geoms) == 2
+    assert geoms[1][0]['coordinates'][0].shape == (5, 2)
+
+    expected = basic_image_2x2.copy()
+    expected[6:8, 6:8] = 2
+    assert np.array_equal(
+        rasterize(geoms, out_shape=DEFAULT_SHAPE, dtype='uint8'), expected)
+
+
+def test_rasterize_read_only_array(basic_geometry, basic_image_2x2):
+    """Coordinates may be read-only arrays"""
+    ring = np.array(basic_geometry['coordinates'][0], dtype='float64')
+    ring.setflags(write=False)
+    geom = {'type': 'Polygon', 'coordinates': [ring]}
+    assert np.array_equal(
+        rasterize([geom], out_shape=DEFAULT_SHAPE), basic_image_2x2)
+
+
+def test_rasterize_count_skips_invalid(basic_geometry):
+    """Invalid geometries are not counted as burned"""
+    image = np.zeros(DEFAULT_SHAPE, dtype='uint8')
+    invalid = {'type': 'Invalid', 'coordinates': []}
+    shapes = [(basic_geometry, 1), (invalid, 1), (basic_geometry, 2)]
+    assert _rasterize(shapes, image, Affine.identity(), False,
+                      MergeAlg.replace, batch_size=2) == 2
+
+
+def test_shapes_from_ragged_array_invalid():
+    with pytest.raises(ValueError):
+        next(shapes_from_ragged_array('Polygon', np.zeros((5, 2)), ()))
+
+    with pytest.raises(ValueError):
+        next(shapes_from_ragged_array('Circle', np.zeros((5, 2))))
+
+
+def test_rasterize_streamed_batches(basic_geometry, basic_image_2x2):
+    """Shapes spanning several batches are all burned"""
+    consumed = []
+
+    def generate():
+        for i in range(25000):
+            consumed.append(i)
+            yield basic_geometry
+
+    out = rasterize(generate(), out_shape=DEFAULT_SHAPE, dtype='uint8')
+    assert len(consumed) == 25000
+    assert np.array_equal(out, basic_image_2x2)
+
+
+def test_rasterize_streamed_invalid_value(basic_geometry):
+    with pytest.raises(ValueError):
+        rasterize(iter([(basic_geometry, 1), (basic_geometry, 1000)]),
+                  out_shape=DEFAULT_SHAPE, dtype='uint8')
+
+
+def _block_geometries():
+    """Overlapping squares and a line across a 100 x 120 grid"""
+    geoms = []
+    for i, (x, y) in enumerate([(3, 5), (10.5, 40), (30, 30), (70, 2),
+                                (95, 80), (50.25, 61.5)]):
+        geoms.append(({'type': 'Polygon', 'coordinates': [[
+            (x, y), (x + 25, y), (x + 25, y + 18.5), (x, y + 18.5), (x, y)]]},
+            i + 1))
+    geoms.append(({'type': 'LineString',
+                   'coordinates': [(0.5, 99.5), (119.5, 0.5)]}, 9))
+    return geoms
+
+
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_rasterize_blocks(tmpdir, num_threads):
+    """Burning block by block matches burning all at once"""
+    geoms = _block_geometries()
+    expected = rasterize(geoms, out_shape=(100, 120), fill=255, dtype='uint8')
+
+    path = str(tmpdir.join('blocks.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=120, height=100, count=1,
+            dtype='uint8', tiled=True, blockxsize=16, blockysize=16) as dst:
+        rasterize_blocks(geoms, dst, fill=255, num_threads=num_threads)
+
+    with rasterio.open(path) as src:
+        assert np.array_equal(src.read(1), expected)
+
+
+def test_rasterize_blocks_striped(tmpdir):
+    geoms = _block_geometries()
+    expected = rasterize(
+        geoms, out_shape=(100, 120), all_touched=True, dtype='uint8')
+
+    path = str(tmpdir.join('strips.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=120, height=100, count=1,
+            dtype='uint8') as dst:
+        rasterize_blocks(geoms, dst, all_touched=True)
+
+    with rasterio.open(path) as src:
+        assert np.array_equal(src.read(1), expected)
+
+
+def test_rasterize_blocks_existing(tmpdir, basic_geometry, basic_image_2x2):
+    """With a fill of None geometries are burned onto existing pixels"""
+    path = str(tmpdir.join('existing.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=10, height=10, count=1,
+            dtype='uint8') as dst:
+        dst.write(np.full(DEFAULT_SHAPE, 7, dtype='uint8'), 1)
+
+    with rasterio.open(path, 'r+') as dst:
+        rasterize_blocks([(basic_geometry, 3)], dst, fill=None)
+
+    with rasterio.open(path) as src:
+        assert np.array_equal(
+            src.read(1), np.where(basic_image_2x2, 3, 7).astype('uint8'))
+
+
+def test_rasterize_blocks_value_dtype_mismatch(tmpdir, basic_geometry):
+    path = str(tmpdir.join('mismatch.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=10, height=10, count=1,
+            dtype='uint8') as dst:
+        with pytest.raises(ValueError):
+            rasterize_blocks([(basic_geometry, 1000)], dst)
+
+
 def test_rasterize_out_image(basic_geometry, basic_image_2x2):
     """Rasterize operation should succeed for an out image."""
     out = np.zeros(DEFAULT_SHAPE)
@@ -932,6 +1098,88 @@ def test_shapes_internal_driver_manager(basic_image):
     assert next(shapes(basic_image))[0]['type'] == 'Polygon'
 
 
+def _ring_area(ring):
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in
+                   zip(ring[:-1], ring[1:]))) / 2.0
+
+
+def _summarize(results):
+    """Sorted (value, area, number of rings, bounds) of shapes"""
+    summary = []
+    for geom, value in results:
+        rings = geom['coordinates']
+        area = _ring_area(rings[0]) - sum(_ring_area(r) for r in rings[1:])
+        summary.append((value, area, len(rings), bounds(geom)))
+    return sorted(summary)
+
+
+@pytest.mark.parametrize('strip_height', [1, 2, 3, 4, 100])
+def test_shapes_strips(pixelated_image, strip_height):
+    """Shapes stitched across strips match shapes of the whole image"""
+    image = pixelated_image.copy()
+    image[6:9, 1:4] = 1
+    image[7, 2] = 0
+    truth = _summarize(shapes(image))
+    assert _summarize(shapes(image, strip_height=strip_height)) == truth
+
+
+def test_shapes_strips_transform(basic_image):
+    transform = Affine(2.0, 0, 100.0, 0, -2.0, 200.0)
+    truth = _summarize(shapes(basic_image, transform=transform))
+    assert _summarize(
+        shapes(basic_image, transform=transform, strip_height=3)) == truth
+
+
+def test_shapes_strips_connectivity(diagonal_image):
+    """Diagonally adjacent pixels are stitched only with 8 connectivity"""
+    assert len(list(
+        shapes(diagonal_image, connectivity=4, strip_height=3))) == 12
+    assert len(list(
+        shapes(diagonal_image, connectivity=8, strip_height=3))) == 2
+
+
+def test_shapes_strips_masked_array(basic_image):
+    image = np.ma.masked_array(basic_image, basic_image == 0)
+    results = list(shapes(image, strip_height=2))
+    assert len(results) == 1
+    assert _summarize(results) == _summarize(shapes(image))
+
+
+def test_shapes_strips_band(pixelated_image, pixelated_image_file):
+    with rasterio.open(pixelated_image_file) as src:
+        band = rasterio.band(src, 1)
+        truth = _summarize(shapes(band))
+        assert _summarize(shapes(band, strip_height=3)) == truth
+        assert _summarize(shapes(band, mask=band, strip_height=3)) == \
+            _summarize(shapes(band, mask=band))
+
+
+def test_shapes_strips_invalid_height(basic_image):
+    with pytest.raises(ValueError):
+        next(shapes(basic_image, strip_height=0))
+
+
+def test_dataset_features_strips(path_rgb_byte_tif):
+    """Features of a dataset read in strips match those read at once"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        kwargs = dict(bidx=1, as_mask=True, geographic=False)
+        truth = _summarize(
+            (f['geometry'], f['properties']['val'])
+            for f in dataset_features(src, **kwargs))
+        result = _summarize(
+            (f['geometry'], f['properties']['val'])
+            for f in dataset_features(src, strip_height=100, **kwargs))
+        assert len(result) == len(truth)
+        assert sum(r[1] for r in result) == pytest.approx(
+            sum(t[1] for t in truth))
+
+
+def test_dataset_features_strips_sampling(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            next(dataset_features(src, bidx=1, sampling=2, strip_height=100))
+
+
 def test_sieve_small(basic_image, pixelated_image):
     """
     Setting the size smaller than or equal to the size of the feature in the
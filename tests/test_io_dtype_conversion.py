@@ -0,0 +1,80 @@
+"""Tests of data type conversion by GDAL during reads and writes."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.windows import Window
+
+
+def test_read_out_dtype(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read()
+        data = src.read(out_dtype='float32')
+    assert data.dtype == np.dtype('float32')
+    assert (data == expected).all()
+
+
+def test_read_out_dtype_window_masked(path_rgb_byte_tif):
+    window = Window(0, 0, 100, 100)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read(1, window=window, masked=True)
+        data = src.read(1, window=window, masked=True, out_dtype='uint16')
+    assert data.dtype == np.dtype('uint16')
+    assert (data.mask == expected.mask).all()
+    assert (data == expected).all()
+
+
+def test_read_out_dtype_boundless(path_rgb_byte_tif):
+    window = Window(-10, -10, 100, 100)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read(1, window=window, boundless=True)
+        data = src.read(
+            1, window=window, boundless=True, out_dtype='float64')
+    assert data.dtype == np.dtype('float64')
+    assert (data == expected).all()
+
+
+def test_read_out_dtype_nodata_clipped(tmpdir):
+    """A nodata value outside the output's range is clipped"""
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=10, height=10, count=1,
+            dtype='int16', nodata=-9999) as dst:
+        data = np.arange(100, dtype='int16').reshape((10, 10))
+        data[0, 0] = -9999
+        dst.write(data, 1)
+    with rasterio.open(path) as src:
+        data = src.read(1, masked=True, out_dtype='uint8')
+    assert data.mask[0, 0]
+    assert data.fill_value == 0
+    assert data[9, 9] == 99
+
+
+def test_read_out_dtype_inconsistent(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            src.read(1, out=np.empty((718, 791), 'uint8'), out_dtype='float32')
+        with pytest.raises(ValueError):
+            src.read(1, out_dtype='int64')
+
+
+def test_write_converted(tmpdir):
+    """GDAL rounds and clips values converted to integers"""
+    path = str(tmpdir.join('test.tif'))
+    data = np.array([[-10.0, 0.4, 0.6, 254.5, 300.0]], dtype='float64')
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=5, height=1, count=1,
+            dtype='uint8') as dst:
+        dst.write(data, 1)
+    with rasterio.open(path) as src:
+        assert src.read(1).tolist() == [[0, 0, 1, 255, 255]]
+
+
+def test_write_unsupported_dtype(tmpdir):
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=5, height=1, count=1,
+            dtype='uint8') as dst:
+        with pytest.raises(ValueError):
+            dst.write(np.zeros((1, 5), dtype='int64'), 1)
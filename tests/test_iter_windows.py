@@ -0,0 +1,68 @@
+"""Tests of prefetching window iteration."""
+
+import threading
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.windows import Window
+
+
+def test_iter_windows_blocks(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        windows = [window for _, window in src.block_windows(1)]
+        results = list(src.iter_windows())
+        assert [window for window, _ in results] == windows
+        for window, data in results:
+            assert (data == src.read(window=window)).all()
+
+
+@pytest.mark.parametrize('prefetch', [1, 3])
+@pytest.mark.parametrize('advise', [True, False])
+def test_iter_windows_given(path_rgb_byte_tif, prefetch, advise):
+    windows = [Window(0, 0, 10, 20), ((100, 150), (200, 300)),
+               Window(700, 600, 100, 100)]
+    with rasterio.open(path_rgb_byte_tif) as src:
+        results = list(src.iter_windows(
+            windows, indexes=2, prefetch=prefetch, advise=advise,
+            masked=True))
+        assert len(results) == 3
+        for window, data in results:
+            expected = src.read(2, window=window, masked=True)
+            assert data.shape == expected.shape
+            assert (data.mask == expected.mask).all()
+
+
+def test_iter_windows_read_kwargs(path_rgb_byte_tif):
+    window = Window(-10, -10, 50, 50)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        (_, data), = src.iter_windows(
+            [window], boundless=True, out_dtype='float32')
+        assert data.dtype == np.dtype('float32')
+        assert (data == src.read(window=window, boundless=True)).all()
+
+
+def test_iter_windows_close(path_rgb_byte_tif):
+    """Closing the iterator stops its thread"""
+    threads = threading.active_count()
+    with rasterio.open(path_rgb_byte_tif) as src:
+        iterator = src.iter_windows(prefetch=1)
+        next(iterator)
+        iterator.close()
+    assert threading.active_count() == threads
+
+
+def test_iter_windows_error(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        iterator = src.iter_windows([Window(0, 0, 10, 10)], indexes=[4])
+        with pytest.raises(IndexError):
+            next(iterator)
+
+
+def test_iter_windows_bad_args(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            next(src.iter_windows(prefetch=0))
+        with pytest.raises(ValueError):
+            next(src.iter_windows(out=np.zeros((3, 10, 10), 'uint8')))
@@ -126,7 +126,7 @@ def test_no_initial_bytes(rgb_data_and_profile):
         view = memfile.getbuffer()
         # Exact size of the in-memory GeoTIFF varies with GDAL
         # version and configuration.
-        assert view.size > 1000000
+        assert len(view) > 1000000
         # NB: bytes(view) doesn't return what you'd expect with python 2.7.
         data = bytes(bytearray(view))
 
@@ -281,3 +281,154 @@ def test_multi_memfile(path_rgb_msk_byte_tif):
         with tifmemfile.open() as src:
             assert sorted(src.files) == sorted(['/vsimem/foo.tif', '/vsimem/foo.tif.msk'])
             assert src.mask_flag_enums == ([MaskFlags.per_dataset],) * 3
+
+
+def test_readinto(rgb_file_bytes):
+    """readinto fills a caller's buffer and advances the position"""
+    with MemoryFile(rgb_file_bytes) as memfile:
+        buf = bytearray(100)
+        assert memfile.readinto(buf) == 100
+        assert bytes(buf) == rgb_file_bytes[:100]
+        assert memfile.tell() == 100
+        memfile.seek(10, 2)
+        assert memfile.readinto(buf) == 10
+        assert bytes(buf[:10]) == rgb_file_bytes[-10:]
+        assert memfile.readinto(buf) == 0
+
+
+def test_readinto_readonly(rgb_file_bytes):
+    with MemoryFile(rgb_file_bytes) as memfile:
+        with pytest.raises(TypeError):
+            memfile.readinto(b'\x00' * 10)
+
+
+def test_getbuffer_zero_copy(rgb_file_bytes):
+    """Views from getbuffer share the file's memory"""
+    with MemoryFile() as memfile:
+        memfile.write(rgb_file_bytes)
+        view1 = memfile.getbuffer()
+        view2 = memfile.getbuffer()
+        arr1 = numpy.frombuffer(view1, dtype='uint8')
+        arr2 = numpy.frombuffer(view2, dtype='uint8')
+        assert arr1.ctypes.data == arr2.ctypes.data
+        assert bytes(bytearray(view1)) == rgb_file_bytes
+        with memfile.open() as src:
+            assert src.count == 3
+
+
+def test_getbuffer_outlives_close(rgb_file_bytes):
+    """A view remains valid after its file is closed"""
+    with MemoryFile() as memfile:
+        memfile.write(rgb_file_bytes)
+        view = memfile.getbuffer()
+    assert memfile.closed
+    assert bytes(bytearray(view)) == rgb_file_bytes
+
+
+def test_getbuffer_blocks_write(rgb_file_bytes):
+    """Writes fail while a view is alive and succeed after"""
+    with MemoryFile() as memfile:
+        memfile.write(rgb_file_bytes[:100])
+        view = memfile.getbuffer()
+        with pytest.raises(BufferError):
+            memfile.write(b'foo')
+        del view
+        memfile.write(rgb_file_bytes[100:])
+        assert len(memfile) == len(rgb_file_bytes)
+        memfile.seek(0)
+        assert memfile.read() == rgb_file_bytes
+
+
+def test_adopt_bytearray(rgb_file_bytes):
+    """A bytearray is adopted without copying"""
+    data = bytearray(rgb_file_bytes)
+    with MemoryFile(data) as memfile:
+        view = memfile.getbuffer()
+        assert (numpy.frombuffer(view, dtype='uint8').ctypes.data ==
+                numpy.frombuffer(data, dtype='uint8').ctypes.data)
+        del view
+        with memfile.open() as src:
+            assert src.read().shape == (3, 718, 791)
+
+
+def test_adopt_mmap(path_rgb_byte_tif):
+    """A memory map is adopted without copying"""
+    import mmap
+    with open(path_rgb_byte_tif, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with MemoryFile(mm) as memfile:
+            with memfile.open() as src:
+                assert src.read().shape == (3, 718, 791)
+        mm.close()
+
+
+def test_write_copies_adopted_buffer(rgb_file_bytes):
+    """Writing never modifies the caller's buffer"""
+    data = bytearray(rgb_file_bytes[:100])
+    with MemoryFile(data) as memfile:
+        memfile.write(b'foo')
+        memfile.seek(0)
+        assert memfile.read(3) == b'foo'
+    assert data == bytearray(rgb_file_bytes[:100])
+
+
+def test_from_stream(rgb_file_bytes):
+    """A MemoryFile can be created from an iterable of chunks"""
+    chunks = (rgb_file_bytes[i:i + 65536]
+              for i in range(0, len(rgb_file_bytes), 65536))
+    with MemoryFile.from_stream(chunks) as memfile:
+        assert memfile.tell() == 0
+        assert len(memfile) == len(rgb_file_bytes)
+        with memfile.open() as src:
+            assert src.read().shape == (3, 718, 791)
+
+
+def test_from_stream_buffers(rgb_file_bytes):
+    """Chunks may be any bytes-like objects"""
+    chunks = [bytearray(rgb_file_bytes[:1000]),
+              memoryview(rgb_file_bytes[1000:])]
+    with MemoryFile.from_stream(chunks) as memfile:
+        assert memfile.read() == rgb_file_bytes
+
+
+@pytest.mark.parametrize('capacity', [0, 100, 10000000])
+def test_from_stream_capacity(rgb_file_bytes, capacity):
+    """Capacity doesn't change the length of the file"""
+    with MemoryFile.from_stream(
+            [rgb_file_bytes], capacity=capacity) as memfile:
+        assert len(memfile) == len(rgb_file_bytes)
+        with memfile.open() as src:
+            assert src.count == 3
+
+
+def test_capacity_empty_opens_writer(rgb_data_and_profile):
+    """A MemoryFile with capacity but no writes opens in write mode"""
+    data, profile = rgb_data_and_profile
+    with MemoryFile(capacity=10000000) as memfile:
+        assert not memfile.exists()
+        with memfile.open(**profile) as dst:
+            dst.write(data)
+        with memfile.open() as src:
+            assert (src.read() == data).all()
+
+
+def test_capacity_negative():
+    with pytest.raises(ValueError):
+        MemoryFile(capacity=-1)
+
+
+def test_write_overwrite_and_seek(rgb_file_bytes):
+    """Writes through the persistent handle honor seek()"""
+    with MemoryFile() as memfile:
+        memfile.write(b'0123456789')
+        memfile.seek(2)
+        memfile.write(b'ab')
+        memfile.seek(0, 2)
+        memfile.write(b'xy')
+        memfile.seek(0)
+        assert memfile.read() == b'01ab456789xy'
+        view = memfile.getbuffer()
+        assert bytes(bytearray(view)) == b'01ab456789xy'
+        del view
+        memfile.write(b'z')
+        assert len(memfile) == 13
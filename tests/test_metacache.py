@@ -0,0 +1,114 @@
+"""Tests of the on-disk metadata cache."""
+
+import os
+import shutil
+
+import pytest
+
+import rasterio
+from rasterio.merge import merge
+from rasterio.metacache import DatasetMetadata, MetadataCache
+
+
+@pytest.fixture
+def path_rgb_copy(tmpdir, path_rgb_byte_tif):
+    """A copy of RGB.byte.tif that can be modified"""
+    path = str(tmpdir.join('copy.tif'))
+    shutil.copy(path_rgb_byte_tif, path)
+    return path
+
+
+def test_metadata_cached(tmpdir, path_rgb_copy):
+    cache = MetadataCache(str(tmpdir.join('cache')))
+    assert cache.get(path_rgb_copy) is None
+    metadata = cache.metadata(path_rgb_copy)
+    assert len(cache) == 1
+    cached = cache.get(path_rgb_copy)
+    assert isinstance(cached, DatasetMetadata)
+
+    with rasterio.open(path_rgb_copy) as src:
+        for obj in (metadata, cached):
+            assert obj.bounds == src.bounds
+            assert obj.crs == src.crs
+            assert obj.transform == src.transform
+            assert obj.res == src.res
+            assert obj.dtypes == src.dtypes
+            assert obj.nodatavals == src.nodatavals
+            assert obj.block_shapes == src.block_shapes
+            assert obj.overviews(1) == src.overviews(1)
+            assert obj.meta == src.meta
+            for key in ('tiled', 'interleave', 'dtype', 'count'):
+                assert obj.profile[key] == src.profile[key]
+    cache.close()
+
+
+def test_metadata_persistent(tmpdir, path_rgb_copy):
+    """Metadata is found again by a new cache in the same directory"""
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        cache.metadata(path_rgb_copy)
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        assert cache.get(path_rgb_copy).count == 3
+
+
+def test_metadata_stale(tmpdir, path_rgb_copy):
+    """A modified file's metadata is stale"""
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        cache.metadata(path_rgb_copy)
+        stat = os.stat(path_rgb_copy)
+        os.utime(path_rgb_copy, (stat.st_atime, stat.st_mtime + 10))
+        assert cache.get(path_rgb_copy) is None
+        with rasterio.open(path_rgb_copy, 'r+') as dst:
+            dst.build_overviews([2])
+        assert cache.metadata(path_rgb_copy).overviews(1) == [2]
+        assert len(cache) == 1
+
+
+def test_metadata_not_local(tmpdir, path_zip_file):
+    """Datasets in archives are opened but not cached"""
+    path = 'zip://{}!/white-gemini-iv.vrt'.format(path_zip_file)
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        assert cache.metadata(path).count == 3
+        assert len(cache) == 0
+        assert cache.get(path) is None
+
+
+def test_invalidate_and_clear(tmpdir, path_rgb_copy, path_rgb_byte_tif):
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        cache.metadata(path_rgb_copy)
+        cache.metadata(path_rgb_byte_tif)
+        cache.invalidate(path_rgb_copy)
+        assert cache.get(path_rgb_copy) is None
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+
+def test_merge_paths(tmpdir, path_rgb_byte_tif):
+    """Merging paths with a cache equals merging datasets"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected, expected_transform = merge([src])
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        for i in range(2):
+            data, transform = merge([path_rgb_byte_tif], metadata_cache=cache)
+            assert (data == expected).all()
+            assert transform == expected_transform
+
+
+def test_merge_skips_disjoint_paths(tmpdir, path_rgb_byte_tif, monkeypatch):
+    """Datasets outside the output bounds are not opened"""
+    with MetadataCache(str(tmpdir.join('cache'))) as cache:
+        cache.metadata(path_rgb_byte_tif)
+
+        opened = []
+        rasterio_open = rasterio.open
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(path)
+            return rasterio_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(rasterio, 'open', counting_open)
+        data, transform = merge(
+            [path_rgb_byte_tif], bounds=(0, 0, 1000, 1000), res=100,
+            metadata_cache=cache)
+        assert opened == []
+        assert (data == 0).all()
@@ -1,5 +1,8 @@
 """Tests of overview counting and creation."""
 
+import shutil
+
+import numpy as np
 import pytest
 
 from .conftest import requires_gdal2
@@ -8,6 +11,7 @@ import rasterio
 from rasterio.enums import Resampling
 from rasterio.env import GDALVersion
 from rasterio.errors import OverviewCreationError
+from rasterio.windows import Window
 
 
 gdal_version = GDALVersion()
@@ -106,3 +110,125 @@ def test_build_overviews_new_file(tmpdir, path_rgb_byte_tif):
     with rasterio.open(dst_file, overview_level=1) as src:
         data = src.read()
         assert data.any()
+
+
+def test_build_overviews_cascade(data):
+    inputfile = str(data.join('RGB.byte.tif'))
+    with rasterio.open(inputfile, 'r+') as src:
+        overview_factors = [2, 4]
+        src.build_overviews(
+            overview_factors, resampling=Resampling.average, cascade=True)
+        assert src.overviews(1) == [2, 4]
+        assert src.overviews(2) == [2, 4]
+        assert src.overviews(3) == [2, 4]
+
+    with rasterio.open(inputfile, overview_level=1) as src:
+        assert src.read().any()
+
+
+def test_build_overviews_cascade_unordered(data):
+    """Levels are computed from largest to smallest"""
+    inputfile = str(data.join('RGB.byte.tif'))
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews([4, 2], resampling=Resampling.average, cascade=True)
+        assert src.read(1, overview_level=0).any()
+        assert src.read(1, overview_level=1).any()
+
+
+def test_build_overviews_threads(data):
+    """Threads don't change the computed overviews"""
+    inputfile = str(data.join('RGB.byte.tif'))
+    shutil.copy(inputfile, str(data.join('copy.tif')))
+
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews(
+            [2, 4], resampling=Resampling.average, cascade=True)
+    with rasterio.open(str(data.join('copy.tif')), 'r+') as src:
+        src.build_overviews(
+            [2, 4], resampling=Resampling.average, num_threads=4)
+
+    with rasterio.open(inputfile) as one, rasterio.open(str(data.join('copy.tif'))) as four:
+        for level in (0, 1):
+            assert (one.read(overview_level=level) ==
+                    four.read(overview_level=level)).all()
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_update_overviews_window(data, num_threads):
+    """Only overview blocks covering the window are changed"""
+    inputfile = str(data.join('RGB.byte.tif'))
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews([2, 4], resampling=Resampling.nearest)
+        before = src.read(1, overview_level=0)
+
+        window = Window(400, 300, 100, 100)
+        src.write(np.zeros((1, 100, 100), dtype='uint8'), indexes=[1],
+                  window=window)
+        src.update_overviews(window=window, num_threads=num_threads)
+
+        after = src.read(1, overview_level=0)
+        assert not after[151:199, 201:249].any()
+        assert (before[:140] == after[:140]).all()
+        assert (before[210:] == after[210:]).all()
+        assert not src.read(
+            1, overview_level=1, window=Window(404, 304, 92, 92)).any()
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_update_overviews_not_from_stale(data, num_threads):
+    """Overviews are computed from the full resolution bands, not
+    from the overviews being updated"""
+    inputfile = str(data.join('RGB.byte.tif'))
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews([2, 4], resampling=Resampling.nearest)
+        assert (src.read(1, overview_level=0) != 7).any()
+        src.write(np.full((1, src.height, src.width), 7, dtype='uint8'),
+                  indexes=[1])
+        src.update_overviews(
+            resampling=Resampling.average, num_threads=num_threads)
+        assert (src.read(1, overview_level=0) == 7).all()
+        assert (src.read(1, overview_level=1) == 7).all()
+
+
+def test_build_overviews_cascade_values(tmpdir):
+    """The first cascaded level isn't read from its empty self"""
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(path, 'w', driver='GTiff', width=100, height=100,
+                       count=1, dtype='uint8') as dst:
+        dst.write(np.full((1, 100, 100), 9, dtype='uint8'))
+    with rasterio.open(path, 'r+') as src:
+        src.build_overviews([2, 4], resampling=Resampling.average,
+                            cascade=True)
+        assert (src.read(1, overview_level=0) == 9).all()
+        assert (src.read(1, overview_level=1) == 9).all()
+
+
+def test_build_overviews_cascade_progress(data):
+    inputfile = str(data.join('RGB.byte.tif'))
+    completed = []
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews([2, 4], cascade=True, progress=completed.append)
+    assert completed
+    assert completed == sorted(completed)
+    assert completed[-1] == pytest.approx(1.0)
+
+
+def test_update_overviews_unsupported_algo(data):
+    inputfile = str(data.join('RGB.byte.tif'))
+    with rasterio.open(inputfile, 'r+') as src:
+        src.build_overviews([2], resampling=Resampling.nearest)
+        with pytest.raises(ValueError):
+            src.update_overviews(resampling=Resampling.q1)
+
+
+def test_build_overviews_threads_buffered(tmpdir, path_rgb_byte_tif):
+    """Threads require a dataset that can be reopened"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        data = src.read()
+    with rasterio.open(str(tmpdir.join('test.png')), 'w', driver='PNG',
+                       width=data.shape[2], height=data.shape[1], count=3,
+                       dtype='uint8') as dst:
+        dst.write(data)
+        with pytest.raises(ValueError):
+            dst.build_overviews([2], num_threads=2)
+        assert dst.overviews(1) == []
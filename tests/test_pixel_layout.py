@@ -0,0 +1,77 @@
+"""Tests of reads and writes of pixel-interleaved (band-last) arrays."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio._io import _write_copies
+from rasterio.plot import reshape_as_image
+from rasterio.windows import Window
+
+
+def test_read_pixel_layout(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = reshape_as_image(src.read())
+        data = src.read(layout='pixel')
+    assert data.shape == (src.height, src.width, 3)
+    assert data.flags.c_contiguous
+    assert (data == expected).all()
+
+
+def test_read_pixel_layout_indexes_window(path_rgb_byte_tif):
+    window = Window(10, 20, 30, 40)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = reshape_as_image(src.read([3, 1], window=window))
+        data = src.read([3, 1], window=window, layout='pixel')
+    assert data.shape == (40, 30, 2)
+    assert data.flags.c_contiguous
+    assert (data == expected).all()
+
+
+def test_read_pixel_layout_single_band(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        assert (src.read(2, layout='pixel') == src.read(2)).all()
+
+
+def test_read_pixel_layout_out(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = reshape_as_image(src.read(out_shape=(3, 100, 50)))
+        out = np.zeros((100, 50, 3), dtype='uint8')
+        data = src.read(out=out, layout='pixel')
+        assert (out == expected).all()
+        assert (data == expected).all()
+        data = src.read(out_shape=(100, 50, 3), layout='pixel')
+        assert data.flags.c_contiguous
+        assert (data == expected).all()
+
+
+@pytest.mark.parametrize('boundless', [False, True])
+def test_read_pixel_layout_masked(path_rgb_byte_tif, boundless):
+    window = Window(-10, -10, 100, 100) if boundless else None
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read(masked=True, window=window, boundless=boundless)
+        data = src.read(
+            masked=True, window=window, boundless=boundless, layout='pixel')
+    assert data.shape == expected.shape[1:] + (3,)
+    assert data.data.flags.c_contiguous
+    assert (data.mask == reshape_as_image(expected.mask)).all()
+    assert (data.filled() == reshape_as_image(expected.filled())).all()
+
+
+def test_read_bad_layout(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            src.read(layout='interleaved')
+
+
+def test_write_pixel_layout(tmpdir, path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        profile = src.profile
+        data = src.read(layout='pixel')
+    path = str(tmpdir.join('test.tif'))
+    copies = sum(_write_copies.values())
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data, layout='pixel')
+    assert sum(_write_copies.values()) == copies
+    with rasterio.open(path) as src:
+        assert (src.read(layout='pixel') == data).all()
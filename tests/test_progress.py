@@ -0,0 +1,139 @@
+"""Tests of progress callbacks and cancellation of GDAL operations."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.errors import OperationCancelledError
+from rasterio.io import CancellationToken
+import rasterio.shutil
+from rasterio.warp import reproject
+
+
+class Cancel(Exception):
+    pass
+
+
+def test_read_progress(path_rgb_byte_tif):
+    fractions = []
+    with rasterio.open(path_rgb_byte_tif) as src:
+        data = src.read(progress=fractions.append)
+        assert (data == src.read()).all()
+    assert fractions
+    assert fractions == sorted(fractions)
+    assert fractions[-1] == pytest.approx(1.0)
+
+
+def test_read_progress_cancel(path_rgb_byte_tif):
+    def progress(complete):
+        raise Cancel()
+
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(Cancel):
+            src.read(1, progress=progress)
+        # The dataset remains usable.
+        assert src.read(1).any()
+
+
+def test_read_token(path_rgb_byte_tif):
+    token = CancellationToken()
+    assert not token.cancelled
+    assert token.complete == 0.0
+    with rasterio.open(path_rgb_byte_tif) as src:
+        src.read(1, progress=token)
+    assert token.complete == pytest.approx(1.0)
+
+
+def test_read_token_cancelled(path_rgb_byte_tif):
+    token = CancellationToken()
+    token.cancel()
+    assert token.cancelled
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(OperationCancelledError):
+            src.read(1, progress=token)
+
+
+def test_read_bad_progress(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(TypeError):
+            src.read(1, progress='yes')
+
+
+def test_write_token_cancelled(tmpdir):
+    token = CancellationToken()
+    token.cancel()
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=100, height=100, count=1,
+            dtype='uint8') as dst:
+        with pytest.raises(OperationCancelledError):
+            dst.write(np.ones((1, 100, 100), dtype='uint8'), progress=token)
+
+
+@pytest.mark.parametrize('cascade', [False, True])
+def test_build_overviews_progress(data, cascade):
+    fractions = []
+    path = str(data.join('RGB.byte.tif'))
+    with rasterio.open(path, 'r+') as dst:
+        dst.build_overviews(
+            [2, 4], resampling=Resampling.average, cascade=cascade,
+            progress=fractions.append)
+    assert fractions
+    assert fractions[-1] == pytest.approx(1.0)
+    with rasterio.open(path) as src:
+        assert src.overviews(1) == [2, 4]
+
+
+@pytest.mark.parametrize('cascade', [False, True])
+def test_build_overviews_cancelled(data, cascade):
+    token = CancellationToken()
+    token.cancel()
+    path = str(data.join('RGB.byte.tif'))
+    with rasterio.open(path, 'r+') as dst:
+        with pytest.raises(OperationCancelledError):
+            dst.build_overviews(
+                [2, 4], resampling=Resampling.average, cascade=cascade,
+                progress=token)
+
+
+def test_reproject_progress(path_rgb_byte_tif):
+    fractions = []
+    with rasterio.open(path_rgb_byte_tif) as src:
+        destination = np.empty((src.height, src.width), dtype='uint8')
+        reproject(
+            rasterio.band(src, 1), destination,
+            dst_transform=src.transform, dst_crs='EPSG:3857',
+            progress=fractions.append)
+    assert fractions
+    assert fractions[-1] == pytest.approx(1.0)
+
+
+def test_reproject_cancel(path_rgb_byte_tif):
+    def progress(complete):
+        raise Cancel()
+
+    with rasterio.open(path_rgb_byte_tif) as src:
+        destination = np.empty((src.height, src.width), dtype='uint8')
+        with pytest.raises(Cancel):
+            reproject(
+                rasterio.band(src, 1), destination,
+                dst_transform=src.transform, dst_crs='EPSG:3857',
+                progress=progress)
+
+
+def test_copy_progress(tmpdir, path_rgb_byte_tif):
+    token = CancellationToken()
+    path = str(tmpdir.join('test.tif'))
+    rasterio.shutil.copy(path_rgb_byte_tif, path, progress=token)
+    assert token.complete == pytest.approx(1.0)
+    with rasterio.open(path) as src:
+        assert src.count == 3
+
+
+def test_copy_cancelled(tmpdir, path_rgb_byte_tif):
+    token = CancellationToken()
+    token.cancel()
+    path = str(tmpdir.join('test.tif'))
+    with pytest.raises(OperationCancelledError):
+        rasterio.shutil.copy(path_rgb_byte_tif, path, progress=token)
@@ -90,16 +90,17 @@ class ReaderContextTest(unittest.TestCase):
             a = s.read(1, a)
             self.assertEqual(a.dtype, rasterio.ubyte)
 
-    def test_read_out_dtype_fail(self):
+    def test_read_out_dtype_convert(self):
         with rasterio.open('tests/data/RGB.byte.tif') as s:
             a = np.zeros((718, 791), dtype=rasterio.float32)
-            try:
-                s.read(1, a)
-            except ValueError as e:
-                assert ("the array's dtype 'float32' does not match the "
-                        "file's dtype") in str(e)
-            except:
-                assert "failed to catch exception" is False
+            a = s.read(1, a)
+            self.assertEqual(a.dtype, rasterio.float32)
+            self.assertTrue((a == s.read(1)).all())
+
+    def test_read_out_dtype_fail(self):
+        with rasterio.open('tests/data/RGB.byte.tif') as s:
+            a = np.zeros((718, 791), dtype='int8')
+            self.assertRaises(ValueError, s.read, 1, a)
 
     def test_read_basic(self):
         with rasterio.open('tests/data/shade.tif') as s:
@@ -0,0 +1,65 @@
+"""Tests of reads of bands with mixed data types."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.windows import Window
+
+
+def test_read_mixed_dtypes_error(path_mixed_vrt):
+    with rasterio.open(path_mixed_vrt) as src:
+        assert src.dtypes == ('uint8', 'uint16', 'float32', 'uint16')
+        with pytest.raises(ValueError):
+            src.read()
+
+
+def test_read_mixed_dtypes_converted(path_mixed_vrt, path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read([1, 2, 3, 1])
+    with rasterio.open(path_mixed_vrt) as src:
+        data = src.read(out_dtype='float64')
+    assert data.dtype == np.dtype('float64')
+    assert (data == expected).all()
+
+
+def test_read_bands(path_mixed_vrt, path_rgb_byte_tif):
+    window = Window(100, 100, 50, 40)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read([1, 2, 3, 1], window=window)
+    with rasterio.open(path_mixed_vrt) as src:
+        bands = src.read_bands([4, 3, 2, 1], window=window)
+    assert [band.dtype.name for band in bands] == [
+        'uint16', 'float32', 'uint16', 'uint8']
+    for band, exp in zip(bands, expected[::-1]):
+        assert band.shape == (40, 50)
+        assert (band == exp).all()
+
+
+def test_read_bands_masked_out_shape(path_mixed_vrt):
+    with rasterio.open(path_mixed_vrt) as src:
+        bands = src.read_bands(masked=True, out_shape=(100, 100))
+        for bidx, band in zip(src.indexes, bands):
+            expected = src.read(bidx, masked=True, out_shape=(100, 100))
+            assert band.shape == (100, 100)
+            assert (band.mask == expected.mask).all()
+
+
+def test_read_bands_structured(path_mixed_vrt, path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        expected = src.read(masked=True)
+    with rasterio.open(path_mixed_vrt) as src:
+        data = src.read_bands(
+            [1, 2, 3], names=['red', 'green', 'blue'], masked=True)
+    assert data.shape == (718, 791)
+    assert data.dtype.names == ('red', 'green', 'blue')
+    assert data.dtype['blue'] == np.dtype('float32')
+    for name, exp in zip(data.dtype.names, expected):
+        assert (data[name] == exp).all()
+        assert (data[name].mask == exp.mask).all()
+
+
+def test_read_bands_names_mismatch(path_mixed_vrt):
+    with rasterio.open(path_mixed_vrt) as src:
+        with pytest.raises(ValueError):
+            src.read_bands([1, 2], names=['a'])
@@ -0,0 +1,128 @@
+"""Tests of memory-mapped views of uncompressed GeoTIFFs."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.errors import MemoryMapError, WindowError
+from rasterio.windows import Window
+
+from .conftest import requires_gdal2
+
+
+def copy_rgb(src_path, dst_path, **options):
+    """Copy RGB.byte.tif with creation options"""
+    with rasterio.open(src_path) as src:
+        profile = src.profile
+        profile.update(**options)
+        with rasterio.open(dst_path, 'w', **profile) as dst:
+            dst.write(src.read())
+    return dst_path
+
+
+@pytest.fixture(params=['pixel', 'band'])
+def path_rgb_striped(request, tmpdir, path_rgb_byte_tif):
+    """Uncompressed, stripped copies of RGB.byte.tif"""
+    return copy_rgb(
+        path_rgb_byte_tif, str(tmpdir.join('striped.tif')),
+        interleave=request.param, compress=None, tiled=False,
+        blockysize=16)
+
+
+@pytest.fixture(params=['pixel', 'band'])
+def path_rgb_tiled(request, tmpdir, path_rgb_byte_tif):
+    """Uncompressed, tiled copies of RGB.byte.tif"""
+    return copy_rgb(
+        path_rgb_byte_tif, str(tmpdir.join('tiled.tif')),
+        interleave=request.param, compress=None, tiled=True,
+        blockxsize=256, blockysize=256)
+
+
+@requires_gdal2
+def test_as_mmap(path_rgb_striped):
+    with rasterio.open(path_rgb_striped) as src:
+        data = src.read()
+        view = src.as_mmap()
+        assert view.shape == data.shape
+        assert not view.flags.writeable
+        assert (view == data).all()
+
+
+@requires_gdal2
+def test_as_mmap_indexes(path_rgb_striped):
+    with rasterio.open(path_rgb_striped) as src:
+        assert (src.as_mmap(2) == src.read(2)).all()
+        assert (src.as_mmap([3, 2, 1]) == src.read([3, 2, 1])).all()
+        assert (src.as_mmap([1, 3]) == src.read([1, 3])).all()
+
+
+@requires_gdal2
+def test_as_mmap_window(path_rgb_striped):
+    window = Window(100, 200, 300, 50)
+    with rasterio.open(path_rgb_striped) as src:
+        view = src.as_mmap(1, window=window)
+        assert view.shape == (50, 300)
+        assert (view == src.read(1, window=window)).all()
+        view = src.as_mmap(window=((10, 20), (30, 40)))
+        assert view.shape == (3, 10, 10)
+
+
+@requires_gdal2
+def test_as_mmap_window_outside(path_rgb_striped):
+    with rasterio.open(path_rgb_striped) as src:
+        with pytest.raises(WindowError):
+            src.as_mmap(window=Window(-1, 0, 10, 10))
+
+
+@requires_gdal2
+def test_as_mmap_tiled(path_rgb_tiled):
+    with rasterio.open(path_rgb_tiled) as src:
+        with pytest.raises(MemoryMapError):
+            src.as_mmap()
+
+
+@requires_gdal2
+def test_as_mmap_compressed(tmpdir, path_rgb_byte_tif):
+    path = copy_rgb(path_rgb_byte_tif, str(tmpdir.join('lzw.tif')),
+                    compress='lzw')
+    with rasterio.open(path) as src:
+        with pytest.raises(MemoryMapError):
+            src.as_mmap()
+
+
+def test_as_mmap_not_gtiff(tmpdir, path_rgb_byte_tif):
+    path = copy_rgb(path_rgb_byte_tif, str(tmpdir.join('test.img')),
+                    driver='HFA')
+    with rasterio.open(path) as src:
+        with pytest.raises(MemoryMapError):
+            src.as_mmap()
+
+
+@requires_gdal2
+def test_as_mmap_int16(tmpdir):
+    path = str(tmpdir.join('int16.tif'))
+    data = np.arange(100 * 120, dtype='int16').reshape(1, 100, 120) - 1000
+    with rasterio.open(path, 'w', driver='GTiff', width=120, height=100,
+                       count=1, dtype='int16') as dst:
+        dst.write(data)
+    with rasterio.open(path) as src:
+        assert (src.as_mmap() == data).all()
+
+
+@requires_gdal2
+def test_block_mmap(path_rgb_tiled):
+    with rasterio.open(path_rgb_tiled) as src:
+        for bidx in src.indexes:
+            for (i, j), window in src.block_windows(bidx):
+                view = src.block_mmap(bidx, i, j)
+                assert not view.flags.writeable
+                assert (view == src.read(bidx, window=window)).all()
+
+
+@requires_gdal2
+def test_block_mmap_striped(path_rgb_striped):
+    with rasterio.open(path_rgb_striped) as src:
+        window = src.block_window(3, 44, 0)
+        view = src.block_mmap(3, 44, 0)
+        assert view.shape == (14, 791)
+        assert (view == src.read(3, window=window)).all()
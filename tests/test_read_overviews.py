@@ -0,0 +1,110 @@
+"""Tests of reads from explicitly chosen overview levels."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.errors import BandOverviewError
+from rasterio.vrt import WarpedVRT
+from rasterio.windows import Window
+
+from .conftest import requires_gdal2
+
+
+@pytest.fixture(scope='function')
+def path_rgb_overviews(data):
+    """RGB.byte.tif with overviews at factors 2, 4, and 8"""
+    path = str(data.join('RGB.byte.tif'))
+    with rasterio.open(path, 'r+') as dst:
+        dst.build_overviews([2, 4, 8], resampling=Resampling.average)
+    return path
+
+
+def test_read_overview_level_natural_shape(path_rgb_overviews):
+    """Without out or out_shape the overview's own shape is used"""
+    with rasterio.open(path_rgb_overviews) as src:
+        assert src.read(overview_level=0).shape == (3, 359, 396)
+        assert src.read(1, overview_level=1).shape == (180, 198)
+
+
+@requires_gdal2
+def test_read_overview_level_matches_open_option(path_rgb_overviews):
+    """Reading level 1 is equivalent to opening level 1"""
+    with rasterio.open(path_rgb_overviews) as src:
+        data = src.read(1, overview_level=1)
+    with rasterio.open(path_rgb_overviews, overview_level=1) as src:
+        assert (data == src.read(1)).all()
+
+
+def test_read_overview_level_window(path_rgb_overviews):
+    """Windows are given in full resolution pixels"""
+    with rasterio.open(path_rgb_overviews) as src:
+        data = src.read(1, overview_level=0)
+        subset = src.read(
+            1, window=Window(100, 200, 200, 100), overview_level=0)
+        assert subset.shape == (50, 100)
+        assert (subset == data[100:150, 50:150]).all()
+
+
+def test_read_overview_level_masked(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        data = src.read(1, overview_level=1, masked=True)
+        assert data.shape == (180, 198)
+        assert data.mask.any()
+        assert not data.mask.all()
+
+
+def test_best_overview_level(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        assert src.best_overview_level((718, 791)) is None
+        assert src.best_overview_level((400, 400)) is None
+        assert src.best_overview_level((359, 396)) == 0
+        assert src.best_overview_level((100, 100)) == 1
+        assert src.best_overview_level((3, 10, 10)) == 2
+        assert src.best_overview_level(
+            (150, 150), window=Window(0, 0, 400, 400)) == 0
+
+
+def test_best_overview_level_none(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        assert src.best_overview_level((10, 10)) is None
+
+
+def test_read_overview_level_auto(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        auto = src.read(out_shape=(3, 100, 100), overview_level='auto')
+        explicit = src.read(out_shape=(3, 100, 100), overview_level=1)
+        assert (auto == explicit).all()
+
+
+def test_read_overview_level_auto_out(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        out = np.zeros((100, 100), dtype='uint8')
+        auto = src.read(1, out=out, overview_level='auto')
+        assert (auto == src.read(1, out_shape=(100, 100), overview_level=1)).all()
+
+
+def test_read_overview_level_missing(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        with pytest.raises(BandOverviewError):
+            src.read(1, overview_level=3)
+
+
+def test_read_overview_level_boundless(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        with pytest.raises(ValueError):
+            src.read(1, window=Window(-10, -10, 100, 100), boundless=True,
+                     overview_level=0)
+
+
+def test_warpedvrt_read_overview_level(path_rgb_overviews):
+    with rasterio.open(path_rgb_overviews) as src:
+        with WarpedVRT(src) as vrt:
+            auto = vrt.read(1, out_shape=(100, 100), overview_level='auto')
+            level = vrt.best_overview_level((100, 100))
+            expected = vrt.read(1, out_shape=(100, 100), overview_level=level)
+            assert (auto == expected).all()
+            if not vrt.overviews(1):
+                pytest.skip("GDAL gives this WarpedVRT no overviews")
+            assert vrt.read(1, overview_level=0).shape == vrt._overview_shape(1, 0)
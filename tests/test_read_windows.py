@@ -0,0 +1,83 @@
+"""Tests of batched reads of many windows."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.windows import Window, _block_runs
+
+
+WINDOWS = [
+    Window(0, 0, 16, 16), Window(8, 8, 16, 16), Window(780, 700, 16, 16),
+    Window(300, 250, 16, 16), Window(395, 2, 16, 16), Window(-5, 400, 16, 16),
+    ((100, 116), (500, 516))]
+
+
+def test_block_runs():
+    """Adjacent blocks of a row are coalesced"""
+    windows = [Window(10, 10, 5, 5), Window(250, 10, 20, 5),
+               Window(600, 300, 10, 10), Window(700, 300, 10, 10),
+               Window(3, 3, 0, 4)]
+    runs = _block_runs(windows, (256, 256), 718, 791)
+    assert runs == [Window(0, 0, 512, 256), Window(512, 256, 256, 256)]
+
+
+def test_block_runs_strips():
+    windows = [Window(10, 10, 5, 5), Window(10, 12, 5, 5)]
+    runs = _block_runs(windows, (3, 791), 718, 791)
+    assert runs == [Window(0, 9, 791, 3), Window(0, 12, 791, 3),
+                    Window(0, 15, 791, 3)]
+
+
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_read_windows(path_rgb_byte_tif, num_threads):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        arrays = src.read_windows(WINDOWS, num_threads=num_threads)
+        assert len(arrays) == len(WINDOWS)
+        for window, data in zip(WINDOWS, arrays):
+            expected = src.read(window=window)
+            assert data.shape == expected.shape
+            assert (data == expected).all()
+
+
+def test_read_windows_index_masked(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        arrays = src.read_windows(WINDOWS, indexes=2, masked=True)
+        for window, data in zip(WINDOWS, arrays):
+            expected = src.read(2, window=window, masked=True)
+            assert data.ndim == 2
+            assert (data.mask == expected.mask).all()
+            assert (data.filled(0) == expected.filled(0)).all()
+
+
+def test_read_windows_stack(path_rgb_byte_tif):
+    windows = WINDOWS[:2] + WINDOWS[3:5]
+    with rasterio.open(path_rgb_byte_tif) as src:
+        data = src.read_windows(
+            windows, indexes=[3, 1], out_dtype='float32', stack=True)
+        assert data.shape == (4, 2, 16, 16)
+        assert data.dtype == np.dtype('float32')
+        for window, arr in zip(windows, data):
+            assert (arr == src.read([3, 1], window=window)).all()
+
+
+def test_read_windows_stack_masked_2d(path_rgb_byte_tif):
+    windows = WINDOWS[:2]
+    with rasterio.open(path_rgb_byte_tif) as src:
+        data = src.read_windows(windows, indexes=1, masked=True, stack=True)
+        assert data.shape == (2, 16, 16)
+        assert data.mask[0].all()
+        for window, arr in zip(windows, data):
+            assert (arr.mask == src.read(1, window=window, masked=True).mask).all()
+
+
+def test_read_windows_stack_shapes(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            src.read_windows(WINDOWS, stack=True)
+
+
+def test_read_windows_bad_index(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(IndexError):
+            src.read_windows(WINDOWS, indexes=[4])
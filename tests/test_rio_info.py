@@ -178,6 +178,20 @@ def test_info_stats_only():
     assert result.output.startswith('1.000000 255.000000 66.02')
 
 
+def test_info_stats_not_masked():
+    """Unmasked statistics include nodata pixels"""
+    runner = CliRunner()
+    result = runner.invoke(
+        main_group,
+        ['info', 'tests/data/RGB.byte.tif', '--stats', '--bidx', '2',
+         '--not-masked'])
+    assert result.exit_code == 0
+    with rasterio.open('tests/data/RGB.byte.tif') as src:
+        data = src.read(2)
+    assert result.output.strip() == '%f %f %f' % (
+        data.min(), data.max(), data.mean())
+
+
 def test_info_colorinterp():
     runner = CliRunner()
     result = runner.invoke(main_group, ['info', 'tests/data/alpha.tif'])
@@ -260,6 +274,20 @@ def test_bounds_defaults():
     assert 'FeatureCollection' in result.output
 
 
+def test_bounds_metadata_cache(tmpdir):
+    runner = CliRunner()
+    cache_dir = str(tmpdir.join('cache'))
+    outputs = []
+    for i in range(2):
+        result = runner.invoke(main_group, [
+            'bounds', 'tests/data/RGB.byte.tif', '--bbox', '--precision', '2',
+            '--metadata-cache', cache_dir])
+        assert result.exit_code == 0
+        outputs.append(result.output)
+    assert outputs[0] == outputs[1]
+    assert '[101985.0, 2611485.0, 339315.0, 2826915.0]' in outputs[0]
+
+
 def test_bounds_err():
     runner = CliRunner()
     result = runner.invoke(main_group, [
@@ -453,3 +481,53 @@ def test_info_no_credentials(tmpdir, monkeypatch):
         main_group,
         ['info', 'tests/data/RGB.byte.tif'])
     assert result.exit_code == 0
+
+
+def test_info_batch(tmpdir):
+    """Batch mode prints a JSON record per listed dataset"""
+    listing = tmpdir.join('paths.txt')
+    listing.write('tests/data/RGB.byte.tif\n\nlolwut.tif\ntests/data/float.tif\n')
+    runner = CliRunner()
+    result = runner.invoke(main_group, [
+        'info', '--batch', str(listing), '--fields', 'count,crs',
+        '--threads', '2'])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [rec['path'] for rec in records] == [
+        'tests/data/RGB.byte.tif', 'lolwut.tif', 'tests/data/float.tif']
+    assert records[0] == {
+        'path': 'tests/data/RGB.byte.tif', 'count': 3, 'crs': 'EPSG:32618'}
+    assert 'error' in records[1]
+    assert records[2]['crs'] is None
+
+
+def test_info_batch_stdin():
+    runner = CliRunner()
+    result = runner.invoke(
+        main_group, ['info', '--batch', '-', '--fields', 'dtype'],
+        input='tests/data/RGB.byte.tif\n')
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {
+        'path': 'tests/data/RGB.byte.tif', 'dtype': 'uint8'}
+
+
+def test_info_batch_csv():
+    runner = CliRunner()
+    result = runner.invoke(
+        main_group, ['info', '--batch', '-', '--batch-format', 'csv',
+                     '--fields', 'driver,res'],
+        input='tests/data/RGB.byte.tif\nlolwut.tif\n')
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == 'path,driver,res,error'
+    assert lines[1].startswith('tests/data/RGB.byte.tif,GTiff,"[300.0')
+    assert lines[1].endswith(',')
+    assert lines[2].startswith('lolwut.tif,,,')
+
+
+def test_info_batch_bad_fields():
+    runner = CliRunner()
+    result = runner.invoke(
+        main_group, ['info', '--batch', '-', '--fields', 'lolwut'],
+        input='tests/data/RGB.byte.tif\n')
+    assert result.exit_code == 2
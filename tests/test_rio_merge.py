@@ -139,6 +139,28 @@ def test_merge_with_nodata(test_data_dir_1):
         assert np.all(data == expected)
 
 
+@requires_gdal22(
+    reason="This test is sensitive to pixel values and requires GDAL 2.2+")
+def test_merge_metadata_cache(test_data_dir_1, tmpdir):
+    """Merging with a metadata cache gives the same result"""
+    outputname = str(test_data_dir_1.join('merged.tif'))
+    inputs = [str(x) for x in test_data_dir_1.listdir()]
+    inputs.sort()
+    cache_dir = str(tmpdir.join('cache'))
+    runner = CliRunner()
+    for i in range(2):
+        result = runner.invoke(
+            main_group, ['merge'] + inputs + [outputname] +
+            ['--metadata-cache', cache_dir, '--overwrite'])
+        assert result.exit_code == 0
+        with rasterio.open(outputname) as out:
+            data = out.read(1, masked=False)
+            expected = np.ones((10, 10), dtype=rasterio.uint8)
+            expected[0:6, 0:6] = 255
+            expected[4:8, 4:8] = 254
+            assert np.all(data == expected)
+
+
 def test_merge_error(test_data_dir_1):
     """A nodata value outside the valid range results in an error"""
     outputname = str(test_data_dir_1.join('merged.tif'))
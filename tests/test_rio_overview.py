@@ -74,3 +74,30 @@ def test_no_args(data):
     result = runner.invoke(cli, ['overview', inputfile])
     assert result.exit_code == 2
     assert "Please specify --ls, --rebuild, or --build ..." in result.output
+
+
+def test_rebuild_threads(data):
+    runner = CliRunner()
+    inputfile = str(data.join('RGB.byte.tif'))
+
+    result = runner.invoke(
+        cli,
+        ['overview', inputfile, '--build', '2,4,8', '--resampling', 'average'])
+    assert result.exit_code == 0
+
+    result = runner.invoke(
+        cli, ['overview', inputfile, '--rebuild', '--cascade', '--threads', '2'])
+    assert result.exit_code == 0
+
+    with rasterio.open(inputfile) as src:
+        assert src.overviews(1) == [2, 4, 8]
+        assert src.read(1, overview_level=2).any()
+
+
+def test_threads_require_cascade(data):
+    runner = CliRunner()
+    inputfile = str(data.join('RGB.byte.tif'))
+    result = runner.invoke(
+        cli, ['overview', inputfile, '--build', '2,4', '--threads', '2'])
+    assert result.exit_code == 2
+    assert "--cascade" in result.output
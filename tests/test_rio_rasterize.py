@@ -5,10 +5,12 @@ import json
 import os
 
 import numpy as np
+import pytest
 
 import rasterio
 from rasterio.features import rasterize
 from rasterio.rio.main import main_group
+from rasterio.transform import from_bounds
 
 
 DEFAULT_SHAPE = (10, 10)
@@ -54,6 +56,75 @@ def test_rasterize_file(tmpdir, runner, basic_feature):
         assert np.all(data)
 
 
+def test_rasterize_by_block(tmpdir, runner, basic_feature, basic_image_2x2):
+    output = str(tmpdir.join('test.tif'))
+    result = runner.invoke(
+        main_group, [
+            'rasterize', output, '--dimensions', DEFAULT_SHAPE[0],
+            DEFAULT_SHAPE[1], '--bounds', bbox(0, 10, 10, 0), '--by-block',
+            '--threads', 2],
+        input=json.dumps(basic_feature))
+
+    assert result.exit_code == 0
+    with rasterio.open(output) as out:
+        assert out.profile['tiled']
+        assert np.array_equal(basic_image_2x2, out.read(1, masked=False))
+
+
+def test_rasterize_by_block_existing_output(tmpdir, runner, basic_feature):
+    output = str(tmpdir.join('test.tif'))
+    with rasterio.open(
+            output, 'w', driver='GTiff', width=10, height=10, count=1,
+            dtype='uint8', crs='EPSG:4326',
+            transform=from_bounds(0, 0, 10, 10, 10, 10)) as dst:
+        dst.write(np.full(DEFAULT_SHAPE, 7, dtype='uint8'), 1)
+
+    result = runner.invoke(
+        main_group, ['rasterize', output, '--by-block'],
+        input=json.dumps(basic_feature))
+
+    assert result.exit_code == 0
+    with rasterio.open(output) as out:
+        data = out.read(1)
+        assert data[6, 3] == 1
+        assert data[0, 0] == 7
+
+
+def _square(x, y, size, value):
+    return {
+        'type': 'Feature', 'properties': {'val': value},
+        'geometry': {'type': 'Polygon', 'coordinates': [[
+            (x, y), (x + size, y), (x + size, y + size), (x, y + size),
+            (x, y)]]}}
+
+
+@pytest.mark.parametrize('threads', [1, 2])
+def test_rasterize_by_block_existing_output_matches(tmpdir, runner, threads):
+    """Burning an existing output by block matches burning it whole"""
+    features = {'type': 'FeatureCollection', 'features': [
+        _square(1, 1, 6, 5), _square(4, 4, 4, 2), _square(2, 5, 3, 2)]}
+    outputs = []
+    for by_block in (False, True):
+        output = str(tmpdir.join('test{}.tif'.format(int(by_block))))
+        with rasterio.open(
+                output, 'w', driver='GTiff', width=10, height=10, count=1,
+                dtype='uint8', crs='EPSG:4326', tiled=True, blockxsize=16,
+                blockysize=16,
+                transform=from_bounds(0, 0, 10, 10, 10, 10)) as dst:
+            dst.write(np.arange(100, dtype='uint8').reshape(DEFAULT_SHAPE), 1)
+
+        args = ['rasterize', output, '--property', 'val', '--fill', '2']
+        if by_block:
+            args += ['--by-block', '--threads', threads]
+        result = runner.invoke(main_group, args, input=json.dumps(features))
+        assert result.exit_code == 0
+        with rasterio.open(output) as out:
+            outputs.append(out.read(1))
+
+    assert (outputs[0] == 5).any()
+    assert np.array_equal(outputs[0], outputs[1])
+
+
 def test_rasterize_bounds(tmpdir, runner, basic_feature, basic_image_2x2):
     output = str(tmpdir.join('test.tif'))
     result = runner.invoke(
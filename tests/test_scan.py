@@ -0,0 +1,71 @@
+"""Tests of bulk metadata scanning."""
+
+import json
+
+import pytest
+
+import rasterio
+from rasterio.env import getenv
+from rasterio.scan import FIELDS, dataset_info, scan_metadata
+
+
+def test_dataset_info(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        info = dataset_info(src)
+        assert sorted(info) == sorted(FIELDS)
+        assert info['crs'] == 'EPSG:32618'
+        assert info['dtype'] == 'uint8'
+        assert info['bounds'] == list(src.bounds)
+        assert info['block_shapes'] == [[3, 791]] * 3
+        assert info['overviews'] == [[], [], []]
+        json.dumps(info)
+
+
+def test_dataset_info_fields(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        assert dataset_info(src, ['count', 'nodata']) == {
+            'count': 3, 'nodata': 0.0}
+
+
+def test_dataset_info_unknown_field(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            dataset_info(src, ['lolwut'])
+
+
+@pytest.mark.parametrize('num_threads', [1, 3])
+def test_scan_metadata(path_rgb_byte_tif, num_threads):
+    """Records are in the order of paths and errors are captured"""
+    paths = [path_rgb_byte_tif, 'tests/data/float.tif', 'lolwut.tif'] * 5
+    records = list(scan_metadata(
+        iter(paths), fields=['count', 'dtype'], num_threads=num_threads))
+    assert [rec['path'] for rec in records] == paths
+    assert records[0] == {
+        'path': path_rgb_byte_tif, 'count': 3, 'dtype': 'uint8'}
+    assert records[1]['dtype'] == 'float64'
+    assert 'error' in records[2]
+    assert 'count' not in records[2]
+
+
+def _env_option(src, fields):
+    return {'option': getenv().get('RIO_TEST_OPTION')}
+
+
+def test_scan_metadata_threads_env(monkeypatch, path_rgb_byte_tif):
+    """Threads open datasets in the calling thread's environment"""
+    monkeypatch.setattr('rasterio.scan.dataset_info', _env_option)
+    paths = [path_rgb_byte_tif] * 4
+    with rasterio.Env(RIO_TEST_OPTION='yes'):
+        records = list(scan_metadata(paths, num_threads=2))
+    assert [rec['option'] for rec in records] == ['yes'] * 4
+
+    env = rasterio.Env(RIO_TEST_OPTION='given')
+    records = list(scan_metadata(paths, num_threads=2, env=env))
+    assert [rec['option'] for rec in records] == ['given'] * 4
+
+
+def test_scan_metadata_invalid():
+    with pytest.raises(ValueError):
+        list(scan_metadata([], fields=['lolwut']))
+    with pytest.raises(ValueError):
+        list(scan_metadata([], num_threads=0))
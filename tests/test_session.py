@@ -2,7 +2,8 @@
 
 import pytest
 
-from rasterio.session import DummySession, AWSSession, Session, OSSSession, GSSession
+from rasterio.session import (
+    DummySession, AWSSession, Session, OSSSession, GSSession, SessionCache)
 
 
 def test_dummy_session():
@@ -140,3 +141,91 @@ def test_gs_session_class():
         google_application_credentials='foo')
     assert gs_session._creds
     assert gs_session.get_credential_options()['GOOGLE_APPLICATION_CREDENTIALS'] == 'foo'
+
+
+def test_session_cache_ttl():
+    """Entries are resolved again once their TTL elapses"""
+    now = [0.0]
+    cache = SessionCache(ttl=10.0, clock=lambda: now[0])
+    calls = []
+
+    def resolve():
+        calls.append(now[0])
+        return len(calls), None
+
+    assert cache.get('key', resolve) == 1
+    now[0] = 9.0
+    assert cache.get('key', resolve) == 1
+    now[0] = 10.0
+    assert cache.get('key', resolve) == 2
+    assert calls == [0.0, 10.0]
+
+
+def test_session_cache_expiring_credentials():
+    """Entries with expiring credentials are refreshed before expiry"""
+    now = [0.0]
+    cache = SessionCache(ttl=100.0, margin=5.0, clock=lambda: now[0])
+    tokens = iter(['first', 'second'])
+
+    def resolve():
+        return next(tokens), now[0] + 20.0
+
+    assert cache.get('key', resolve) == 'first'
+    now[0] = 14.0
+    assert cache.get('key', resolve) == 'first'
+    now[0] = 15.0
+    assert cache.get('key', resolve) == 'second'
+
+
+def test_session_cache_maxsize():
+    cache = SessionCache(maxsize=2)
+    for key in 'abc':
+        cache.get(key, lambda: (key, None))
+    assert len(cache) == 2
+    assert cache.get('a', lambda: ('new', None)) == 'new'
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_session_cache_nested():
+    """Values may be resolved using the same cache"""
+    cache = SessionCache()
+
+    def resolve():
+        return cache.get('inner', lambda: ('inner', None)) + ' outer', None
+
+    assert cache.get('outer', resolve) == 'inner outer'
+    assert len(cache) == 2
+
+
+def test_session_cache_race():
+    """A value cached while another is resolved is kept"""
+    cache = SessionCache()
+
+    def resolve():
+        cache.get('key', lambda: ('first', None))
+        return 'second', None
+
+    assert cache.get('key', resolve) == 'first'
+    assert cache.get('key', resolve) == 'first'
+
+
+def test_aws_session_cached():
+    """AWS sessions with the same configuration share a boto3 session"""
+    pytest.importorskip("boto3")
+    sesh1 = AWSSession(aws_access_key_id='foo', aws_secret_access_key='bar')
+    sesh2 = AWSSession(aws_access_key_id='foo', aws_secret_access_key='bar')
+    sesh3 = AWSSession(aws_access_key_id='foo', aws_secret_access_key='baz')
+    assert sesh1._session is sesh2._session
+    assert sesh1._session is not sesh3._session
+    assert sesh3.get_credential_options()['AWS_SECRET_ACCESS_KEY'] == 'baz'
+
+
+def test_aws_session_cache_environment(monkeypatch):
+    """Credentials from the environment are resolved again if it changes"""
+    pytest.importorskip("boto3")
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'lol')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'wut')
+    assert AWSSession().get_credential_options()['AWS_ACCESS_KEY_ID'] == 'lol'
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'foo')
+    assert AWSSession().get_credential_options()['AWS_ACCESS_KEY_ID'] == 'foo'
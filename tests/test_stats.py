@@ -0,0 +1,146 @@
+"""Tests of chunked band statistics and histograms."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.stats import Statistics, _Moments
+from rasterio.windows import Window
+
+
+def test_moments_merge():
+    """Merged moments of parts equal the moments of the whole"""
+    arr = np.random.RandomState(0).uniform(-10, 10, 1000)
+    moments = _Moments()
+    for part in np.array_split(arr, 7):
+        moments.update(_Moments.from_array(part))
+    stats = moments.statistics()
+    assert stats.count == 1000
+    assert stats.min == arr.min()
+    assert stats.max == arr.max()
+    assert stats.mean == pytest.approx(arr.mean())
+    assert stats.std == pytest.approx(arr.std())
+
+
+def test_moments_masked_nan():
+    arr = np.ma.masked_array(
+        [1.0, 2.0, np.nan, 100.0], mask=[False, False, False, True])
+    stats = _Moments.from_array(arr).statistics()
+    assert stats == Statistics(1.0, 2.0, 1.5, 0.5, 2)
+
+
+def test_moments_empty():
+    arr = np.ma.masked_array([1, 2], mask=[True, True])
+    assert _Moments.from_array(arr).statistics().count == 0
+
+
+@pytest.mark.parametrize('num_threads', [1, 4])
+def test_statistics(path_rgb_byte_tif, num_threads):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        stats = src.statistics(1, num_threads=num_threads)
+        data = src.read(1, masked=True)
+    assert stats.count == data.count()
+    assert stats.min == data.min()
+    assert stats.max == data.max()
+    assert stats.mean == pytest.approx(data.mean())
+    assert stats.std == pytest.approx(data.std())
+
+
+def test_statistics_window(path_rgb_byte_tif):
+    window = Window(100, 200, 300, 150)
+    with rasterio.open(path_rgb_byte_tif) as src:
+        stats = src.statistics(2, window=window)
+        data = src.read(2, window=window, masked=True)
+    assert stats.count == data.count()
+    assert stats.mean == pytest.approx(data.mean())
+
+
+def test_statistics_bad_index(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(IndexError):
+            src.statistics(4)
+
+
+def test_statistics_bad_threads(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with pytest.raises(ValueError):
+            src.statistics(1, num_threads=0)
+
+
+def test_statistics_approx_cached(tmpdir, path_rgb_byte_tif):
+    """Approximate statistics may come from a band's metadata"""
+    path = str(tmpdir.join('test.tif'))
+    with rasterio.open(path_rgb_byte_tif) as src:
+        profile = src.profile
+        data = src.read(1)
+    profile.update(count=1)
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data, 1)
+        dst.update_tags(
+            1, STATISTICS_MINIMUM='1', STATISTICS_MAXIMUM='2',
+            STATISTICS_MEAN='1.5', STATISTICS_STDDEV='0.5')
+    with rasterio.open(path) as src:
+        assert src.statistics(1, approx=True) == Statistics(
+            1.0, 2.0, 1.5, 0.5, None)
+        assert src.statistics(1).count > 0
+
+
+def test_statistics_approx_overview(data):
+    path = str(data.join('RGB.byte.tif'))
+    with rasterio.open(path, 'r+') as dst:
+        dst.build_overviews([2, 4], resampling=Resampling.nearest)
+    with rasterio.open(path) as src:
+        exact = src.statistics(1)
+        approx = src.statistics(1, approx=True)
+    # The smallest overview of at least 1024 x 1024 pixels is the
+    # full resolution band.
+    assert approx == exact
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_statistics_approx_overview_chunks(tmpdir, num_threads):
+    """Approximate statistics are reduced over chunks of an overview"""
+    path = str(tmpdir.join('large.tif'))
+    data = np.arange(2100 * 2100, dtype='float64').reshape((2100, 2100))
+    data = (data % 251).astype('uint8')
+    with rasterio.open(
+            path, 'w', driver='GTiff', width=2100, height=2100, count=1,
+            dtype='uint8', tiled=True, blockxsize=256,
+            blockysize=256) as dst:
+        dst.write(data, 1)
+        dst.build_overviews([2, 4], resampling=Resampling.nearest)
+
+    with rasterio.open(path) as src:
+        assert src.best_overview_level((1024, 1024)) == 0
+        expected = _Moments.from_array(src.read(1, overview_level=0))
+        stats = src.statistics(1, approx=True, num_threads=num_threads)
+        assert stats.count == expected.count == 1050 * 1050
+        assert stats.min == expected.min
+        assert stats.max == expected.max
+        assert stats.mean == pytest.approx(expected.mean)
+
+        counts, _ = src.histogram(
+            1, bins=8, range=(0, 256), approx=True, num_threads=num_threads)
+        assert counts.sum() == 1050 * 1050
+
+
+@pytest.mark.parametrize('num_threads', [1, 2])
+def test_histogram(path_rgb_byte_tif, num_threads):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        counts, edges = src.histogram(
+            1, bins=16, range=(0, 256), num_threads=num_threads)
+        data = src.read(1, masked=True)
+    expected, expected_edges = np.histogram(
+        data.compressed(), bins=16, range=(0, 256))
+    assert (counts == expected).all()
+    assert (edges == expected_edges).all()
+
+
+def test_histogram_default_range(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        counts, edges = src.histogram(3, bins=10)
+        data = src.read(3, masked=True)
+    assert edges[0] == data.min()
+    assert edges[-1] == data.max()
+    assert counts.sum() == data.count()
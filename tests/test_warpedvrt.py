@@ -380,3 +380,37 @@ def test_invalid_add_alpha():
     with rasterio.open('tests/data/RGBA.byte.tif') as src:
         with pytest.raises(WarpOptionsError):
             WarpedVRT(src, add_alpha=True)
+
+
+def test_warped_vrt_read_kwargs(path_rgb_byte_tif):
+    """Keyword arguments of read() are passed to the dataset reader"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with WarpedVRT(src, crs=DST_CRS) as vrt:
+            expected = vrt.read()
+            data = vrt.read(out_dtype='float32')
+            assert data.dtype == numpy.dtype('float32')
+            assert (data == expected).all()
+            data = vrt.read(layout='pixel')
+            assert (data == numpy.moveaxis(expected, 0, -1)).all()
+            with pytest.raises(ValueError):
+                vrt.read(boundless=True)
+
+
+def test_warped_vrt_iter_windows(path_rgb_byte_tif):
+    """A WarpedVRT's windows are read without prefetching"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with WarpedVRT(src, crs=DST_CRS) as vrt:
+            windows = [Window(0, 0, 100, 100), Window(200, 300, 50, 50)]
+            results = list(vrt.iter_windows(windows, out_dtype='float32'))
+            assert [window for window, _ in results] == windows
+            for window, data in results:
+                assert data.dtype == numpy.dtype('float32')
+                assert (data == vrt.read(window=window)).all()
+
+
+def test_warped_vrt_threads(path_rgb_byte_tif):
+    """Threads can't reopen a WarpedVRT"""
+    with rasterio.open(path_rgb_byte_tif) as src:
+        with WarpedVRT(src, crs=DST_CRS) as vrt:
+            with pytest.raises(ValueError):
+                vrt.statistics(1, num_threads=2)
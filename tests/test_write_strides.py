@@ -0,0 +1,96 @@
+"""Tests of writes of strided arrays without copies."""
+
+import numpy as np
+import pytest
+
+import rasterio
+from rasterio._io import _gdal_strides, _write_copies
+from rasterio.plot import reshape_as_image, reshape_as_raster
+
+
+@pytest.fixture
+def rgb(path_rgb_byte_tif):
+    with rasterio.open(path_rgb_byte_tif) as src:
+        return src.profile, src.read()
+
+
+def assert_written(path, expected):
+    with rasterio.open(path) as src:
+        assert (src.read() == expected).all()
+
+
+def test_gdal_strides():
+    arr = np.zeros((3, 10, 20), dtype='uint16')
+    assert _gdal_strides(arr)
+    assert _gdal_strides(reshape_as_raster(reshape_as_image(arr)))
+    assert _gdal_strides(arr[:, 2:5, ::3])
+    assert _gdal_strides(arr[1][np.newaxis])
+    assert not _gdal_strides(arr[:, ::-1])
+    assert not _gdal_strides(np.broadcast_to(arr[0], arr.shape))
+
+
+def test_gdal_strides_large_bands():
+    """Bands of 2 GiB or more don't require copies"""
+    arr = np.lib.stride_tricks.as_strided(
+        np.zeros(1, dtype='uint8'), shape=(3, 2, 2),
+        strides=(2**31 + 2**20, 2**20, 1))
+    assert _gdal_strides(arr)
+
+
+def test_write_contiguous_no_copy(tmpdir, rgb):
+    profile, data = rgb
+    path = str(tmpdir.join('test.tif'))
+    copies = sum(_write_copies.values())
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(np.ascontiguousarray(data))
+    assert sum(_write_copies.values()) == copies
+    assert_written(path, data)
+
+
+def test_write_band_last_no_copy(tmpdir, rgb):
+    """Band-last arrays are written without a copy"""
+    profile, data = rgb
+    image = np.ascontiguousarray(reshape_as_image(data))
+    path = str(tmpdir.join('test.tif'))
+    copies = sum(_write_copies.values())
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(reshape_as_raster(image))
+    assert sum(_write_copies.values()) == copies
+    assert_written(path, data)
+
+
+def test_write_slice_no_copy(tmpdir, rgb):
+    """Slices of larger arrays are written without a copy"""
+    profile, data = rgb
+    big = np.zeros((5, profile['height'] + 10, profile['width'] * 2),
+                   dtype='uint8')
+    big[1:4, 5:-5, ::2] = data
+    path = str(tmpdir.join('test.tif'))
+    copies = sum(_write_copies.values())
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(big[1:4, 5:-5, ::2])
+        dst.write(big[2, 5:-5, ::2], 2)
+    assert sum(_write_copies.values()) == copies
+    assert_written(path, data)
+
+
+def test_write_reversed_copy(tmpdir, rgb):
+    """Arrays with negative strides are copied"""
+    profile, data = rgb
+    path = str(tmpdir.join('test.tif'))
+    copies = _write_copies['strides']
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data[:, ::-1])
+    assert _write_copies['strides'] == copies + 1
+    assert_written(path, data[:, ::-1])
+
+
+def test_write_byteswapped_copy(tmpdir, rgb):
+    profile, data = rgb
+    profile.update(dtype='uint16')
+    path = str(tmpdir.join('test.tif'))
+    copies = _write_copies['dtype']
+    with rasterio.open(path, 'w', **profile) as dst:
+        dst.write(data.astype('>u2'))
+    assert _write_copies['dtype'] == copies + 1
+    assert_written(path, data)